@@ -8,6 +8,7 @@ from sqlmodel import SQLModel, Session, select
 from .db import get_session
 from .models import StudioSetting
 from .publishing import (
+    ACTIVE_PUBLISH_PLATFORMS_KEY,
     SHORT_PUBLISH_SCHEDULE_KEY,
     active_publish_platforms,
     active_short_schedule_cron_utc,
@@ -16,12 +17,12 @@ from .publishing import (
     derived_short_slots_utc,
     describe_short_schedule_cron,
 )
+from .reference_cache import STUDIO_SETTING, invalidate, reference_cache_stats
 from shared.config import settings
 
 router = APIRouter(prefix="/admin/settings", tags=["admin-settings"])
 
 ADMIN_TOKEN = os.getenv("API_AUTH_TOKEN") or os.getenv("ADMIN_API_TOKEN")
-ACTIVE_PUBLISH_PLATFORMS_KEY = "active_publish_platforms"
 
 
 def require_token(authorization: str = Header(...)) -> None:
@@ -114,7 +115,13 @@ def update_publish_platform_settings(
             session.delete(schedule_setting)
 
     session.commit()
+    invalidate(STUDIO_SETTING)
     return _build_publish_settings_read(session)
 
 
+@router.get("/reference-cache")
+def get_reference_cache_stats(_: None = Depends(require_token)) -> dict[str, dict[str, int]]:
+    return reference_cache_stats()
+
+
 __all__ = ["router"]
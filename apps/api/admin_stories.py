@@ -2,17 +2,29 @@ from __future__ import annotations
 
 import os
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, List
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sqlalchemy import tuple_
 from sqlmodel import Session, select
 
+from shared.config import settings
+from shared.workflow import StoryStatus
+
 from .db import get_session
 from .models import Story
-from .story_duplicates import find_duplicate_story
+from .story_duplicates import find_duplicate_story, story_duplicate_key, story_duplicate_key_hash
+from .story_similarity import (
+    BodySignature,
+    body_signature,
+    find_near_duplicate_story,
+    index_story,
+    index_story_signature,
+    jaccard,
+)
 
 router = APIRouter(prefix="/admin/stories", tags=["admin-stories"])
 
@@ -27,6 +39,12 @@ def require_token(authorization: str = Header(...)) -> None:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 
+BULK_MAX_STORIES = 500
+BULK_CREATED = "created"
+BULK_UPDATED = "updated"
+BULK_DUPLICATE = "duplicate"
+
+
 class StoryIn(BaseModel):
     external_id: str
     source: str
@@ -41,6 +59,36 @@ class StoryIn(BaseModel):
     tags: List[str] | None = None
 
 
+class StoryBulkResult(BaseModel):
+    index: int
+    source: str
+    external_id: str
+    status: str
+    story_id: int | None = None
+
+
+def _story_fields(payload: StoryIn) -> dict[str, Any]:
+    return {
+        "subreddit": payload.subreddit,
+        "title": payload.title,
+        "author": payload.author,
+        "body_md": payload.text,
+        "source_url": payload.url,
+        "nsfw": payload.nsfw,
+        "flair": payload.flair,
+        "tags": payload.tags,
+    }
+
+
+def _apply_story_fields(story: Story, payload: StoryIn) -> bool:
+    changed = False
+    for attr, value in _story_fields(payload).items():
+        if getattr(story, attr) != value:
+            setattr(story, attr, value)
+            changed = True
+    return changed
+
+
 @router.post("/", response_model=Story)
 def upsert_story(
     payload: StoryIn,
@@ -52,22 +100,10 @@ def upsert_story(
     )
     story = session.exec(stmt).first()
     if story:
-        changed = False
-        for attr, value in {
-            "subreddit": payload.subreddit,
-            "title": payload.title,
-            "author": payload.author,
-            "body_md": payload.text,
-            "source_url": payload.url,
-            "nsfw": payload.nsfw,
-            "flair": payload.flair,
-            "tags": payload.tags,
-        }.items():
-            if getattr(story, attr) != value:
-                setattr(story, attr, value)
-                changed = True
+        changed = _apply_story_fields(story, payload)
         if changed:
             session.add(story)
+            index_story(session, story)
             session.commit()
             session.refresh(story)
             return story
@@ -98,6 +134,8 @@ def upsert_story(
         status="ingested",
     )
     session.add(story)
+    session.flush()
+    index_story(session, story)
     session.commit()
     session.refresh(story)
     return JSONResponse(
@@ -105,4 +143,174 @@ def upsert_story(
     )
 
 
+def _insert_new_stories(session: Session, rows: list[dict[str, Any]]) -> dict[tuple[str, str], int]:
+    """Insert ``rows`` in one statement, skipping rows whose source key already exists.
+
+    Returns the ids of the rows actually inserted, keyed by ``(source, external_id)``.
+    """
+
+    if not rows:
+        return {}
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        stories = [Story(**row) for row in rows]
+        session.add_all(stories)
+        session.flush()
+        return {(story.source, story.external_id): story.id for story in stories}
+    table = Story.__table__
+    stmt = (
+        insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["source", "external_id"])
+        .returning(table.c.id, table.c.source, table.c.external_id)
+    )
+    return {(source, external_id): story_id for story_id, source, external_id in session.execute(stmt).all()}
+
+
+@router.post("/bulk", response_model=list[StoryBulkResult])
+def bulk_upsert_stories(
+    payload: list[StoryIn],
+    session: Session = Depends(get_session),
+    _: None = Depends(require_token),
+) -> list[StoryBulkResult]:
+    """Upsert a batch of stories with set-based duplicate checks.
+
+    Each item reports ``created``, ``updated`` or ``duplicate`` with the same
+    rules as ``POST /admin/stories``; repeats within the batch are duplicates
+    of their first occurrence.
+    """
+
+    if len(payload) > BULK_MAX_STORIES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"at most {BULK_MAX_STORIES} stories per batch",
+        )
+    results: list[StoryBulkResult] = [
+        StoryBulkResult(index=index, source=item.source, external_id=item.external_id, status=BULK_DUPLICATE)
+        for index, item in enumerate(payload)
+    ]
+    duplicate_of: dict[int, int] = {}
+    first_by_key: dict[tuple[str, str], int] = {}
+    for index, item in enumerate(payload):
+        key = (item.source, item.external_id)
+        if key in first_by_key:
+            duplicate_of[index] = first_by_key[key]
+        else:
+            first_by_key[key] = index
+
+    existing = {
+        (story.source, story.external_id): story
+        for story in session.exec(select(Story).where(tuple_(Story.source, Story.external_id).in_(list(first_by_key))))
+    }
+    fresh: list[int] = []
+    for key, index in first_by_key.items():
+        story = existing.get(key)
+        if story is None:
+            fresh.append(index)
+            continue
+        results[index].story_id = story.id
+        if _apply_story_fields(story, payload[index]):
+            session.add(story)
+            index_story(session, story)
+            results[index].status = BULK_UPDATED
+
+    key_hashes = {
+        index: story_duplicate_key_hash(title=payload[index].title, author=payload[index].author, body_md=payload[index].text)
+        for index in fresh
+    }
+    stored_by_hash: dict[str, list[Story]] = {}
+    if key_hashes:
+        for story in session.exec(select(Story).where(Story.duplicate_key_hash.in_(set(key_hashes.values())))):
+            stored_by_hash.setdefault(story.duplicate_key_hash, []).append(story)
+
+    accepted_by_hash: dict[str, int] = {}
+    accepted_buckets: dict[tuple[int, str], list[int]] = {}
+    signatures: dict[int, BodySignature | None] = {}
+    rows: list[dict[str, Any]] = []
+    now = datetime.now(timezone.utc)
+    for index in fresh:
+        item = payload[index]
+        key = story_duplicate_key(title=item.title, author=item.author, body_md=item.text)
+        key_hash = key_hashes[index]
+        stored = next(
+            (
+                story
+                for story in stored_by_hash.get(key_hash, [])
+                if story_duplicate_key(title=story.title, author=story.author, body_md=story.body_md) == key
+            ),
+            None,
+        )
+        if stored is not None:
+            results[index].story_id = stored.id
+            continue
+        if key_hash in accepted_by_hash:
+            duplicate_of[index] = accepted_by_hash[key_hash]
+            continue
+        signature = body_signature(item.text) if settings.STORY_NEAR_DUPLICATE_ENABLED else None
+        if signature is not None:
+            batch_match = next(
+                (
+                    other
+                    for other in dict.fromkeys(
+                        other for bucket in signature.buckets for other in accepted_buckets.get(bucket, [])
+                    )
+                    if jaccard(signature.shingles, signatures[other].shingles)
+                    >= settings.STORY_NEAR_DUPLICATE_THRESHOLD
+                ),
+                None,
+            )
+            if batch_match is not None:
+                duplicate_of[index] = batch_match
+                continue
+            near_duplicate = find_near_duplicate_story(session, body_md=item.text, signature=signature)
+            if near_duplicate:
+                results[index].story_id = near_duplicate.story.id
+                continue
+            for bucket in signature.buckets:
+                accepted_buckets.setdefault(bucket, []).append(index)
+        signatures[index] = signature
+        accepted_by_hash[key_hash] = index
+        rows.append(
+            {
+                **_story_fields(item),
+                "external_id": item.external_id,
+                "source": item.source,
+                "created_utc": datetime.fromtimestamp(item.created_utc, tz=timezone.utc),
+                "status": StoryStatus.INGESTED.value,
+                "duplicate_key_hash": key_hash,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+    inserted = _insert_new_stories(session, rows)
+    for index, signature in signatures.items():
+        item = payload[index]
+        story_id = inserted.get((item.source, item.external_id))
+        if story_id is None:
+            continue
+        results[index].status = BULK_CREATED
+        results[index].story_id = story_id
+        index_story_signature(session, story_id, signature)
+    raced = [payload[index] for index in signatures if results[index].story_id is None]
+    if raced:
+        raced_ids = {
+            (story.source, story.external_id): story.id
+            for story in session.exec(
+                select(Story).where(tuple_(Story.source, Story.external_id).in_([(item.source, item.external_id) for item in raced]))
+            )
+        }
+        for index in signatures:
+            if results[index].story_id is None:
+                results[index].story_id = raced_ids.get((payload[index].source, payload[index].external_id))
+    for index, original in duplicate_of.items():
+        results[index].story_id = results[original].story_id
+    session.commit()
+    return results
+
+
 __all__ = ["router"]
@@ -0,0 +1,31 @@
+"""Add render quality tier to jobs and artifacts."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0010_render_quality_tier"
+down_revision = "0009_studio_settings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in ("jobs", "renderartifact"):
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        if "quality_tier" not in existing:
+            op.add_column(
+                table,
+                sa.Column("quality_tier", sa.Text(), nullable=False, server_default="final"),
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in ("renderartifact", "jobs"):
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        if "quality_tier" in existing:
+            op.drop_column(table, "quality_tier")
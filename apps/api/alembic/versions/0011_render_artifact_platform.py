@@ -0,0 +1,26 @@
+"""Add platform-specific render artifact variants."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0011_render_artifact_platform"
+down_revision = "0010_render_quality_tier"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = {column["name"] for column in inspector.get_columns("renderartifact")}
+    if "platform" not in existing:
+        op.add_column("renderartifact", sa.Column("platform", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = {column["name"] for column in inspector.get_columns("renderartifact")}
+    if "platform" in existing:
+        op.drop_column("renderartifact", "platform")
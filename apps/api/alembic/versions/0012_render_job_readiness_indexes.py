@@ -0,0 +1,33 @@
+"""Index render job listing and compilation readiness lookups."""
+
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "0012_render_job_readiness_indexes"
+down_revision = "0011_render_artifact_platform"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_jobs_status_kind_id", "jobs", ["status", "kind", "id"]),
+    ("ix_jobs_story_part_kind_tier_id", "jobs", ["story_part_id", "kind", "quality_tier", "id"]),
+    ("ix_storypart_story_id", "storypart", ["story_id"]),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for name, table, columns in INDEXES:
+        existing = {index["name"] for index in inspector.get_indexes(table) if index.get("name")}
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for name, table, _columns in reversed(INDEXES):
+        existing = {index["name"] for index in inspector.get_indexes(table) if index.get("name")}
+        if name in existing:
+            op.drop_index(name, table_name=table)
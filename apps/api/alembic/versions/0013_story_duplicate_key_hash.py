@@ -0,0 +1,74 @@
+"""Persist a hashed duplicate key on stories and backfill existing rows."""
+
+import hashlib
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0013_story_duplicate_key_hash"
+down_revision = "0012_render_job_readiness_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _canonical_text(value: str | None) -> str:
+    return WHITESPACE_RE.sub(" ", value or "").strip().casefold()
+
+
+def _key_hash(title: str | None, author: str | None, body_md: str | None) -> str:
+    # Mirrors apps.api.story_duplicates.story_duplicate_key_hash at this revision.
+    key = "\x1f".join(_canonical_text(value) for value in (title, author, body_md))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = {column["name"] for column in inspector.get_columns("story")}
+    if "duplicate_key_hash" not in existing:
+        op.add_column("story", sa.Column("duplicate_key_hash", sa.String(length=64), nullable=True))
+    indexes = {index["name"] for index in inspector.get_indexes("story") if index.get("name")}
+    if "ix_story_duplicate_key_hash" not in indexes:
+        op.create_index("ix_story_duplicate_key_hash", "story", ["duplicate_key_hash"])
+
+    story = sa.table(
+        "story",
+        sa.column("id", sa.Integer),
+        sa.column("title", sa.Text),
+        sa.column("author", sa.Text),
+        sa.column("body_md", sa.Text),
+        sa.column("duplicate_key_hash", sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(story.c.id, story.c.title, story.c.author, story.c.body_md)
+            .where(story.c.id > last_id, story.c.duplicate_key_hash.is_(None))
+            .order_by(story.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            bind.execute(
+                story.update()
+                .where(story.c.id == row.id)
+                .values(duplicate_key_hash=_key_hash(row.title, row.author, row.body_md))
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = {index["name"] for index in inspector.get_indexes("story") if index.get("name")}
+    if "ix_story_duplicate_key_hash" in indexes:
+        op.drop_index("ix_story_duplicate_key_hash", table_name="story")
+    existing = {column["name"] for column in inspector.get_columns("story")}
+    if "duplicate_key_hash" in existing:
+        op.drop_column("story", "duplicate_key_hash")
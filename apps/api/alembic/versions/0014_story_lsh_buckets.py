@@ -0,0 +1,33 @@
+"""Add MinHash LSH buckets for near-duplicate story detection."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0014_story_lsh_buckets"
+down_revision = "0013_story_duplicate_key_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "storylshbucket" not in inspector.get_table_names():
+        op.create_table(
+            "storylshbucket",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("story_id", sa.Integer(), sa.ForeignKey("story.id"), nullable=False),
+            sa.Column("band", sa.Integer(), nullable=False),
+            sa.Column("bucket", sa.String(length=16), nullable=False),
+            sa.UniqueConstraint("story_id", "band"),
+        )
+        op.create_index("ix_storylshbucket_band_bucket", "storylshbucket", ["band", "bucket"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "storylshbucket" in inspector.get_table_names():
+        op.drop_index("ix_storylshbucket_band_bucket", table_name="storylshbucket")
+        op.drop_table("storylshbucket")
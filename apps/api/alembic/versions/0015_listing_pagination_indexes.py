@@ -0,0 +1,35 @@
+"""Index the keyset orderings used by paginated operator listings."""
+
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "0015_listing_pagination_indexes"
+down_revision = "0014_story_lsh_buckets"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_jobs_story_id_id", "jobs", ["story_id", "id"]),
+    ("ix_story_status_id", "story", ["status", "id"]),
+    ("ix_asset_story_type_id", "asset", ["story_id", "type", "id"]),
+    ("ix_renderartifact_story_id_id", "renderartifact", ["story_id", "id"]),
+    ("ix_release_status_publish_at_id", "release", ["status", "publish_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for name, table, columns in INDEXES:
+        existing = {index["name"] for index in inspector.get_indexes(table) if index.get("name")}
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for name, table, _columns in reversed(INDEXES):
+        existing = {index["name"] for index in inspector.get_indexes(table) if index.get("name")}
+        if name in existing:
+            op.drop_index(name, table_name=table)
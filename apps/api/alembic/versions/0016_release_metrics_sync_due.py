@@ -0,0 +1,105 @@
+"""Track when each published short is next due for an insights sync."""
+
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0016_release_metrics_sync_due"
+down_revision = "0015_listing_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+INDEX_NAME = "ix_release_metrics_sync_due"
+# Mirrors apps.api.publishing.metrics_sync_interval at this revision, in
+# multiples of the default INSIGHTS_SYNC_INTERVAL_SEC.
+BASE_INTERVAL = timedelta(seconds=3600)
+AGE_TIERS = ((timedelta(hours=48), 1), (timedelta(days=7), 6))
+SETTLED_FACTOR = 24
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _next_sync_at(published_at: datetime, synced_at: datetime | None) -> datetime:
+    published_at = _utc(published_at)
+    if synced_at is None:
+        return published_at
+    synced_at = _utc(synced_at)
+    age = synced_at - published_at
+    factor = next((factor for max_age, factor in AGE_TIERS if age < max_age), SETTLED_FACTOR)
+    return synced_at + BASE_INTERVAL * factor
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = {column["name"] for column in inspector.get_columns("release")}
+    if "next_metrics_sync_at" not in existing:
+        op.add_column("release", sa.Column("next_metrics_sync_at", sa.DateTime(timezone=True), nullable=True))
+    indexes = {index["name"] for index in inspector.get_indexes("release") if index.get("name")}
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, "release", ["platform", "variant", "status", "next_metrics_sync_at"])
+
+    release = sa.table(
+        "release",
+        sa.column("id", sa.Integer),
+        sa.column("platform", sa.String),
+        sa.column("variant", sa.String),
+        sa.column("status", sa.String),
+        sa.column("platform_video_id", sa.String),
+        sa.column("published_at", sa.DateTime(timezone=True)),
+        sa.column("next_metrics_sync_at", sa.DateTime(timezone=True)),
+    )
+    snapshot = sa.table(
+        "metricssnapshot",
+        sa.column("release_id", sa.Integer),
+        sa.column("source", sa.String),
+        sa.column("captured_at", sa.DateTime(timezone=True)),
+    )
+    latest = (
+        sa.select(snapshot.c.release_id, sa.func.max(snapshot.c.captured_at).label("captured_at"))
+        .where(snapshot.c.source == "youtube_insights")
+        .group_by(snapshot.c.release_id)
+        .subquery()
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(release.c.id, release.c.published_at, latest.c.captured_at)
+            .select_from(release.outerjoin(latest, latest.c.release_id == release.c.id))
+            .where(
+                release.c.id > last_id,
+                release.c.platform == "youtube",
+                release.c.variant == "short",
+                release.c.status == "published",
+                release.c.platform_video_id.is_not(None),
+                release.c.published_at.is_not(None),
+                release.c.next_metrics_sync_at.is_(None),
+            )
+            .order_by(release.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            bind.execute(
+                release.update()
+                .where(release.c.id == row.id)
+                .values(next_metrics_sync_at=_next_sync_at(row.published_at, row.captured_at))
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = {index["name"] for index in inspector.get_indexes("release") if index.get("name")}
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name="release")
+    existing = {column["name"] for column in inspector.get_columns("release")}
+    if "next_metrics_sync_at" in existing:
+        op.drop_column("release", "next_metrics_sync_at")
@@ -0,0 +1,36 @@
+"""Add full-text and trigram search indexes for stories on PostgreSQL."""
+
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "0017_story_search_indexes"
+down_revision = "0016_release_metrics_sync_due"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body_md, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = inspect(bind)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    existing = {column["name"] for column in inspector.get_columns("story")}
+    if "search_vector" not in existing:
+        op.execute(f"ALTER TABLE story ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_story_search_vector ON story USING gin (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_story_title_trgm ON story USING gin (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_story_title_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_story_search_vector")
+    op.execute("ALTER TABLE story DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,32 @@
+"""Add the materialized story overview table."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0018_story_overview"
+down_revision = "0017_story_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    # Rows are built on first read, so existing stories need no backfill.
+    if "storyoverview" not in inspector.get_table_names():
+        op.create_table(
+            "storyoverview",
+            sa.Column("story_id", sa.Integer(), sa.ForeignKey("story.id"), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+            sa.Column("document", sa.JSON(), nullable=True),
+            sa.Column("stale_after", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("built_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "storyoverview" in inspector.get_table_names():
+        op.drop_table("storyoverview")
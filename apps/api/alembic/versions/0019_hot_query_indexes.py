@@ -0,0 +1,67 @@
+"""Add composite and partial indexes for the hot worker and scheduling queries.
+
+``Job(kind, status, id)`` lookups are already served by ``ix_jobs_status_kind_id``
+from 0012, and ``Release(status, publish_at)`` by 0015's
+``ix_release_status_publish_at_id``.
+"""
+
+from contextlib import nullcontext
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0019_hot_query_indexes"
+down_revision = "0018_story_overview"
+branch_labels = None
+depends_on = None
+
+QUEUED = "status = 'queued'"
+PUBLISHED = "published_at IS NOT NULL"
+# (name, table, columns, partial predicate)
+INDEXES = (
+    ("ix_jobs_story_kind_part", "jobs", ["story_id", "kind", "story_part_id"], None),
+    ("ix_jobs_queued_kind_story_id", "jobs", ["kind", "story_id", "id"], QUEUED),
+    ("ix_release_script_platform_published", "release", ["script_version_id", "platform", "published_at"], PUBLISHED),
+    (
+        "ix_metricssnapshot_release_source_captured",
+        "metricssnapshot",
+        ["release_id", "source", "captured_at", "id"],
+        None,
+    ),
+    ("ix_storypart_script_version_index", "storypart", ["script_version_id", "index"], None),
+    ("ix_publishjob_status_not_before_id", "publishjob", ["status", "not_before", "id"], None),
+    ("ix_publishjob_queued_id", "publishjob", ["id"], QUEUED),
+)
+
+
+def _existing(bind, table: str) -> set[str]:
+    return {index["name"] for index in inspect(bind).get_indexes(table) if index.get("name")}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    concurrently = bind.dialect.name == "postgresql"
+    missing = [spec for spec in INDEXES if spec[0] not in _existing(bind, spec[1])]
+    if not missing:
+        return
+    # These tables take worker traffic; on PostgreSQL build without blocking writes.
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        for name, table, columns, where in missing:
+            predicate = sa.text(where) if where else None
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=predicate,
+                sqlite_where=predicate,
+                postgresql_concurrently=concurrently,
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for name, table, _columns, _where in reversed(INDEXES):
+        if name in _existing(bind, table):
+            op.drop_index(name, table_name=table)
+
@@ -0,0 +1,26 @@
+"""Record each library file's size and mtime so unchanged files skip re-indexing."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0020_asset_file_fingerprint"
+down_revision = "0019_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("file_size", "file_mtime_ns")
+
+
+def upgrade() -> None:
+    existing = {column["name"] for column in inspect(op.get_bind()).get_columns("asset")}
+    for name in COLUMNS:
+        if name not in existing:
+            op.add_column("asset", sa.Column(name, sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    existing = {column["name"] for column in inspect(op.get_bind()).get_columns("asset")}
+    for name in reversed(COLUMNS):
+        if name in existing:
+            op.drop_column("asset", name)
@@ -0,0 +1,56 @@
+"""Normalize asset tags into ``assettag`` and backfill it from ``asset.tags``."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0021_asset_tag_index"
+down_revision = "0020_asset_file_fingerprint"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+INDEX_NAME = "ix_assettag_tag_asset_id"
+
+
+def _normalize(tags) -> set[str]:
+    # Mirrors apps.api.asset_tags.normalize_tags at this revision.
+    return {str(tag).strip().lower() for tag in tags or [] if str(tag).strip()}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not inspector.has_table("assettag"):
+        op.create_table(
+            "assettag",
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("asset.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("tag", sa.String(), primary_key=True),
+        )
+        inspector = inspect(bind)
+    indexes = {index["name"] for index in inspector.get_indexes("assettag") if index.get("name")}
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, "assettag", ["tag", "asset_id"])
+
+    asset = sa.table("asset", sa.column("id", sa.Integer), sa.column("tags", sa.JSON))
+    asset_tag = sa.table("assettag", sa.column("asset_id", sa.Integer), sa.column("tag", sa.String))
+    indexed = sa.select(asset_tag.c.asset_id).where(asset_tag.c.asset_id == asset.c.id).exists()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(asset.c.id, asset.c.tags)
+            .where(asset.c.id > last_id, asset.c.tags.is_not(None), ~indexed)
+            .order_by(asset.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        values = [{"asset_id": row.id, "tag": tag} for row in rows for tag in sorted(_normalize(row.tags))]
+        if values:
+            bind.execute(asset_tag.insert(), values)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    if inspect(op.get_bind()).has_table("assettag"):
+        op.drop_table("assettag")
@@ -0,0 +1,22 @@
+"""Track background download state of remote bundle assets."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0022_asset_download_status"
+down_revision = "0021_asset_tag_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = {column["name"] for column in inspect(op.get_bind()).get_columns("asset")}
+    if "download_status" not in existing:
+        op.add_column("asset", sa.Column("download_status", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    existing = {column["name"] for column in inspect(op.get_bind()).get_columns("asset")}
+    if "download_status" in existing:
+        op.drop_column("asset", "download_status")
@@ -0,0 +1,48 @@
+"""Index the release queue's keyset order.
+
+``/releases/queue`` sorts on ``coalesce(publish_at, <far future>)``,
+``coalesce(published_at, <far past>) DESC`` and ``id`` across several
+statuses, which 0015's ``ix_release_status_publish_at_id`` cannot serve.
+"""
+
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0023_release_queue_order_index"
+down_revision = "0022_asset_download_status"
+branch_labels = None
+depends_on = None
+
+NAME = "ix_release_queue_order"
+# Must compile exactly like apps.api.models.release_queue_sort_keys(). SQLite does
+# not reflect expression indexes, hence IF [NOT] EXISTS instead of inspecting.
+FAR_FUTURE = datetime(9999, 12, 31, tzinfo=timezone.utc)
+FAR_PAST = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _sort_key(column: str, sentinel: datetime):
+    sentinel_type = sa.DateTime(timezone=True)
+    return sa.func.coalesce(
+        sa.column(column, sentinel_type),
+        sa.literal(sentinel, sentinel_type, literal_execute=True),
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    concurrently = bind.dialect.name == "postgresql"
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        op.create_index(
+            NAME,
+            "release",
+            [_sort_key("publish_at", FAR_FUTURE), _sort_key("published_at", FAR_PAST).desc(), sa.column("id")],
+            postgresql_concurrently=concurrently,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(NAME, table_name="release", if_exists=True)
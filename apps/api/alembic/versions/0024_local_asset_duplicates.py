@@ -0,0 +1,34 @@
+"""Remember library files that duplicate an indexed asset, so reindexing skips them."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0024_local_asset_duplicates"
+down_revision = "0023_release_queue_order_index"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_localassetduplicate_asset_id"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not inspector.has_table("localassetduplicate"):
+        op.create_table(
+            "localassetduplicate",
+            sa.Column("local_path", sa.String(), primary_key=True),
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("asset.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("file_size", sa.BigInteger(), nullable=False),
+            sa.Column("file_mtime_ns", sa.BigInteger(), nullable=False),
+        )
+        inspector = inspect(bind)
+    indexes = {index["name"] for index in inspector.get_indexes("localassetduplicate") if index.get("name")}
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, "localassetduplicate", ["asset_id"])
+
+
+def downgrade() -> None:
+    if inspect(op.get_bind()).has_table("localassetduplicate"):
+        op.drop_table("localassetduplicate")
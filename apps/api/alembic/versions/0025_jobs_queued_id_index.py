@@ -0,0 +1,47 @@
+"""Index queued jobs in id order for the render worker's job listing.
+
+``/render-jobs?status=queued`` filters on status and two kinds and pages by
+``id``; without this partial index the planner either sorts every queued row
+or walks the whole table in id order.
+"""
+
+from contextlib import nullcontext
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0025_jobs_queued_id_index"
+down_revision = "0024_local_asset_duplicates"
+branch_labels = None
+depends_on = None
+
+NAME = "ix_jobs_queued_id"
+QUEUED = "status = 'queued'"
+
+
+def _existing(bind) -> set[str]:
+    return {index["name"] for index in inspect(bind).get_indexes("jobs") if index.get("name")}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if NAME in _existing(bind):
+        return
+    concurrently = bind.dialect.name == "postgresql"
+    # Workers poll this table; on PostgreSQL build without blocking writes.
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        op.create_index(
+            NAME,
+            "jobs",
+            ["id"],
+            postgresql_where=sa.text(QUEUED),
+            sqlite_where=sa.text(QUEUED),
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if NAME in _existing(bind):
+        op.drop_index(NAME, table_name="jobs")
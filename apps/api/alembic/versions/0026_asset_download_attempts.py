@@ -0,0 +1,50 @@
+"""Count background download attempts per asset and index retryable downloads.
+
+Workers claim an asset by moving it to ``downloading`` and bumping
+``download_attempts``; the startup and scheduler sweeps look up pending,
+failed and stale claims through ``ix_asset_download_retry``.
+"""
+
+from contextlib import nullcontext
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0026_asset_download_attempts"
+down_revision = "0025_jobs_queued_id_index"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_asset_download_retry"
+RETRYABLE = "download_status <> 'ready'"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "download_attempts" not in {column["name"] for column in inspector.get_columns("asset")}:
+        op.add_column(
+            "asset",
+            sa.Column("download_attempts", sa.Integer(), nullable=False, server_default="0"),
+        )
+    if INDEX_NAME in {index["name"] for index in inspector.get_indexes("asset") if index.get("name")}:
+        return
+    concurrently = bind.dialect.name == "postgresql"
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        op.create_index(
+            INDEX_NAME,
+            "asset",
+            ["download_status"],
+            postgresql_where=sa.text(RETRYABLE),
+            sqlite_where=sa.text(RETRYABLE),
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if INDEX_NAME in {index["name"] for index in inspector.get_indexes("asset") if index.get("name")}:
+        op.drop_index(INDEX_NAME, table_name="asset")
+    if "download_attempts" in {column["name"] for column in inspector.get_columns("asset")}:
+        op.drop_column("asset", "download_attempts")
@@ -0,0 +1,364 @@
+"""Incremental indexing of the local visuals library in ``VISUALS_DIR``.
+
+A file whose path, size and mtime match an indexed library asset is skipped
+without being read. Other files are SHA-256 hashed in ``HASH_CHUNK_BYTES``
+chunks and ffprobed on a pool of ``ASSET_INDEX_WORKERS`` threads, in batches
+of ``INDEX_BATCH_SIZE`` that are committed as they finish. A changed file
+updates its existing row; content already indexed under another path is
+counted as a duplicate and not indexed again. Duplicates are remembered in
+``LocalAssetDuplicate`` with their size and mtime, so they are not re-hashed
+until they change.
+
+``POST /assets/library/index`` runs the indexer as an ``index_local_assets``
+job after the response is sent. As files finish, progress counters are
+written to ``Job.result`` at most every ``INDEX_PROGRESS_INTERVAL``, so
+``GET /jobs/{id}`` reports them live and the job's ``updated_at`` doubles as a
+heartbeat. A job that was declared stale and replaced stops at its next
+heartbeat and never overwrites its status.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from sqlalchemy import delete, update
+from sqlmodel import Session, select
+
+from shared.config import settings
+from shared.logging import log_error, log_info
+from shared.workflow import JobStatus
+
+from .models import Asset, Job, LocalAssetDuplicate, as_utc
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".webm"}
+HASH_CHUNK_BYTES = 1024 * 1024
+INDEX_BATCH_SIZE = 64
+INDEX_JOB_KIND = "index_local_assets"
+# A running job that has not reported progress for this long is presumed dead.
+INDEX_JOB_STALE_AFTER = timedelta(minutes=10)
+INDEX_PROGRESS_INTERVAL = timedelta(seconds=30)
+_ACTIVE_STATUSES = {JobStatus.QUEUED.value, JobStatus.RENDERING.value}
+
+
+class _Fingerprint(NamedTuple):
+    asset_id: int
+    file_hash: str | None
+    size: int | None
+    mtime_ns: int | None
+
+
+class IndexJobSuperseded(RuntimeError):
+    """The running index job was declared stale and replaced by another."""
+
+
+@dataclass
+class LocalIndexProgress:
+    scanned: int = 0
+    unchanged: int = 0
+    added: int = 0
+    updated: int = 0
+    duplicates: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def file_sha256(path: Path, *, chunk_size: int = HASH_CHUNK_BYTES) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ffprobe_json(path: Path) -> dict:
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "stream=width,height:format=duration",
+                "-of",
+                "json",
+                str(path),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout)
+    except Exception:
+        return {}
+
+
+def _orientation(width: int | None, height: int | None) -> str | None:
+    if not width or not height:
+        return None
+    if height > width:
+        return "portrait"
+    if width > height:
+        return "landscape"
+    return "square"
+
+
+def _iter_media_files(root: Path) -> Iterator[tuple[Path, os.stat_result]]:
+    """Walk ``root`` lazily in a stable order, yielding media files with their stat."""
+
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = Path(directory) / name
+            if path.suffix.lower() not in IMAGE_EXTS | VIDEO_EXTS:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            yield path, stat
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _inspect(path: Path, known_hashes: frozenset[str]) -> tuple[str, dict | None]:
+    digest = file_sha256(path)
+    return digest, None if digest in known_hashes else _ffprobe_json(path)
+
+
+def _apply_probe(asset: Asset, probe: dict) -> None:
+    streams = probe.get("streams") or [{}]
+    stream = streams[0] if streams else {}
+    width = stream.get("width")
+    height = stream.get("height")
+    duration = probe.get("format", {}).get("duration")
+    asset.duration_ms = int(float(duration) * 1000) if duration else None
+    asset.width = int(width) if width else None
+    asset.height = int(height) if height else None
+    asset.orientation = _orientation(int(width), int(height)) if width and height else None
+
+
+def _unchanged(fingerprint: _Fingerprint | None, stat: os.stat_result) -> bool:
+    return fingerprint is not None and fingerprint.size == stat.st_size and fingerprint.mtime_ns == stat.st_mtime_ns
+
+
+def index_local_assets(
+    session: Session,
+    *,
+    on_progress: Callable[[LocalIndexProgress], None] | None = None,
+) -> LocalIndexProgress:
+    """Index new and changed files under ``VISUALS_DIR`` as library assets."""
+
+    visuals_dir = Path(settings.VISUALS_DIR)
+    visuals_dir.mkdir(parents=True, exist_ok=True)
+    # Plain tuples rather than rows: each batch commit would expire loaded rows.
+    library = session.exec(
+        select(Asset.id, Asset.local_path, Asset.file_hash, Asset.file_size, Asset.file_mtime_ns).where(
+            Asset.story_id.is_(None)
+        )
+    ).all()
+    by_path = {
+        row.local_path: _Fingerprint(row.id, row.file_hash, row.file_size, row.file_mtime_ns)
+        for row in library
+        if row.local_path
+    }
+    duplicates = {
+        row.local_path: _Fingerprint(row.asset_id, None, row.file_size, row.file_mtime_ns)
+        for row in session.exec(select(LocalAssetDuplicate)).all()
+    }
+    # Content hash -> id of the asset indexed with it; rows written in a batch
+    # stand in until the batch is flushed and their ids are known.
+    owners: dict[str, int | Asset] = {row.file_hash: row.id for row in library if row.file_hash}
+    # Assets whose content changed no longer vouch for the duplicates recorded against them.
+    changed_owners: set[int] = set()
+    progress = LocalIndexProgress()
+    with ThreadPoolExecutor(max_workers=max(1, settings.ASSET_INDEX_WORKERS)) as pool:
+        for batch in _batched(_iter_media_files(visuals_dir), INDEX_BATCH_SIZE):
+            pending: list[tuple[Path, os.stat_result, _Fingerprint | None]] = []
+            for path, stat in batch:
+                progress.scanned += 1
+                if _unchanged(by_path.get(str(path)), stat):
+                    progress.unchanged += 1
+                    continue
+                duplicate = duplicates.get(str(path))
+                if _unchanged(duplicate, stat) and duplicate.asset_id not in changed_owners:
+                    progress.duplicates += 1
+                    continue
+                pending.append((path, stat, by_path.get(str(path))))
+            snapshot = frozenset(owners)
+            inspected = pool.map(lambda item: _inspect(item[0], snapshot), pending)
+            found: list[tuple[Path, os.stat_result, str]] = []
+            written: list[tuple[str, Asset]] = []
+            for (path, stat, existing), (digest, probe) in zip(pending, inspected):
+                # Report as each file finishes hashing; one batch of large videos
+                # can outlast INDEX_JOB_STALE_AFTER.
+                if on_progress is not None:
+                    on_progress(progress)
+                if existing is None and digest in owners:
+                    progress.duplicates += 1
+                    found.append((path, stat, digest))
+                    continue
+                if str(path) in duplicates:
+                    session.execute(delete(LocalAssetDuplicate).where(LocalAssetDuplicate.local_path == str(path)))
+                asset = session.get(Asset, existing.asset_id) if existing is not None else None
+                if asset is not None and asset.file_hash == digest:
+                    # Indexed before fingerprints were recorded, or touched without changes.
+                    progress.unchanged += 1
+                elif asset is not None:
+                    progress.updated += 1
+                    _apply_probe(asset, probe or {})
+                    if owners.get(asset.file_hash or "") == asset.id:
+                        del owners[asset.file_hash]
+                    changed_owners.add(asset.id)
+                    session.execute(delete(LocalAssetDuplicate).where(LocalAssetDuplicate.asset_id == asset.id))
+                else:
+                    progress.added += 1
+                    ext = path.suffix.lower()
+                    asset = Asset(
+                        story_id=None,
+                        type="video" if ext in VIDEO_EXTS else "image",
+                        local_path=str(path),
+                        source="local",
+                        provider="filesystem",
+                        provider_id=path.name,
+                        selected=False,
+                        tags=[token for token in re.split(r"[_\-\s]+", path.stem.lower()) if token],
+                        attribution="local library",
+                    )
+                    _apply_probe(asset, probe or {})
+                asset.file_hash = digest
+                asset.file_size = stat.st_size
+                asset.file_mtime_ns = stat.st_mtime_ns
+                session.add(asset)
+                owners[digest] = asset
+                written.append((digest, asset))
+            session.flush()
+            for digest, asset in written:
+                owners[digest] = asset.id
+            for path, stat, digest in found:
+                owner_id = owners.get(digest)
+                if owner_id is None:
+                    # Its owner changed later in the same batch; rehash it next run.
+                    continue
+                session.merge(
+                    LocalAssetDuplicate(
+                        local_path=str(path),
+                        asset_id=owner_id,
+                        file_size=stat.st_size,
+                        file_mtime_ns=stat.st_mtime_ns,
+                    )
+                )
+            if on_progress is not None:
+                on_progress(progress)
+            session.commit()
+    return progress
+
+
+def enqueue_local_asset_index(session: Session) -> tuple[Job, bool]:
+    """Return the active index job, or a new queued one. The flag is True when created."""
+
+    now = datetime.now(timezone.utc)
+    active = session.exec(
+        select(Job).where(Job.kind == INDEX_JOB_KIND, Job.status.in_(_ACTIVE_STATUSES)).order_by(Job.id.desc())
+    ).all()
+    for job in active:
+        last_seen = job.updated_at or job.created_at
+        if last_seen is not None and now - as_utc(last_seen) < INDEX_JOB_STALE_AFTER:
+            return job, False
+        job.status = JobStatus.ERRORED.value
+        job.error_class = "StaleJob"
+        job.error_message = "Indexer stopped reporting progress"
+        session.add(job)
+    job = Job(kind=INDEX_JOB_KIND, status=JobStatus.QUEUED.value, result=LocalIndexProgress().as_dict())
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job, True
+
+
+def _update_running_job(session: Session, job_id: int, **values: Any) -> bool:
+    """Write ``values`` to the job only while it is still ``rendering``."""
+
+    result = session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RENDERING.value)
+        .values(updated_at=datetime.now(timezone.utc), **values)
+    )
+    return result.rowcount == 1
+
+
+def run_local_asset_index_job(bind: Any, job_id: int) -> None:
+    """Run a queued index job in its own session, recording progress on the job."""
+
+    with Session(bind) as session:
+        job = session.get(Job, job_id)
+        if job is None or job.status != JobStatus.QUEUED.value:
+            return
+        job.status = JobStatus.RENDERING.value
+        job.updated_at = datetime.now(timezone.utc)
+        session.add(job)
+        session.commit()
+        last_report = time.monotonic()
+
+        def record(progress: LocalIndexProgress) -> None:
+            nonlocal last_report
+            if time.monotonic() - last_report < INDEX_PROGRESS_INTERVAL.total_seconds():
+                return
+            if not _update_running_job(session, job_id, result=progress.as_dict()):
+                raise IndexJobSuperseded(f"Index job {job_id} is no longer running")
+            session.commit()
+            last_report = time.monotonic()
+
+        try:
+            progress = index_local_assets(session, on_progress=record)
+        except IndexJobSuperseded as exc:
+            session.rollback()
+            log_error("asset_index_superseded", job_id=job_id, error=str(exc))
+            return
+        except Exception as exc:
+            session.rollback()
+            _update_running_job(
+                session,
+                job_id,
+                status=JobStatus.ERRORED.value,
+                error_class=exc.__class__.__name__,
+                error_message=str(exc),
+            )
+            session.commit()
+            log_error("asset_index", job_id=job_id, error=str(exc))
+            return
+        if not _update_running_job(session, job_id, status=JobStatus.RENDERED.value, result=progress.as_dict()):
+            session.rollback()
+            log_error("asset_index_superseded", job_id=job_id, error="Finished after the job was replaced")
+            return
+        session.commit()
+        log_info("asset_index", job_id=job_id, **progress.as_dict())
+
+__all__ = [
+    "HASH_CHUNK_BYTES",
+    "IMAGE_EXTS",
+    "INDEX_JOB_KIND",
+    "VIDEO_EXTS",
+    "IndexJobSuperseded",
+    "LocalIndexProgress",
+    "enqueue_local_asset_index",
+    "file_sha256",
+    "index_local_assets",
+    "run_local_asset_index_job",
+]
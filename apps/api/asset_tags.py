@@ -0,0 +1,123 @@
+"""Inverted tag index for assets and SQL-side library ranking.
+
+``Asset.tags`` stays the API-facing JSON list. Every flush mirrors new or
+changed tag lists into ``AssetTag`` rows (lower-cased, stripped, de-duplicated),
+so tag lookups use the ``(tag, asset_id)`` index instead of loading the library
+into Python.
+
+:func:`rank_library_assets` scores library assets in SQL by tag overlap. When
+``weighted`` is on each matched tag contributes its smoothed inverse document
+frequency, so a rare tag like ``lighthouse`` outranks one carried by most of the
+library like ``dark``. Only the top ``limit`` rows are returned.
+"""
+
+from __future__ import annotations
+
+import math
+from itertools import chain
+from typing import Any, Iterable
+
+from sqlalchemy import case, delete, event, func, insert, inspect, or_
+from sqlmodel import Session, select
+
+from .models import Asset, AssetTag
+
+
+def normalize_tags(tags: Iterable[Any] | None) -> set[str]:
+    return {str(tag).strip().lower() for tag in tags or [] if str(tag).strip()}
+
+
+def _tags_changed(session: Session, asset: Asset) -> bool:
+    return asset in session.new or inspect(asset).attrs.tags.history.has_changes()
+
+
+@event.listens_for(Session, "before_flush")
+def _drop_deleted_asset_tags(session: Session, _flush_context: Any, _instances: Any) -> None:
+    # Before the asset rows go, so the foreign key holds on every backend.
+    asset_ids = [instance.id for instance in session.deleted if isinstance(instance, Asset) and instance.id]
+    if asset_ids:
+        session.connection().execute(delete(AssetTag).where(AssetTag.asset_id.in_(asset_ids)))
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_asset_tags(session: Session, _flush_context: Any) -> None:
+    changed = {
+        instance.id: normalize_tags(instance.tags)
+        for instance in chain(session.new, session.dirty)
+        if isinstance(instance, Asset) and instance.id is not None and _tags_changed(session, instance)
+    }
+    if not changed:
+        return
+    connection = session.connection()
+    connection.execute(delete(AssetTag).where(AssetTag.asset_id.in_(changed)))
+    rows = [{"asset_id": asset_id, "tag": tag} for asset_id, tags in changed.items() for tag in sorted(tags)]
+    if rows:
+        connection.execute(insert(AssetTag), rows)
+
+
+def library_tag_filter(terms: Iterable[str]) -> Any:
+    """Match library assets carrying any of ``terms`` as a tag or in their path."""
+
+    terms = sorted(normalize_tags(terms))
+    tagged = select(AssetTag.asset_id).where(AssetTag.tag.in_(terms))
+    return or_(
+        Asset.id.in_(tagged),
+        *(func.lower(Asset.local_path).contains(term, autoescape=True) for term in terms),
+    )
+
+
+def tag_weights(session: Session, terms: Iterable[str]) -> dict[str, float]:
+    """Smoothed IDF of each term present in the library; absent terms are omitted."""
+
+    terms = normalize_tags(terms)
+    if not terms:
+        return {}
+    frequencies = session.exec(
+        select(AssetTag.tag, func.count())
+        .join(Asset, Asset.id == AssetTag.asset_id)
+        .where(Asset.story_id.is_(None), AssetTag.tag.in_(terms))
+        .group_by(AssetTag.tag)
+    ).all()
+    if not frequencies:
+        return {}
+    library_size = session.exec(select(func.count()).select_from(Asset).where(Asset.story_id.is_(None))).one()
+    return {tag: math.log((library_size + 1) / (count + 1)) + 1 for tag, count in frequencies}
+
+
+def rank_library_assets(
+    session: Session,
+    terms: Iterable[str],
+    *,
+    limit: int,
+    weighted: bool = True,
+) -> list[Asset]:
+    """Return up to ``limit`` library assets matching ``terms``, best score first."""
+
+    terms = normalize_tags(terms)
+    weights = tag_weights(session, terms) if weighted else dict.fromkeys(terms, 1.0)
+    if not weights or limit <= 0:
+        return []
+    score = func.sum(case(weights, value=AssetTag.tag, else_=0.0)).label("score")
+    ranked = (
+        select(AssetTag.asset_id, score)
+        .join(Asset, Asset.id == AssetTag.asset_id)
+        .where(Asset.story_id.is_(None), AssetTag.tag.in_(weights))
+        .group_by(AssetTag.asset_id)
+        .subquery()
+    )
+    return list(
+        session.exec(
+            select(Asset)
+            .join(ranked, ranked.c.asset_id == Asset.id)
+            .order_by(ranked.c.score.desc(), Asset.id)
+            .limit(limit)
+        ).all()
+    )
+
+
+__all__ = [
+    "library_tag_filter",
+    "normalize_tags",
+    "rank_library_assets",
+    "tag_weights",
+]
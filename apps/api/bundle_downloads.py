@@ -0,0 +1,345 @@
+"""Background downloads of remote bundle assets into a content-addressed store.
+
+``POST /stories/{id}/asset-bundles`` records Pixabay refs as ``pending`` assets
+without a ``local_path`` and returns at once; until a copy lands the renderer
+keeps fetching ``remote_url`` itself. The downloads then run on a process-wide
+pool of ``BUNDLE_DOWNLOAD_WORKERS`` threads. Each body is streamed to a
+temporary file, capped at ``BUNDLE_ASSET_MAX_BYTES``, fsynced and moved to
+``REMOTE_ASSET_CACHE_DIR/<sha[:2]>/<sha><suffix>``; identical content is kept
+once however many assets point at it. As each download finishes the asset and
+the stored refs of every bundle of its story get the local path and a
+``ready`` or ``failed`` status.
+
+A worker first claims the asset with a conditional UPDATE to ``downloading``,
+so however many API processes queue the same asset only one downloads it.
+:func:`requeue_pending_downloads` runs at startup and on each scheduler pass;
+it queues assets still ``pending``, ``failed`` ones below
+``BUNDLE_DOWNLOAD_MAX_ATTEMPTS`` and claims older than
+``DOWNLOAD_CLAIM_STALE_AFTER`` whose process died.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+from sqlalchemy import and_, or_, update
+from sqlmodel import Session, select
+
+from shared import pixabay
+from shared.config import settings
+from shared.logging import log_error, log_info
+from shared.workflow import AssetDownloadStatus
+
+from .media_refs import asset_to_media_ref
+from .models import Asset, AssetBundle
+
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+DOWNLOAD_TIMEOUT_SEC = 60
+# A ``downloading`` claim this old belongs to a process that died mid-download.
+DOWNLOAD_CLAIM_STALE_AFTER = timedelta(minutes=15)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# Serializes read-modify-write of bundle refs between this process's workers.
+_bundle_lock = threading.Lock()
+# Asset ids with a download queued or running in this process.
+_inflight: set[int] = set()
+_inflight_lock = threading.Lock()
+
+
+class DownloadTooLarge(ValueError):
+    pass
+
+
+def needs_download(ref: dict[str, Any]) -> bool:
+    return ref.get("provider") == "pixabay" and bool(ref.get("remote_url"))
+
+
+def is_downloaded(asset: Asset | None) -> bool:
+    # Assets stored locally before download tracking existed have no status.
+    return (
+        asset is not None
+        and asset.download_status in {AssetDownloadStatus.READY.value, None}
+        and bool(asset.local_path)
+        and Path(asset.local_path).exists()
+    )
+
+
+def _remote_suffix(remote_url: str, response: requests.Response) -> str:
+    suffix = Path(urlparse(remote_url).path).suffix.lower()
+    if suffix:
+        return suffix
+    content_type = response.headers.get("content-type")
+    if content_type:
+        guessed = mimetypes.guess_extension(content_type.split(";", 1)[0].strip())
+        if guessed:
+            return guessed
+    return ".jpg"
+
+
+def _resolve_pixabay_url(provider_id: str, *, stale_url: str) -> str | None:
+    if not pixabay.provider_ready():
+        return None
+    hit = pixabay.lookup_image(provider_id, stale_url=stale_url)
+    return pixabay.hit_url(hit) if hit is not None else None
+
+
+def _open_remote(ref: dict[str, Any]) -> tuple[requests.Response, str]:
+    remote_url = str(ref["remote_url"])
+    response = requests.get(remote_url, timeout=DOWNLOAD_TIMEOUT_SEC, stream=True)
+    try:
+        response.raise_for_status()
+        return response, remote_url
+    except requests.HTTPError:
+        response.close()
+        provider_id = str(ref.get("provider_id") or "")
+        refreshed_url = _resolve_pixabay_url(provider_id, stale_url=remote_url) if provider_id else None
+        if not refreshed_url or refreshed_url == remote_url:
+            raise
+    response = requests.get(refreshed_url, timeout=DOWNLOAD_TIMEOUT_SEC, stream=True)
+    response.raise_for_status()
+    return response, refreshed_url
+
+
+def store_response(response: requests.Response, suffix: str, *, max_bytes: int | None = None) -> Path:
+    """Stream ``response`` into the content-addressed store and return the stored path."""
+
+    max_bytes = settings.BUNDLE_ASSET_MAX_BYTES if max_bytes is None else max_bytes
+    declared = response.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        response.close()
+        raise DownloadTooLarge(f"Asset is {declared} bytes; the limit is {max_bytes}")
+    store = Path(settings.REMOTE_ASSET_CACHE_DIR)
+    store.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=store, suffix=".part")
+    tmp = Path(tmp_name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > max_bytes:
+                    raise DownloadTooLarge(f"Asset exceeds the {max_bytes} byte limit")
+                digest.update(chunk)
+                handle.write(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+        content_hash = digest.hexdigest()
+        target = store / content_hash[:2] / f"{content_hash}{suffix}"
+        if target.exists():
+            tmp.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, target)
+        return target
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        response.close()
+
+
+def download_bundle_asset(ref: dict[str, Any]) -> tuple[str, str]:
+    """Download ``ref`` into the store; returns the local path and the URL that served it."""
+
+    response, remote_url = _open_remote(ref)
+    path = store_response(response, _remote_suffix(remote_url, response))
+    return str(path), remote_url
+
+
+def _retryable(now: datetime):
+    return or_(
+        Asset.download_status == AssetDownloadStatus.PENDING.value,
+        and_(
+            Asset.download_status == AssetDownloadStatus.FAILED.value,
+            Asset.download_attempts < settings.BUNDLE_DOWNLOAD_MAX_ATTEMPTS,
+        ),
+        and_(
+            Asset.download_status == AssetDownloadStatus.DOWNLOADING.value,
+            Asset.updated_at < now - DOWNLOAD_CLAIM_STALE_AFTER,
+        ),
+    )
+
+
+def _claim(bind: Any, asset_id: int) -> bool:
+    """Move the asset to ``downloading`` unless another process got there first."""
+
+    now = datetime.now(timezone.utc)
+    with Session(bind) as session:
+        result = session.execute(
+            update(Asset)
+            .where(Asset.id == asset_id, _retryable(now))
+            .values(
+                download_status=AssetDownloadStatus.DOWNLOADING.value,
+                download_attempts=Asset.download_attempts + 1,
+                updated_at=now,
+            )
+        )
+        session.commit()
+    return result.rowcount == 1
+
+
+def _record_result(
+    bind: Any,
+    asset_id: int,
+    *,
+    status: AssetDownloadStatus,
+    local_path: str | None = None,
+    remote_url: str | None = None,
+) -> None:
+    with _bundle_lock, Session(bind) as session:
+        asset = session.get(Asset, asset_id)
+        if asset is None:
+            return
+        key = asset_to_media_ref(asset)["key"]
+        asset.local_path = local_path or asset.local_path
+        asset.remote_url = remote_url or asset.remote_url
+        asset.download_status = status.value
+        asset.updated_at = datetime.now(timezone.utc)
+        session.add(asset)
+        ref = asset_to_media_ref(asset)
+        bundles = session.exec(
+            select(AssetBundle).where(AssetBundle.story_id == asset.story_id).with_for_update()
+        ).all()
+        for bundle in bundles:
+            asset_refs = [
+                ref if isinstance(item, dict) and item.get("key") == key else item for item in bundle.asset_refs or []
+            ]
+            part_asset_map = [
+                {**row, "asset": ref}
+                if isinstance(row, dict) and isinstance(row.get("asset"), dict) and row["asset"].get("key") == key
+                else row
+                for row in bundle.part_asset_map or []
+            ]
+            if asset_refs == bundle.asset_refs and part_asset_map == bundle.part_asset_map:
+                continue
+            bundle.asset_refs = asset_refs
+            bundle.part_asset_map = part_asset_map
+            session.add(bundle)
+        session.commit()
+
+
+def _download_one(bind: Any, asset_id: int, ref: dict[str, Any]) -> bool | None:
+    """Download one asset; None when another process holds the claim."""
+
+    if not _claim(bind, asset_id):
+        return None
+    try:
+        local_path, remote_url = download_bundle_asset(ref)
+    except Exception as exc:
+        log_error(
+            "bundle_asset_download_failed",
+            asset_id=asset_id,
+            error_class=exc.__class__.__name__,
+            error=str(exc)[:300],
+        )
+        _record_result(bind, asset_id, status=AssetDownloadStatus.FAILED)
+        return False
+    _record_result(
+        bind,
+        asset_id,
+        status=AssetDownloadStatus.READY,
+        local_path=local_path,
+        remote_url=remote_url,
+    )
+    return True
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.BUNDLE_DOWNLOAD_WORKERS),
+                thread_name_prefix="bundle-download",
+            )
+        return _executor
+
+
+def _submit(bind: Any, asset_id: int, ref: dict[str, Any]) -> Future[bool | None] | None:
+    """Queue a download unless one for ``asset_id`` is already queued in this process."""
+
+    with _inflight_lock:
+        if asset_id in _inflight:
+            return None
+        _inflight.add(asset_id)
+    future = _pool().submit(_download_one, bind, asset_id, ref)
+
+    def release(_future: Future[bool | None]) -> None:
+        with _inflight_lock:
+            _inflight.discard(asset_id)
+
+    future.add_done_callback(release)
+    return future
+
+
+def _log_when_done(event: str, futures: list[Future[bool | None]], **fields: Any) -> None:
+    """Log ``event`` with ready/failed/skipped counts once every future has finished."""
+
+    lock = threading.Lock()
+    outcomes: list[bool | None] = []
+
+    def finished(future: Future[bool | None]) -> None:
+        outcome = False if future.exception() is not None else future.result()
+        with lock:
+            outcomes.append(outcome)
+            if len(outcomes) < len(futures):
+                return
+            counts = {
+                "ready": outcomes.count(True),
+                "failed": outcomes.count(False),
+                "skipped": outcomes.count(None),
+            }
+        log_info(event, **counts, **fields)
+
+    for future in futures:
+        future.add_done_callback(finished)
+
+
+def download_bundle_assets(bind: Any, bundle_id: int, downloads: list[tuple[int, dict[str, Any]]]) -> None:
+    """Queue a bundle's pending assets on the shared pool; results are recorded as each finishes."""
+
+    futures = [future for asset_id, ref in downloads if (future := _submit(bind, asset_id, ref)) is not None]
+    _log_when_done("bundle_assets_downloaded", futures, bundle_id=bundle_id)
+
+
+def requeue_pending_downloads(bind: Any) -> int:
+    """Queue pending, retryable failed and abandoned downloads; returns how many were queued.
+
+    Safe to run from every API process: each worker claims its asset before
+    downloading, and only one claim succeeds.
+    """
+
+    with Session(bind) as session:
+        retryable = session.exec(select(Asset).where(_retryable(datetime.now(timezone.utc)))).all()
+        downloads = [(asset.id, asset_to_media_ref(asset)) for asset in retryable if asset.id is not None]
+    futures = [future for asset_id, ref in downloads if (future := _submit(bind, asset_id, ref)) is not None]
+    if futures:
+        log_info("bundle_downloads_requeued", count=len(futures))
+        _log_when_done("requeued_bundle_assets_downloaded", futures)
+    return len(futures)
+
+
+__all__ = [
+    "DOWNLOAD_CLAIM_STALE_AFTER",
+    "DownloadTooLarge",
+    "download_bundle_asset",
+    "download_bundle_assets",
+    "is_downloaded",
+    "needs_download",
+    "requeue_pending_downloads",
+    "store_response",
+]
@@ -0,0 +1,177 @@
+"""UTC cron expressions for the short publish schedule.
+
+Expressions have the usual five fields (minute, hour, day, month, weekday)
+with ``*``, lists, ranges and steps. Weekdays follow ``datetime.weekday()``
+(``0`` is Monday; ``7`` is accepted as ``0``). As in cron, when both day and
+weekday are restricted a day matches either; when one is ``*`` only the
+other applies.
+
+:func:`parse_cron` is memoized, and :meth:`CronSchedule.next_after` finds the
+next fire time by jumping month, day, hour and minute in turn instead of
+scanning minute by minute.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# A restricted day (e.g. Feb 29) can skip up to eight years across a
+# non-leap century; anything rarer never fires.
+SEARCH_HORIZON_YEARS = 9
+
+
+def _parse_cron_number(raw: str, *, minimum: int, maximum: int, field_name: str) -> int:
+    value = int(raw)
+    if field_name == "weekday" and value == 7:
+        value = 0
+    if value < minimum or value > maximum:
+        raise ValueError(f"Invalid {field_name} value: {raw!r}")
+    return value
+
+
+def _expand_cron_field(expression: str, *, minimum: int, maximum: int, field_name: str) -> tuple[set[int], bool]:
+    expr = expression.strip()
+    if not expr:
+        raise ValueError(f"Invalid cron field for {field_name!r}")
+    unrestricted = expr == "*"
+    values: set[int] = set()
+    for part in expr.split(","):
+        chunk = part.strip()
+        if not chunk:
+            raise ValueError(f"Invalid cron field for {field_name!r}")
+        step = 1
+        base = chunk
+        if "/" in chunk:
+            base, step_text = chunk.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"Invalid cron step for {field_name!r}")
+        if base == "*":
+            start = minimum
+            end = maximum
+        elif "-" in base:
+            start_text, end_text = base.split("-", 1)
+            start = _parse_cron_number(start_text, minimum=minimum, maximum=maximum, field_name=field_name)
+            end = _parse_cron_number(end_text, minimum=minimum, maximum=maximum, field_name=field_name)
+            if start > end:
+                raise ValueError(f"Invalid cron range for {field_name!r}")
+        else:
+            start = _parse_cron_number(base, minimum=minimum, maximum=maximum, field_name=field_name)
+            end = start
+        values.update(range(start, end + 1, step))
+    return values, unrestricted
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    expression: str
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: tuple[int, ...]
+    weekdays: frozenset[int]
+    minute_any: bool
+    hour_any: bool
+    day_any: bool
+    month_any: bool
+    weekday_any: bool
+
+    def matches_day(self, moment: datetime) -> bool:
+        if moment.month not in self.months:
+            return False
+        day_match = moment.day in self.days
+        weekday_match = moment.weekday() in self.weekdays
+        if self.day_any and self.weekday_any:
+            return day_match and weekday_match
+        if self.day_any:
+            return weekday_match
+        if self.weekday_any:
+            return day_match
+        return day_match or weekday_match
+
+    def matches(self, moment: datetime) -> bool:
+        return moment.minute in self.minutes and moment.hour in self.hours and self.matches_day(moment)
+
+    def next_after(self, moment: datetime) -> datetime | None:
+        """First fire time strictly after ``moment`` (UTC), or ``None`` if it never fires."""
+
+        candidate = moment.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        horizon = candidate.year + SEARCH_HORIZON_YEARS
+        while candidate.year <= horizon:
+            if candidate.month not in self.months:
+                index = bisect_right(self.months, candidate.month)
+                if index < len(self.months):
+                    candidate = candidate.replace(month=self.months[index], day=1, hour=0, minute=0)
+                else:
+                    candidate = candidate.replace(year=candidate.year + 1, month=self.months[0], day=1, hour=0, minute=0)
+                continue
+            if not self.matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                index = bisect_right(self.hours, candidate.hour)
+                if index < len(self.hours):
+                    candidate = candidate.replace(hour=self.hours[index], minute=0)
+                else:
+                    candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            index = bisect_left(self.minutes, candidate.minute)
+            if index < len(self.minutes):
+                return candidate.replace(minute=self.minutes[index])
+            candidate = candidate.replace(minute=0) + timedelta(hours=1)
+        return None
+
+    def fire_times(self, after: datetime, *, count: int) -> list[datetime]:
+        """The next ``count`` fire times after ``after``; raises if the cron runs dry."""
+
+        scheduled: list[datetime] = []
+        cursor = after
+        while len(scheduled) < count:
+            slot = self.next_after(cursor)
+            if slot is None:
+                raise ValueError(f"Unable to generate {count} schedule slots from cron {self.expression!r}")
+            scheduled.append(slot)
+            cursor = slot
+        return scheduled
+
+    def fire_times_between(self, start: datetime, end: datetime) -> list[datetime]:
+        """Fire times in ``[start, end)``."""
+
+        slots: list[datetime] = []
+        slot = self.next_after(start - timedelta(minutes=1))
+        while slot is not None and slot < end:
+            slots.append(slot)
+            slot = self.next_after(slot)
+        return slots
+
+
+@lru_cache(maxsize=64)
+def parse_cron(expression: str) -> CronSchedule:
+    parts = expression.split()
+    if len(parts) != 5:
+        raise ValueError("Cron must have exactly 5 fields")
+    minute, hour, day, month, weekday = parts
+    minutes, minute_any = _expand_cron_field(minute, minimum=0, maximum=59, field_name="minute")
+    hours, hour_any = _expand_cron_field(hour, minimum=0, maximum=23, field_name="hour")
+    days, day_any = _expand_cron_field(day, minimum=1, maximum=31, field_name="day")
+    months, month_any = _expand_cron_field(month, minimum=1, maximum=12, field_name="month")
+    weekdays, weekday_any = _expand_cron_field(weekday, minimum=0, maximum=6, field_name="weekday")
+    return CronSchedule(
+        expression=expression,
+        minutes=tuple(sorted(minutes)),
+        hours=tuple(sorted(hours)),
+        days=frozenset(days),
+        months=tuple(sorted(months)),
+        weekdays=frozenset(weekdays),
+        minute_any=minute_any,
+        hour_any=hour_any,
+        day_any=day_any,
+        month_any=month_any,
+        weekday_any=weekday_any,
+    )
+
+
+__all__ = ["CronSchedule", "SEARCH_HORIZON_YEARS", "parse_cron"]
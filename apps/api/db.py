@@ -4,18 +4,58 @@ from __future__ import annotations
 
 from pathlib import Path
 import logging
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Protocol, TypeVar
 
 from alembic import command
 from alembic.config import Config
+from fastapi import Depends
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import OperationalError
 from sqlmodel import Session, create_engine
+from starlette.concurrency import run_in_threadpool
 
 from shared.config import settings
 
+if TYPE_CHECKING:  # pragma: no cover - the asyncio extension needs greenlet at import time
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
 
 logger = logging.getLogger(__name__)
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+ASYNC_DRIVERS = {"postgresql+psycopg", "postgresql+asyncpg"}
+T = TypeVar("T")
+
+
+def pool_options(url: str) -> dict[str, Any]:
+    """Return pool settings for ``url``; sqlite keeps SQLAlchemy's defaults."""
+
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SEC,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, echo=False, **pool_options(settings.DATABASE_URL))
+_async_engine: AsyncEngine | None = None
+
+
+def async_engine_enabled() -> bool:
+    return settings.DATABASE_ASYNC_ENABLED and make_url(settings.DATABASE_URL).drivername in ASYNC_DRIVERS
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use."""
+
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(settings.DATABASE_URL, echo=False, **pool_options(settings.DATABASE_URL))
+    return _async_engine
 
 
 def init_db() -> None:
@@ -39,5 +79,63 @@ def get_session() -> Session:
         yield session
 
 
-__all__ = ["engine", "init_db", "get_session"]
+class AsyncSessionLike(Protocol):
+    """What async routes rely on: ``AsyncSession.run_sync``."""
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T: ...
+
+
+class SyncSessionAdapter:
+    """Serve ``async def`` routes from a sync ``Session``.
+
+    Async routes only touch the database through ``run_sync``, so the same
+    handler code runs on an ``AsyncSession`` in production and on a plain
+    session for sqlite and tests. The blocking work runs on the threadpool so
+    it never stalls the event loop.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+async def get_async_session() -> AsyncIterator[AsyncSessionLike]:
+    """Yield an async session, or a sync adapter when the driver has no async mode."""
+
+    if not async_engine_enabled():
+        with Session(engine) as session:
+            yield SyncSessionAdapter(session)
+        return
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+def sync_async_session(session: Session = Depends(get_session)) -> SyncSessionAdapter:
+    """Override for ``get_async_session`` that reuses the ``get_session`` dependency."""
+
+    return SyncSessionAdapter(session)
+
+
+async def dispose_engines() -> None:
+    engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
 
+__all__ = [
+    "AsyncSessionLike",
+    "SyncSessionAdapter",
+    "async_engine_enabled",
+    "dispose_engines",
+    "engine",
+    "get_async_engine",
+    "get_async_session",
+    "get_session",
+    "init_db",
+    "pool_options",
+    "sync_async_session",
+]
@@ -11,13 +11,15 @@ from sqlmodel import SQLModel, Session, select
 from shared.config import settings
 from shared.workflow import ReleaseStatus, RenderVariant
 
-from .db import get_session
+from .db import AsyncSessionLike, get_async_session, get_session
 from .models import MetricsSnapshot, MetricsSnapshotRead, Release, ReleaseRead
-from .publishing import latest_release_snapshot, release_read
+from .publishing import latest_release_snapshots, release_read, release_reads, schedule_metrics_sync
 from .refinement import compute_derived_metrics
 
 router = APIRouter(tags=["insights"])
 
+SYNC_DUE_SLACK = timedelta(seconds=60)
+
 
 class InsightSyncTarget(SQLModel):
     release_id: int
@@ -81,7 +83,7 @@ def list_insight_releases(
     days: int = Query(default=settings.INSIGHTS_LOOKBACK_DAYS, ge=1, le=90),
     session: Session = Depends(get_session),
 ) -> list[ReleaseRead]:
-    return [release_read(session, release) for release in _published_youtube_short_releases(session, days=days)]
+    return release_reads(session, _published_youtube_short_releases(session, days=days))
 
 
 @router.get("/insights/summary", response_model=InsightsSummaryRead)
@@ -90,7 +92,7 @@ def get_insights_summary(
     session: Session = Depends(get_session),
 ) -> InsightsSummaryRead:
     now = datetime.now(timezone.utc)
-    releases = [release_read(session, release) for release in _published_youtube_short_releases(session, days=days)]
+    releases = release_reads(session, _published_youtube_short_releases(session, days=days))
     last_syncs = [release.latest_metrics_sync_at for release in releases if release.latest_metrics_sync_at]
     stale_cutoff = now - timedelta(seconds=max(settings.INSIGHTS_SYNC_INTERVAL_SEC * 2, 3600))
     return InsightsSummaryRead(
@@ -134,40 +136,45 @@ def get_release_insights_history(
     )
 
 
+def _list_insight_sync_targets(session: Session, limit: int) -> list[InsightSyncTarget]:
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=max(settings.INSIGHTS_LOOKBACK_DAYS, 1))
+    releases = session.exec(
+        select(Release)
+        .where(
+            Release.platform == "youtube",
+            Release.variant == RenderVariant.SHORT.value,
+            Release.status == ReleaseStatus.PUBLISHED.value,
+            Release.next_metrics_sync_at <= now + SYNC_DUE_SLACK,
+            Release.platform_video_id.is_not(None),
+            Release.published_at >= cutoff,
+        )
+        .order_by(Release.next_metrics_sync_at.asc(), Release.id.asc())
+        .limit(limit)
+    ).all()
+    latest = latest_release_snapshots(session, [release.id for release in releases])
+    return [
+        InsightSyncTarget(
+            release_id=release.id or 0,
+            story_id=release.story_id,
+            title=release.title,
+            platform_video_id=release.platform_video_id,
+            published_at=release.published_at,
+            last_synced_at=latest[release.id].captured_at if release.id in latest else None,
+        )
+        for release in releases
+    ]
+
+
 @router.get("/insights/sync-targets", response_model=list[InsightSyncTarget], dependencies=[Depends(require_worker_token)])
-def list_insight_sync_targets(
+async def list_insight_sync_targets(
     limit: int = Query(default=settings.INSIGHTS_BATCH_LIMIT, ge=1, le=200),
-    session: Session = Depends(get_session),
+    session: AsyncSessionLike = Depends(get_async_session),
 ) -> list[InsightSyncTarget]:
-    now = datetime.now(timezone.utc)
-    due_before = now - timedelta(seconds=max(settings.INSIGHTS_SYNC_INTERVAL_SEC - 60, 60))
-    targets: list[InsightSyncTarget] = []
-    for release in _published_youtube_short_releases(session, days=settings.INSIGHTS_LOOKBACK_DAYS):
-        if not release.platform_video_id or not release.published_at:
-            continue
-        latest = latest_release_snapshot(session, release.id or 0)
-        if latest and latest.captured_at and latest.captured_at > due_before:
-            continue
-        targets.append(
-            InsightSyncTarget(
-                release_id=release.id or 0,
-                story_id=release.story_id,
-                title=release.title,
-                platform_video_id=release.platform_video_id,
-                published_at=release.published_at,
-                last_synced_at=latest.captured_at if latest else None,
-            )
-        )
-        if len(targets) >= limit:
-            break
-    return targets
+    return await session.run_sync(_list_insight_sync_targets, limit)
 
 
-@router.post("/insights/snapshots", response_model=MetricsSnapshotRead, dependencies=[Depends(require_worker_token)])
-def create_or_update_snapshot(
-    payload: InsightSnapshotCreate,
-    session: Session = Depends(get_session),
-) -> MetricsSnapshotRead:
+def _create_or_update_snapshot(session: Session, payload: InsightSnapshotCreate) -> MetricsSnapshotRead:
     release = session.get(Release, payload.release_id)
     if not release:
         raise HTTPException(status_code=404, detail="Release not found")
@@ -214,8 +221,18 @@ def create_or_update_snapshot(
         "latest_youtube_metrics": metrics,
         "insights_last_synced_at": captured_at.isoformat(),
     }
+    if payload.source == "youtube_insights":
+        schedule_metrics_sync(release, synced_at=captured_at)
     session.add(snapshot)
     session.add(release)
     session.commit()
     session.refresh(snapshot)
     return MetricsSnapshotRead.model_validate(snapshot)
+
+
+@router.post("/insights/snapshots", response_model=MetricsSnapshotRead, dependencies=[Depends(require_worker_token)])
+async def create_or_update_snapshot(
+    payload: InsightSnapshotCreate,
+    session: AsyncSessionLike = Depends(get_async_session),
+) -> MetricsSnapshotRead:
+    return await session.run_sync(_create_or_update_snapshot, payload)
@@ -2,37 +2,142 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlmodel import Session, select
 
 from .db import get_session
 from .models import Job, JobRead, JobUpdate
+from .pagination import count_response, cursor_id, page_limit, set_next_cursor
+from .streaming import id_batches, ndjson_response
 
 router = APIRouter(tags=["jobs"])
 
 
+def _job_filters(
+    *,
+    story_id: int | None,
+    story_part_id: int | None,
+    compilation_id: int | None,
+    kind: str | None,
+    status: str | None,
+) -> list[Any]:
+    filters: list[Any] = []
+    if story_id is not None:
+        filters.append(Job.story_id == story_id)
+    if story_part_id is not None:
+        filters.append(Job.story_part_id == story_part_id)
+    if compilation_id is not None:
+        filters.append(Job.compilation_id == compilation_id)
+    if kind:
+        filters.append(Job.kind == kind)
+    if status:
+        filters.append(Job.status == status)
+    return filters
+
+
+def jobs_query(
+    *,
+    story_id: int | None = None,
+    story_part_id: int | None = None,
+    compilation_id: int | None = None,
+    kind: str | None = None,
+    status: str | None = None,
+    after_id: int | None = None,
+    limit: int,
+) -> Any:
+    query = select(Job).where(
+        *_job_filters(
+            story_id=story_id,
+            story_part_id=story_part_id,
+            compilation_id=compilation_id,
+            kind=kind,
+            status=status,
+        )
+    )
+    if after_id is not None:
+        query = query.where(Job.id < after_id)
+    return query.order_by(Job.id.desc()).limit(limit)
+
+
 @router.get("/jobs", response_model=list[JobRead])
 def list_jobs(
+    response: Response,
     story_id: int | None = None,
     story_part_id: int | None = None,
     compilation_id: int | None = None,
     kind: str | None = None,
     status: str | None = None,
+    cursor: str | None = None,
+    after_id: int | None = None,
+    limit: int = page_limit(),
     session: Session = Depends(get_session),
 ) -> list[Job]:
-    query = select(Job)
-    if story_id is not None:
-        query = query.where(Job.story_id == story_id)
-    if story_part_id is not None:
-        query = query.where(Job.story_part_id == story_part_id)
-    if compilation_id is not None:
-        query = query.where(Job.compilation_id == compilation_id)
-    if kind:
-        query = query.where(Job.kind == kind)
-    if status:
-        query = query.where(Job.status == status)
-    query = query.order_by(Job.id.desc())
-    return session.exec(query).all()
+    query = jobs_query(
+        story_id=story_id,
+        story_part_id=story_part_id,
+        compilation_id=compilation_id,
+        kind=kind,
+        status=status,
+        after_id=cursor_id(cursor, after_id),
+        limit=limit,
+    )
+    jobs = session.exec(query).all()
+    set_next_cursor(response, jobs, limit)
+    return jobs
+
+
+@router.get("/jobs/count")
+def count_jobs(
+    response: Response,
+    story_id: int | None = None,
+    story_part_id: int | None = None,
+    compilation_id: int | None = None,
+    kind: str | None = None,
+    status: str | None = None,
+    session: Session = Depends(get_session),
+) -> dict[str, int]:
+    total = session.exec(
+        select(func.count()).select_from(Job).where(
+            *_job_filters(
+                story_id=story_id,
+                story_part_id=story_part_id,
+                compilation_id=compilation_id,
+                kind=kind,
+                status=status,
+            )
+        )
+    ).one()
+    return count_response(response, total)
+
+
+@router.get("/jobs/stream", response_class=StreamingResponse)
+def stream_jobs(
+    story_id: int | None = None,
+    story_part_id: int | None = None,
+    compilation_id: int | None = None,
+    kind: str | None = None,
+    status: str | None = None,
+    session: Session = Depends(get_session),
+) -> StreamingResponse:
+    """Every matching job as NDJSON, newest first."""
+
+    query = select(Job).where(
+        *_job_filters(
+            story_id=story_id,
+            story_part_id=story_part_id,
+            compilation_id=compilation_id,
+            kind=kind,
+            status=status,
+        )
+    )
+    return ndjson_response(
+        id_batches(session, query, Job.id),
+        lambda jobs: (JobRead.model_validate(job) for job in jobs),
+    )
 
 
 @router.get("/jobs/{job_id}", response_model=JobRead)
@@ -62,4 +167,4 @@ def update_job(
     return job
 
 
-__all__ = ["router"]
+__all__ = ["jobs_query", "router"]
@@ -2,21 +2,21 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from time import monotonic
 
-from .db import Session, engine, init_db
+from .bundle_downloads import requeue_pending_downloads
+from .db import Session, dispose_engines, engine, init_db
 from .pipeline import ensure_default_presets
 from .refinement import ensure_default_prompt_versions
 from .script_refinement import router as script_refinement_router
 from .stories import router as stories_router
 from .jobs import router as jobs_router
+from .observability import DB_QUERIES_HEADER, DB_TIME_HEADER, RequestMetricsMiddleware, metrics_response
+from .pagination import NEXT_CURSOR_HEADER
 from .reddit_admin import router as reddit_admin_router
 from .admin_stories import router as admin_stories_router
 from .admin_render_jobs import router as admin_render_jobs_router
@@ -28,7 +28,6 @@ from .render_jobs import router as render_jobs_router
 
 
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("api")
 ready = False
 
 
@@ -39,8 +38,10 @@ async def lifespan(_app: FastAPI):
     with Session(engine) as session:
         ensure_default_presets(session)
         ensure_default_prompt_versions(session)
+    requeue_pending_downloads(engine)
     ready = True
     yield
+    await dispose_engines()
 
 
 app = FastAPI(title="Dark Life API", lifespan=lifespan)
@@ -55,30 +56,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, DB_QUERIES_HEADER, DB_TIME_HEADER],
 )
-
-
-class LogRequestsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start = monotonic()
-        response = await call_next(request)
-        duration_ms = int((monotonic() - start) * 1000)
-        logger.info(
-            json.dumps(
-                {
-                    "service": "api",
-                    "event": "request",
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status": response.status_code,
-                    "duration_ms": duration_ms,
-                }
-            )
-        )
-        return response
-
-
-app.add_middleware(LogRequestsMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 app.include_router(stories_router)
 app.include_router(script_refinement_router)
 app.include_router(jobs_router)
@@ -104,3 +84,9 @@ async def readyz() -> dict[str, str]:
     if not ready:
         raise HTTPException(status_code=503, detail="not ready")
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return metrics_response()
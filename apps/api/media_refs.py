@@ -43,6 +43,7 @@ def asset_to_media_ref(asset: Asset) -> dict[str, Any]:
         "orientation": asset.orientation,
         "attribution": asset.attribution,
         "tags": asset.tags,
+        "download_status": asset.download_status,
     }
 
 
@@ -60,6 +61,7 @@ def normalize_media_ref(raw: dict[str, Any]) -> dict[str, Any]:
         "orientation": raw.get("orientation"),
         "attribution": raw.get("attribution"),
         "tags": raw.get("tags"),
+        "download_status": raw.get("download_status"),
     }
     if not ref["remote_url"] and not ref["local_path"]:
         raise ValueError("Media reference must include remote_url or local_path")
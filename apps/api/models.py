@@ -5,7 +5,22 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, JSON, String, Text, UniqueConstraint, func
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    literal,
+    text,
+)
 from sqlmodel import Field, SQLModel
 
 from shared.workflow import (
@@ -15,6 +30,7 @@ from shared.workflow import (
     PublishDeliveryMode,
     PublishJobStatus,
     ReleaseStatus,
+    RenderQualityTier,
     RenderVariant,
     StoryStatus,
 )
@@ -24,12 +40,20 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def as_utc(value: datetime) -> datetime:
+    """``value`` in UTC; naive values, as sqlite returns them, are taken to be UTC."""
+
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
 class TimestampedModel(SQLModel):
     created_at: datetime | None = Field(
         default_factory=utc_now,
     )
     updated_at: datetime | None = Field(
         default_factory=utc_now,
+        # Bumped on every ORM or Core UPDATE; render context ETags version rows by it.
+        sa_column_kwargs={"onupdate": utc_now},
     )
 
 
@@ -61,11 +85,38 @@ class StoryBase(SQLModel):
 
 
 class Story(StoryBase, TimestampedModel, table=True):
+    __table_args__ = (Index("ix_story_source_external", "source", "external_id", unique=True),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    duplicate_key_hash: str | None = Field(default=None, sa_column=Column(String(64), index=True))
     active_script_version_id: int | None = Field(default=None, foreign_key="scriptversion.id")
     active_asset_bundle_id: int | None = Field(default=None, foreign_key="assetbundle.id")
 
 
+class StoryLshBucket(SQLModel, table=True):
+    """One MinHash LSH band bucket for a story body, used for near-duplicate lookups."""
+
+    __table_args__ = (
+        UniqueConstraint("story_id", "band"),
+        Index("ix_storylshbucket_band_bucket", "band", "bucket"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    story_id: int = Field(foreign_key="story.id")
+    band: int
+    bucket: str = Field(sa_column=Column(String(16), nullable=False))
+
+
+class StoryOverview(SQLModel, table=True):
+    """Denormalized ``/stories/{id}/overview`` document, kept current on commit."""
+
+    story_id: int = Field(foreign_key="story.id", primary_key=True)
+    version: int = 1
+    document: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    stale_after: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+    built_at: datetime | None = Field(default_factory=utc_now, sa_column=Column(DateTime(timezone=True)))
+
+
 class StoryCreate(StoryBase):
     pass
 
@@ -78,6 +129,11 @@ class StoryRead(StoryBase):
     updated_at: datetime | None = None
 
 
+class StorySearchRead(StoryRead):
+    search_rank: float | None = None
+    search_headline: str | None = None
+
+
 class StoryUpdate(SQLModel):
     title: Optional[str] = None
     subreddit: Optional[str] = None
@@ -158,6 +214,11 @@ class StoryPartBase(SQLModel):
 class StoryPart(StoryPartBase, TimestampedModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
 
+    __table_args__ = (
+        Index("ix_storypart_story_id", "story_id"),
+        Index("ix_storypart_script_version_index", "script_version_id", "index"),
+    )
+
 
 class StoryPartRead(StoryPartBase):
     id: int
@@ -183,10 +244,47 @@ class AssetBase(SQLModel):
     rating: int | None = None
     attribution: str | None = None
     tags: list[str] | None = Field(default=None, sa_column=Column(JSON))
+    download_status: str | None = None
 
 
 class Asset(AssetBase, TimestampedModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    # Local library fingerprint; unchanged files are skipped by the indexer without hashing.
+    file_size: int | None = Field(default=None, sa_column=Column(BigInteger))
+    file_mtime_ns: int | None = Field(default=None, sa_column=Column(BigInteger))
+    # Background download claims of this asset; failed ones are retried below BUNDLE_DOWNLOAD_MAX_ATTEMPTS.
+    download_attempts: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+
+    __table_args__ = (
+        Index(
+            "ix_asset_download_retry",
+            "download_status",
+            postgresql_where=text("download_status <> 'ready'"),
+            sqlite_where=text("download_status <> 'ready'"),
+        ),
+    )
+
+
+class AssetTag(SQLModel, table=True):
+    """One normalized tag of an asset; the inverted index behind library ranking."""
+
+    __table_args__ = (Index("ix_assettag_tag_asset_id", "tag", "asset_id"),)
+
+    asset_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("asset.id", ondelete="CASCADE"), primary_key=True)
+    )
+    tag: str = Field(sa_column=Column(String, primary_key=True))
+
+
+class LocalAssetDuplicate(SQLModel, table=True):
+    """A library file whose content is already indexed as ``asset_id`` under another path."""
+
+    local_path: str = Field(sa_column=Column(String, primary_key=True))
+    asset_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("asset.id", ondelete="CASCADE"), nullable=False, index=True)
+    )
+    file_size: int = Field(sa_column=Column(BigInteger, nullable=False))
+    file_mtime_ns: int = Field(sa_column=Column(BigInteger, nullable=False))
 
 
 class AssetRead(AssetBase):
@@ -208,6 +306,7 @@ class MediaReference(SQLModel):
     orientation: str | None = None
     attribution: str | None = None
     tags: list[str] | None = None
+    download_status: str | None = None
 
 
 class PartMediaSelection(SQLModel):
@@ -291,6 +390,25 @@ class CompilationRead(CompilationBase):
 
 class Job(SQLModel, table=True):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_kind_id", "status", "kind", "id"),
+        Index("ix_jobs_story_part_kind_tier_id", "story_part_id", "kind", "quality_tier", "id"),
+        Index("ix_jobs_story_kind_part", "story_id", "kind", "story_part_id"),
+        Index(
+            "ix_jobs_queued_kind_story_id",
+            "kind",
+            "story_id",
+            "id",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+        Index(
+            "ix_jobs_queued_id",
+            "id",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     story_id: int | None = Field(default=None, foreign_key="story.id")
@@ -301,6 +419,7 @@ class Job(SQLModel, table=True):
     render_preset_id: int | None = Field(default=None, foreign_key="renderpreset.id")
     kind: str
     variant: str = Field(default=RenderVariant.SHORT.value)
+    quality_tier: str = Field(default=RenderQualityTier.FINAL.value)
     status: str = Field(default=JobStatus.QUEUED.value)
     correlation_id: str | None = None
     lease_expires_at: datetime | None = Field(
@@ -336,6 +455,7 @@ class JobRead(SQLModel):
     render_preset_id: int | None = None
     kind: str
     variant: str
+    quality_tier: str = RenderQualityTier.FINAL.value
     status: str
     correlation_id: str | None = None
     payload: dict | None = None
@@ -358,6 +478,8 @@ class RenderArtifactBase(SQLModel):
     script_version_id: int | None = Field(default=None, foreign_key="scriptversion.id")
     compilation_id: int | None = Field(default=None, foreign_key="compilation.id")
     variant: str = Field(default=RenderVariant.SHORT.value)
+    quality_tier: str = Field(default=RenderQualityTier.FINAL.value)
+    platform: str | None = None
     video_path: str
     subtitle_path: str | None = None
     waveform_path: str | None = None
@@ -402,12 +524,46 @@ class ReleaseBase(SQLModel):
 class Release(ReleaseBase, TimestampedModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     published_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+    next_metrics_sync_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
 
     __table_args__ = (
         UniqueConstraint("story_id", "story_part_id", "compilation_id", "platform", "variant"),
+        Index("ix_release_metrics_sync_due", "platform", "variant", "status", "next_metrics_sync_at"),
+        Index("ix_release_status_publish_at_id", "status", "publish_at", "id"),
+        Index(
+            "ix_release_script_platform_published",
+            "script_version_id",
+            "platform",
+            "published_at",
+            postgresql_where=text("published_at IS NOT NULL"),
+            sqlite_where=text("published_at IS NOT NULL"),
+        ),
     )
 
 
+RELEASE_QUEUE_FAR_FUTURE = datetime(9999, 12, 31, tzinfo=timezone.utc)
+RELEASE_QUEUE_FAR_PAST = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def release_queue_sort_keys() -> tuple[Any, Any]:
+    """``publish_at`` and ``published_at`` with sentinels in place of NULLs.
+
+    Unscheduled releases sort last and unpublished ones after published ones.
+    The sentinels are rendered inline so the queue query compiles to the same
+    expressions as ``ix_release_queue_order``.
+    """
+
+    sentinel_type = DateTime(timezone=True)
+    return (
+        func.coalesce(Release.publish_at, literal(RELEASE_QUEUE_FAR_FUTURE, sentinel_type, literal_execute=True)),
+        func.coalesce(Release.published_at, literal(RELEASE_QUEUE_FAR_PAST, sentinel_type, literal_execute=True)),
+    )
+
+
+_queue_publish_key, _queue_published_key = release_queue_sort_keys()
+Index("ix_release_queue_order", _queue_publish_key, _queue_published_key.desc(), Release.id)
+
+
 class ReleaseEarlySignalRead(SQLModel):
     window_hours: int
     state: str
@@ -425,6 +581,8 @@ class ReleaseRead(ReleaseBase):
     updated_at: datetime | None = None
     artifact_path: str | None = None
     signed_asset_url: str | None = None
+    signed_proxy_url: str | None = None
+    signed_contact_sheet_url: str | None = None
     publish_job_id: int | None = None
     latest_metrics_sync_at: datetime | None = None
     latest_metrics: dict[str, float] | None = None
@@ -450,7 +608,16 @@ class PublishJobBase(SQLModel):
 class PublishJob(PublishJobBase, TimestampedModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
 
-    __table_args__ = (UniqueConstraint("release_id"),)
+    __table_args__ = (
+        UniqueConstraint("release_id"),
+        Index("ix_publishjob_status_not_before_id", "status", "not_before", "id"),
+        Index(
+            "ix_publishjob_queued_id",
+            "id",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+    )
 
 
 class PublishJobRead(PublishJobBase):
@@ -560,6 +727,8 @@ class MetricsSnapshotBase(SQLModel):
 class MetricsSnapshot(MetricsSnapshotBase, TimestampedModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
 
+    __table_args__ = (Index("ix_metricssnapshot_release_source_captured", "release_id", "source", "captured_at", "id"),)
+
 
 class MetricsSnapshotRead(MetricsSnapshotBase):
     id: int
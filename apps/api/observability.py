@@ -0,0 +1,178 @@
+"""Request metrics, per-request SQL accounting and the slow-query log.
+
+``RequestMetricsMiddleware`` opens a :class:`RequestDbStats` for each request
+in a context variable. Engine-wide SQLAlchemy cursor events add every
+statement's count and time to it, including statements run by sync routes in
+the threadpool, because those threads share the same stats object. When the
+response is ready the middleware:
+
+- observes Prometheus histograms labelled by method and route template
+  (``/stories/{story_id}``), never the raw path, so label cardinality stays
+  bounded;
+- sets ``X-DB-Queries`` / ``X-DB-Time-Ms`` when ``API_DB_QUERY_HEADER`` is on;
+- writes the JSON request log line.
+
+Statements slower than ``API_SLOW_QUERY_MS`` are logged with bound
+parameters omitted and quoted literals replaced by ``'?'``. Streaming bodies
+run after the headers are sent, so their queries show up in the slow-query
+log but not in the per-request totals.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic, perf_counter
+from typing import Any
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from shared.config import settings
+
+logger = logging.getLogger("api")
+sql_logger = logging.getLogger("api.sql")
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time-Ms"
+UNMATCHED_ROUTE = "unmatched"
+SLOW_QUERY_STATEMENT_LIMIT = 2000
+_QUERY_START = "observability_query_start"
+_QUOTED_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+REQUEST_LATENCY = Histogram(
+    "api_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "api_request_db_queries",
+    "SQL statements executed per API request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "api_request_db_seconds",
+    "Time spent in SQL per API request",
+    ["method", "route"],
+)
+SLOW_QUERIES = Counter(
+    "api_slow_queries_total",
+    "SQL statements slower than API_SLOW_QUERY_MS",
+)
+
+
+@dataclass
+class RequestDbStats:
+    method: str | None = None
+    path: str | None = None
+    queries: int = 0
+    seconds: float = 0.0
+
+
+_request_db_stats: ContextVar[RequestDbStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def current_db_stats() -> RequestDbStats | None:
+    return _request_db_stats.get()
+
+
+def redact_statement(statement: str) -> str:
+    compact = " ".join(_QUOTED_LITERAL.sub("'?'", statement).split())
+    return compact[:SLOW_QUERY_STATEMENT_LIMIT]
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn: Any, _cursor: Any, _statement: str, _parameters: Any, _context: Any, _executemany: bool) -> None:
+    conn.info.setdefault(_QUERY_START, []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn: Any, _cursor: Any, statement: str, parameters: Any, _context: Any, executemany: bool) -> None:
+    starts = conn.info.get(_QUERY_START)
+    if not starts:
+        return
+    elapsed = perf_counter() - starts.pop()
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+    if elapsed * 1000 < settings.API_SLOW_QUERY_MS:
+        return
+    SLOW_QUERIES.inc()
+    sql_logger.warning(
+        json.dumps(
+            {
+                "service": "api",
+                "event": "slow_query",
+                "method": stats.method if stats is not None else None,
+                "path": stats.path if stats is not None else None,
+                "duration_ms": round(elapsed * 1000, 1),
+                "statement": redact_statement(statement),
+                "parameters": f"<redacted {len(parameters) if executemany else 1} set(s)>" if parameters else None,
+            }
+        )
+    )
+
+
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestDbStats(method=request.method, path=request.url.path)
+        token = _request_db_stats.set(stats)
+        start = monotonic()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            duration = monotonic() - start
+            _request_db_stats.reset(token)
+            route = _route_template(request)
+            REQUEST_LATENCY.labels(method=request.method, route=route, status=str(status)).observe(duration)
+            REQUEST_DB_QUERIES.labels(method=request.method, route=route).observe(stats.queries)
+            REQUEST_DB_SECONDS.labels(method=request.method, route=route).observe(stats.seconds)
+            logger.info(
+                json.dumps(
+                    {
+                        "service": "api",
+                        "event": "request",
+                        "method": request.method,
+                        "path": request.url.path,
+                        "route": route,
+                        "status": status,
+                        "duration_ms": int(duration * 1000),
+                        "db_queries": stats.queries,
+                        "db_ms": round(stats.seconds * 1000, 1),
+                    }
+                )
+            )
+        if settings.API_DB_QUERY_HEADER:
+            response.headers[DB_QUERIES_HEADER] = str(stats.queries)
+            response.headers[DB_TIME_HEADER] = f"{stats.seconds * 1000:.1f}"
+        return response
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+__all__ = [
+    "DB_QUERIES_HEADER",
+    "DB_TIME_HEADER",
+    "RequestDbStats",
+    "RequestMetricsMiddleware",
+    "current_db_stats",
+    "metrics_response",
+    "redact_statement",
+]
@@ -0,0 +1,79 @@
+"""Keyset pagination helpers shared by the operator listing endpoints.
+
+Listings stay plain JSON arrays. When a page is full, the response carries an
+opaque ``X-Next-Cursor`` header; clients pass it back as ``?cursor=`` to
+continue after the last row. ``after_id`` is accepted as a readable
+alternative for listings ordered by id. Totals live on separate ``/count``
+endpoints so they can be cached independently of the pages.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException, Query, Response
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 500
+COUNT_CACHE_SECONDS = 30
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_limit(default: int = DEFAULT_PAGE_LIMIT) -> Any:
+    return Query(default=default, ge=1, le=MAX_PAGE_LIMIT)
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def cursor_id(cursor: str | None, after_id: int | None) -> int | None:
+    """Resolve the id to continue after from ``cursor`` or ``after_id``."""
+
+    if cursor:
+        value = decode_cursor(cursor).get("id")
+        if not isinstance(value, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return value
+    return after_id
+
+
+def set_next_cursor(response: Response, rows: list[Any], limit: int, **extra: Any) -> None:
+    """Advertise the cursor after the last row when the page is full."""
+
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": rows[-1].id, **extra})
+
+
+def count_response(response: Response, total: int) -> dict[str, int]:
+    response.headers["Cache-Control"] = f"private, max-age={COUNT_CACHE_SECONDS}"
+    return {"total": total}
+
+
+__all__ = [
+    "COUNT_CACHE_SECONDS",
+    "DEFAULT_PAGE_LIMIT",
+    "MAX_PAGE_LIMIT",
+    "NEXT_CURSOR_HEADER",
+    "count_response",
+    "cursor_id",
+    "decode_cursor",
+    "encode_cursor",
+    "page_limit",
+    "set_next_cursor",
+]
@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import hashlib
 import json
 import re
-import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable
@@ -14,8 +12,16 @@ import requests
 from sqlmodel import Session, select
 
 from shared.config import settings
-from shared.workflow import JobStatus, PublishApprovalStatus, ReleaseStatus, RenderVariant, StoryStatus
+from shared.workflow import (
+    JobStatus,
+    PublishApprovalStatus,
+    ReleaseStatus,
+    RenderQualityTier,
+    RenderVariant,
+    StoryStatus,
+)
 
+from .asset_tags import rank_library_assets
 from .models import (
     Asset,
     AssetBundle,
@@ -28,13 +34,12 @@ from .models import (
     StoryPart,
 )
 from .publishing import delivery_mode_for_platform, short_release_schedule
+from .reference_cache import RENDER_PRESET, cached, invalidate
 
 SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
 CHAPTER_BREAK_RE = re.compile(r"\n\s*\n+")
 WORDS_PER_SECOND = 2.6
 SHORT_TARGET_SECONDS = 55
-IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
-VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".webm"}
 STOPWORDS = {
     "a",
     "about",
@@ -457,6 +462,10 @@ def replace_parts_from_script(session: Session, story: Story, script: ScriptVers
 
 
 def ensure_default_presets(session: Session) -> None:
+    cached(session, RENDER_PRESET, "defaults", loader=lambda: _seed_default_presets(session))
+
+
+def _seed_default_presets(session: Session) -> bool:
     existing = {
         preset.slug
         for preset in session.exec(select(RenderPreset)).all()
@@ -500,85 +509,25 @@ def ensure_default_presets(session: Session) -> None:
             changed = True
     if changed:
         session.commit()
+        invalidate(RENDER_PRESET)
+    return True
 
 
-def _ffprobe_json(path: Path) -> dict:
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "stream=width,height:format=duration",
-                "-of",
-                "json",
-                str(path),
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return json.loads(result.stdout)
-    except Exception:
-        return {}
-
-
-def _orientation(width: int | None, height: int | None) -> str | None:
-    if not width or not height:
-        return None
-    if height > width:
-        return "portrait"
-    if width > height:
-        return "landscape"
-    return "square"
-
-
-def index_local_assets(session: Session) -> list[Asset]:
-    visuals_dir = Path(settings.VISUALS_DIR)
-    visuals_dir.mkdir(parents=True, exist_ok=True)
-    existing_hashes = {
-        asset.file_hash
-        for asset in session.exec(select(Asset).where(Asset.story_id.is_(None))).all()
-        if asset.file_hash
-    }
-    added: list[Asset] = []
-    for path in sorted(visuals_dir.rglob("*")):
-        if not path.is_file():
-            continue
-        ext = path.suffix.lower()
-        if ext not in IMAGE_EXTS | VIDEO_EXTS:
-            continue
-        digest = hashlib.sha256(path.read_bytes()).hexdigest()
-        if digest in existing_hashes:
-            continue
-        probe = _ffprobe_json(path)
-        streams = probe.get("streams") or [{}]
-        stream = streams[0] if streams else {}
-        width = stream.get("width")
-        height = stream.get("height")
-        duration = probe.get("format", {}).get("duration")
-        asset = Asset(
-            story_id=None,
-            type="video" if ext in VIDEO_EXTS else "image",
-            local_path=str(path),
-            source="local",
-            provider="filesystem",
-            provider_id=path.name,
-            selected=False,
-            duration_ms=int(float(duration) * 1000) if duration else None,
-            width=int(width) if width else None,
-            height=int(height) if height else None,
-            orientation=_orientation(int(width), int(height)) if width and height else None,
-            file_hash=digest,
-            tags=[token for token in re.split(r"[_\-\s]+", path.stem.lower()) if token],
-            attribution="local library",
-        )
-        session.add(asset)
-        added.append(asset)
-        existing_hashes.add(digest)
-    session.commit()
-    return session.exec(select(Asset).where(Asset.story_id.is_(None)).order_by(Asset.id)).all()
+def render_preset_by_slug(session: Session, slug: str) -> RenderPreset | None:
+    """Resolve ``slug`` through the cached slug-to-id map, seeding defaults first."""
+
+    ensure_default_presets(session)
+
+    def load() -> int | None:
+        return session.exec(select(RenderPreset.id).where(RenderPreset.slug == slug)).first()
+
+    preset_id = cached(session, RENDER_PRESET, "slug", slug, loader=load)
+    preset = session.get(RenderPreset, preset_id) if preset_id is not None else None
+    if preset is None and preset_id is not None:
+        invalidate(RENDER_PRESET)
+        preset_id = load()
+        preset = session.get(RenderPreset, preset_id) if preset_id is not None else None
+    return preset
 
 
 def best_assets_for_story(session: Session, story: Story, limit: int = 12) -> list[Asset]:
@@ -587,13 +536,14 @@ def best_assets_for_story(session: Session, story: Story, limit: int = 12) -> li
         for token in re.split(r"[^a-zA-Z0-9]+", f"{story.title} {story.body_md or ''}")
         if len(token) > 2
     }
-    assets = session.exec(select(Asset).where(Asset.story_id.is_(None))).all()
-    ranked = sorted(
-        assets,
-        key=lambda asset: sum(1 for tag in asset.tags or [] if tag in tokens),
-        reverse=True,
-    )
-    return ranked[:limit]
+    ranked = rank_library_assets(session, tokens, limit=limit)
+    if len(ranked) < limit:
+        # Pad with unmatched library assets, as the unranked fallback always did.
+        query = select(Asset).where(Asset.story_id.is_(None)).order_by(Asset.id)
+        if ranked:
+            query = query.where(Asset.id.not_in([asset.id for asset in ranked]))
+        ranked.extend(session.exec(query.limit(limit - len(ranked))).all())
+    return ranked
 
 
 def create_asset_bundle(
@@ -700,6 +650,45 @@ def create_short_releases(
     return releases, jobs
 
 
+def create_draft_render_jobs(
+    session: Session,
+    story: Story,
+    *,
+    preset: RenderPreset,
+    asset_bundle: AssetBundle,
+    parts: list[StoryPart],
+) -> list[Job]:
+    """Queue draft-tier part renders for operator review without touching releases."""
+
+    jobs: list[Job] = []
+    for part in parts:
+        job = Job(
+            story_id=story.id,
+            story_part_id=part.id,
+            script_version_id=part.script_version_id,
+            asset_bundle_id=asset_bundle.id,
+            render_preset_id=preset.id,
+            kind="render_part",
+            variant=RenderVariant.SHORT.value,
+            quality_tier=RenderQualityTier.DRAFT.value,
+            status=JobStatus.QUEUED.value,
+            correlation_id=f"story-{story.id}-script-{part.script_version_id or 'active'}-part-{part.index}-draft",
+            payload={
+                "story_id": story.id,
+                "story_part_id": part.id,
+                "variant": RenderVariant.SHORT.value,
+                "quality_tier": RenderQualityTier.DRAFT.value,
+                "asset_bundle_id": asset_bundle.id,
+                "script_version_id": part.script_version_id,
+                "render_preset_id": preset.id,
+                "part_index": part.index,
+            },
+        )
+        session.add(job)
+        jobs.append(job)
+    return jobs
+
+
 def create_weekly_compilation(
     session: Session,
     story: Story,
@@ -10,14 +10,33 @@ from sqlmodel import Session
 
 from .db import engine
 from .models import Release, RenderArtifact
-from .publishing import resolve_public_video_path, resolve_release_artifact, verify_signature
+from .publishing import (
+    PREVIEW_KINDS,
+    artifact_preview_path,
+    resolve_public_video_path,
+    resolve_release_artifact,
+    verify_signature,
+)
 
 
 router = APIRouter(prefix="/public", tags=["public-artifacts"])
 
 
-def _file_response(path: Path) -> FileResponse:
-    return FileResponse(path=path, media_type="video/mp4", filename=path.name)
+def _file_response(path: Path, media_type: str = "video/mp4") -> FileResponse:
+    return FileResponse(path=path, media_type=media_type, filename=path.name)
+
+
+def _preview_response(artifact: RenderArtifact, preview: str) -> FileResponse:
+    raw_path = artifact_preview_path(artifact, preview)
+    if not raw_path:
+        raise HTTPException(status_code=404, detail="Preview not found")
+    _, media_type = PREVIEW_KINDS[preview]
+    return _file_response(resolve_public_video_path(raw_path), media_type=media_type)
+
+
+def _require_preview_kind(preview: str) -> None:
+    if preview not in PREVIEW_KINDS:
+        raise HTTPException(status_code=404, detail="Preview not found")
 
 
 @router.get("/artifacts/{artifact_id}")
@@ -41,3 +60,38 @@ def get_public_release_asset(release_id: int, exp: int = Query(...), sig: str =
         if not artifact:
             raise HTTPException(status_code=404, detail="Artifact not found")
         return _file_response(resolve_public_video_path(artifact.video_path))
+
+
+@router.get("/artifacts/{artifact_id}/preview/{preview}")
+def get_public_artifact_preview(
+    artifact_id: int,
+    preview: str,
+    exp: int = Query(...),
+    sig: str = Query(...),
+) -> FileResponse:
+    _require_preview_kind(preview)
+    verify_signature(f"artifact-{preview}", artifact_id, exp, sig)
+    with Session(engine) as session:
+        artifact = session.get(RenderArtifact, artifact_id)
+        if not artifact:
+            raise HTTPException(status_code=404, detail="Artifact not found")
+        return _preview_response(artifact, preview)
+
+
+@router.get("/releases/{release_id}/preview/{preview}")
+def get_public_release_preview(
+    release_id: int,
+    preview: str,
+    exp: int = Query(...),
+    sig: str = Query(...),
+) -> FileResponse:
+    _require_preview_kind(preview)
+    verify_signature(f"release-{preview}", release_id, exp, sig)
+    with Session(engine) as session:
+        release = session.get(Release, release_id)
+        if not release:
+            raise HTTPException(status_code=404, detail="Release not found")
+        artifact = resolve_release_artifact(session, release)
+        if not artifact:
+            raise HTTPException(status_code=404, detail="Artifact not found")
+        return _preview_response(artifact, preview)
@@ -17,9 +17,9 @@ from shared.workflow import (
     can_transition_publish_job,
 )
 
-from .db import get_session
+from .db import AsyncSessionLike, get_async_session
 from .models import PublishJob, PublishJobRead, Release, RenderArtifact, Story
-from .publishing import maybe_mark_story_published, release_read, resolve_release_artifact
+from .publishing import maybe_mark_story_published, release_read, resolve_release_artifact, schedule_metrics_sync
 
 
 router = APIRouter(prefix="/publish-jobs", tags=["publish-jobs"])
@@ -73,32 +73,33 @@ def _assemble_publish_context(job: PublishJob, session: Session) -> dict[str, An
     }
 
 
-@router.get("/", response_model=list[PublishJobRead])
-def list_publish_jobs(
-    status: str | None = None,
-    limit: int = 100,
-    session: Session = Depends(get_session),
-    _: None = Depends(require_worker_token),
-) -> list[PublishJob]:
+def publish_jobs_query(status: str | None, limit: int, *, now: datetime | None = None) -> Any:
     query = select(PublishJob)
     if status:
         query = query.where(PublishJob.status == status)
     if status == PublishJobStatus.QUEUED.value:
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         query = query.where(
             (PublishJob.not_before.is_(None)) | (PublishJob.not_before <= now)
         )
-    query = query.order_by(PublishJob.id).limit(limit)
-    return session.exec(query).all()
+    return query.order_by(PublishJob.id).limit(limit)
 
 
-@router.post("/{job_id}/claim")
-def claim_publish_job(
-    job_id: int,
-    request: ClaimRequest,
-    session: Session = Depends(get_session),
+def _list_publish_jobs(session: Session, status: str | None, limit: int) -> list[PublishJobRead]:
+    return [PublishJobRead.model_validate(job) for job in session.exec(publish_jobs_query(status, limit)).all()]
+
+
+@router.get("/", response_model=list[PublishJobRead])
+async def list_publish_jobs(
+    status: str | None = None,
+    limit: int = 100,
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
-) -> dict[str, Any]:
+) -> list[PublishJobRead]:
+    return await session.run_sync(_list_publish_jobs, status, limit)
+
+
+def _claim_publish_job(session: Session, job_id: int, request: ClaimRequest) -> dict[str, Any]:
     job = session.get(PublishJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Publish job not found")
@@ -114,12 +115,17 @@ def claim_publish_job(
     return {"lease_expires_at": job.lease_expires_at}
 
 
-@router.post("/{job_id}/heartbeat")
-def heartbeat_publish_job(
+@router.post("/{job_id}/claim")
+async def claim_publish_job(
     job_id: int,
-    session: Session = Depends(get_session),
+    request: ClaimRequest,
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
 ) -> dict[str, Any]:
+    return await session.run_sync(_claim_publish_job, job_id, request)
+
+
+def _heartbeat_publish_job(session: Session, job_id: int) -> dict[str, Any]:
     job = session.get(PublishJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Publish job not found")
@@ -134,25 +140,32 @@ def heartbeat_publish_job(
     return {"lease_expires_at": job.lease_expires_at}
 
 
-@router.get("/{job_id}/context")
-def get_publish_job_context(
+@router.post("/{job_id}/heartbeat")
+async def heartbeat_publish_job(
     job_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
 ) -> dict[str, Any]:
+    return await session.run_sync(_heartbeat_publish_job, job_id)
+
+
+def _load_publish_context(session: Session, job_id: int) -> dict[str, Any]:
     job = session.get(PublishJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Publish job not found")
     return _assemble_publish_context(job, session)
 
 
-@router.post("/{job_id}/status", response_model=PublishJobRead)
-def update_publish_job_status(
+@router.get("/{job_id}/context")
+async def get_publish_job_context(
     job_id: int,
-    update: PublishJobStatusUpdate,
-    session: Session = Depends(get_session),
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
-) -> PublishJob:
+) -> dict[str, Any]:
+    return await session.run_sync(_load_publish_context, job_id)
+
+
+def _update_publish_job_status(session: Session, job_id: int, update: PublishJobStatusUpdate) -> PublishJobRead:
     job = session.get(PublishJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Publish job not found")
@@ -184,6 +197,7 @@ def update_publish_job_status(
             release.status = ReleaseStatus.PUBLISHED.value
             release.publish_status = ReleaseStatus.PUBLISHED.value
             release.published_at = datetime.now(timezone.utc)
+            schedule_metrics_sync(release)
             maybe_mark_story_published(session, release.story_id)
     elif update.status == PublishJobStatus.ERRORED.value:
         job.attempts += 1
@@ -204,7 +218,17 @@ def update_publish_job_status(
     session.add(release)
     session.commit()
     session.refresh(job)
-    return job
+    return PublishJobRead.model_validate(job)
+
+
+@router.post("/{job_id}/status", response_model=PublishJobRead)
+async def update_publish_job_status(
+    job_id: int,
+    update: PublishJobStatusUpdate,
+    session: AsyncSessionLike = Depends(get_async_session),
+    _: None = Depends(require_worker_token),
+) -> PublishJobRead:
+    return await session.run_sync(_update_publish_job_status, job_id, update)
 
 
-__all__ = ["router"]
+__all__ = ["publish_jobs_query", "router"]
@@ -6,15 +6,17 @@ from datetime import datetime, timedelta, timezone
 import hashlib
 import hmac
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 from urllib.parse import urlencode
 
 from fastapi import HTTPException
+from sqlalchemy import func, or_
 from sqlmodel import Session, select
 
 from shared.config import settings
-from shared.workflow import PublishApprovalStatus, PublishDeliveryMode, ReleaseStatus, RenderVariant
+from shared.workflow import PublishApprovalStatus, PublishDeliveryMode, ReleaseStatus, RenderQualityTier, RenderVariant
 
+from .cron_schedule import parse_cron
 from .models import (
     MetricsSnapshot,
     PublishJob,
@@ -25,6 +27,7 @@ from .models import (
     Story,
     StudioSetting,
 )
+from .reference_cache import STUDIO_SETTING, cached
 from .refinement import compute_derived_metrics
 
 
@@ -33,7 +36,18 @@ MANUAL_PLATFORMS = {"tiktok"}
 SHORT_PLATFORMS = {"youtube", "instagram", "tiktok"}
 WEEKLY_PLATFORMS = {"youtube"}
 SIGNED_URL_TTL_SECONDS = 15 * 60
+PREVIEW_KINDS: dict[str, tuple[str, str]] = {
+    "proxy": ("proxy_path", "video/mp4"),
+    "contact-sheet": ("contact_sheet_path", "image/jpeg"),
+}
 SHORT_PUBLISH_SCHEDULE_KEY = "short_publish_schedule"
+ACTIVE_PUBLISH_PLATFORMS_KEY = "active_publish_platforms"
+# (max release age, multiple of INSIGHTS_SYNC_INTERVAL_SEC); older releases use the settled factor.
+METRICS_SYNC_AGE_TIERS: tuple[tuple[timedelta, int], ...] = (
+    (timedelta(hours=48), 1),
+    (timedelta(days=7), 6),
+)
+METRICS_SYNC_SETTLED_FACTOR = 24
 
 
 def env_active_publish_platforms() -> list[str]:
@@ -59,13 +73,22 @@ def env_short_schedule_cron_utc() -> str | None:
     return _normalize_short_schedule_cron(settings.SHORTS_PUBLISH_CRON_UTC)
 
 
+def studio_setting_value(session: Session, key: str) -> dict[str, Any] | None:
+    """Cached ``StudioSetting.value`` for ``key``; only dict values are returned."""
+
+    def load() -> dict[str, Any] | None:
+        setting = session.exec(select(StudioSetting).where(StudioSetting.key == key)).first()
+        if setting and isinstance(setting.value, dict):
+            return dict(setting.value)
+        return None
+
+    return cached(session, STUDIO_SETTING, key, loader=load)
+
+
 def _short_schedule_setting(session: Session | None = None) -> dict[str, Any] | None:
     if session is None:
         return None
-    setting = session.exec(select(StudioSetting).where(StudioSetting.key == SHORT_PUBLISH_SCHEDULE_KEY)).first()
-    if setting and isinstance(setting.value, dict):
-        return setting.value
-    return None
+    return studio_setting_value(session, SHORT_PUBLISH_SCHEDULE_KEY)
 
 
 def active_short_schedule_cron_utc(session: Session | None = None) -> str | None:
@@ -78,11 +101,9 @@ def active_short_schedule_cron_utc(session: Session | None = None) -> str | None
 def active_publish_platforms(session: Session | None = None) -> list[str]:
     allowed = configured_publish_platforms()
     if session is not None:
-        setting = session.exec(
-            select(StudioSetting).where(StudioSetting.key == "active_publish_platforms")
-        ).first()
-        if setting and isinstance(setting.value, dict):
-            configured = setting.value.get("platforms")
+        setting = studio_setting_value(session, ACTIVE_PUBLISH_PLATFORMS_KEY)
+        if setting:
+            configured = setting.get("platforms")
             if isinstance(configured, list):
                 platforms = [
                     platform.strip().lower()
@@ -94,72 +115,11 @@ def active_publish_platforms(session: Session | None = None) -> list[str]:
     return allowed
 
 
-def _parse_cron_number(raw: str, *, minimum: int, maximum: int, field_name: str) -> int:
-    value = int(raw)
-    if field_name == "weekday" and value == 7:
-        value = 0
-    if value < minimum or value > maximum:
-        raise ValueError(f"Invalid {field_name} value: {raw!r}")
-    return value
-
-
-def _expand_cron_field(expression: str, *, minimum: int, maximum: int, field_name: str) -> tuple[set[int], bool]:
-    expr = expression.strip()
-    if not expr:
-        raise ValueError(f"Invalid cron field for {field_name!r}")
-    unrestricted = expr == "*"
-    values: set[int] = set()
-    for part in expr.split(","):
-        chunk = part.strip()
-        if not chunk:
-            raise ValueError(f"Invalid cron field for {field_name!r}")
-        step = 1
-        base = chunk
-        if "/" in chunk:
-            base, step_text = chunk.split("/", 1)
-            step = int(step_text)
-            if step <= 0:
-                raise ValueError(f"Invalid cron step for {field_name!r}")
-        if base == "*":
-            start = minimum
-            end = maximum
-        elif "-" in base:
-            start_text, end_text = base.split("-", 1)
-            start = _parse_cron_number(start_text, minimum=minimum, maximum=maximum, field_name=field_name)
-            end = _parse_cron_number(end_text, minimum=minimum, maximum=maximum, field_name=field_name)
-            if start > end:
-                raise ValueError(f"Invalid cron range for {field_name!r}")
-        else:
-            start = _parse_cron_number(base, minimum=minimum, maximum=maximum, field_name=field_name)
-            end = start
-        values.update(range(start, end + 1, step))
-    return values, unrestricted
-
-
-def _parse_short_schedule_cron(cron_utc: str) -> dict[str, tuple[set[int], bool]]:
-    parts = cron_utc.split()
-    if len(parts) != 5:
-        raise ValueError("Cron must have exactly 5 fields")
-    minute, hour, day, month, weekday = parts
-    return {
-        "minute": _expand_cron_field(minute, minimum=0, maximum=59, field_name="minute"),
-        "hour": _expand_cron_field(hour, minimum=0, maximum=23, field_name="hour"),
-        "day": _expand_cron_field(day, minimum=1, maximum=31, field_name="day"),
-        "month": _expand_cron_field(month, minimum=1, maximum=12, field_name="month"),
-        "weekday": _expand_cron_field(weekday, minimum=0, maximum=6, field_name="weekday"),
-    }
-
-
 def describe_short_schedule_cron(cron_utc: str) -> str:
-    parsed = _parse_short_schedule_cron(cron_utc)
-    minutes, _minute_any = parsed["minute"]
-    hours, hour_any = parsed["hour"]
-    _days, day_any = parsed["day"]
-    _months, month_any = parsed["month"]
-    _weekdays, weekday_any = parsed["weekday"]
-    if month_any and day_any and weekday_any and len(minutes) == 1 and not hour_any:
-        minute = next(iter(minutes))
-        hour_values = sorted(hours)
+    cron = parse_cron(cron_utc)
+    if cron.month_any and cron.day_any and cron.weekday_any and len(cron.minutes) == 1 and not cron.hour_any:
+        minute = cron.minutes[0]
+        hour_values = list(cron.hours)
         if len(hour_values) > 1:
             step = hour_values[1] - hour_values[0]
             if step > 0 and hour_values == list(range(0, 24, step)):
@@ -169,41 +129,10 @@ def describe_short_schedule_cron(cron_utc: str) -> str:
     return f"UTC cron: {cron_utc}"
 
 
-def _cron_matches(candidate: datetime, parsed: dict[str, tuple[set[int], bool]]) -> bool:
-    minutes, _minute_any = parsed["minute"]
-    hours, _hour_any = parsed["hour"]
-    days, day_any = parsed["day"]
-    months, _month_any = parsed["month"]
-    weekdays, weekday_any = parsed["weekday"]
-    if candidate.minute not in minutes or candidate.hour not in hours or candidate.month not in months:
-        return False
-    day_match = candidate.day in days
-    weekday_match = candidate.weekday() in weekdays
-    if day_any and weekday_any:
-        return day_match and weekday_match
-    if day_any:
-        return weekday_match
-    if weekday_any:
-        return day_match
-    return day_match or weekday_match
-
-
 def _cron_schedule_from(anchor: datetime, *, count: int, cron_utc: str) -> list[datetime]:
     if count <= 0:
         return []
-    parsed = _parse_short_schedule_cron(cron_utc)
-    candidate = anchor.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
-    scheduled: list[datetime] = []
-    limit = max(count * 24 * 60, 24 * 60)
-    steps = 0
-    while len(scheduled) < count and steps < limit:
-        if _cron_matches(candidate, parsed):
-            scheduled.append(candidate)
-        candidate += timedelta(minutes=1)
-        steps += 1
-    if len(scheduled) < count:
-        raise ValueError(f"Unable to generate {count} schedule slots from cron {cron_utc!r}")
-    return scheduled
+    return parse_cron(cron_utc).fire_times(anchor, count=count)
 
 
 def delivery_mode_for_platform(platform: str) -> str:
@@ -248,28 +177,59 @@ def verify_signature(kind: str, identifier: int, exp: int, sig: str) -> None:
         raise HTTPException(status_code=403, detail="Invalid signature")
 
 
-def build_signed_artifact_url(*, artifact_id: int | None = None, release_id: int | None = None, expires_in: int = SIGNED_URL_TTL_SECONDS) -> str:
+def build_signed_artifact_url(
+    *,
+    artifact_id: int | None = None,
+    release_id: int | None = None,
+    preview: str | None = None,
+    expires_in: int = SIGNED_URL_TTL_SECONDS,
+) -> str:
     if artifact_id is None and release_id is None:
         raise ValueError("artifact_id or release_id is required")
+    if preview is not None and preview not in PREVIEW_KINDS:
+        raise ValueError(f"Unknown preview kind: {preview}")
     exp = int(datetime.now(timezone.utc).timestamp()) + expires_in
+    base_url = settings.PUBLIC_BASE_URL.rstrip("/")
     if artifact_id is not None:
-        sig = build_signature("artifact", artifact_id, exp)
+        sig = build_signature(_signature_kind("artifact", preview), artifact_id, exp)
         query = urlencode({"exp": exp, "sig": sig})
-        return f"{settings.PUBLIC_BASE_URL.rstrip('/')}/public/artifacts/{artifact_id}?{query}"
-    sig = build_signature("release", int(release_id), exp)
+        if preview:
+            return f"{base_url}/public/artifacts/{artifact_id}/preview/{preview}?{query}"
+        return f"{base_url}/public/artifacts/{artifact_id}?{query}"
+    sig = build_signature(_signature_kind("release", preview), int(release_id), exp)
     query = urlencode({"exp": exp, "sig": sig})
-    return f"{settings.PUBLIC_BASE_URL.rstrip('/')}/public/releases/{int(release_id)}/asset?{query}"
+    if preview:
+        return f"{base_url}/public/releases/{int(release_id)}/preview/{preview}?{query}"
+    return f"{base_url}/public/releases/{int(release_id)}/asset?{query}"
+
+
+def _signature_kind(kind: str, preview: str | None) -> str:
+    return f"{kind}-{preview}" if preview else kind
+
+
+def artifact_preview_path(artifact: RenderArtifact, preview: str) -> str | None:
+    if preview not in PREVIEW_KINDS:
+        return None
+    detail_key, _ = PREVIEW_KINDS[preview]
+    value = (artifact.details or {}).get(detail_key)
+    return str(value) if value else None
 
 
 def resolve_release_artifact(session: Session, release: Release) -> RenderArtifact | None:
     if release.render_artifact_id:
-        return session.get(RenderArtifact, release.render_artifact_id)
+        artifact = session.get(RenderArtifact, release.render_artifact_id)
+        # Draft renders are review-only; only final artifacts can back a release.
+        if artifact is None or artifact.quality_tier != RenderQualityTier.FINAL.value:
+            return None
+        return artifact
     if release.story_part_id is not None:
         query = (
             select(RenderArtifact)
             .where(
                 RenderArtifact.story_id == release.story_id,
                 RenderArtifact.story_part_id == release.story_part_id,
+                RenderArtifact.quality_tier == RenderQualityTier.FINAL.value,
+                or_(RenderArtifact.platform.is_(None), RenderArtifact.platform == release.platform),
             )
             .order_by(RenderArtifact.id.desc())
         )
@@ -281,6 +241,8 @@ def resolve_release_artifact(session: Session, release: Release) -> RenderArtifa
         .where(
             RenderArtifact.story_id == release.story_id,
             RenderArtifact.compilation_id == release.compilation_id,
+            RenderArtifact.quality_tier == RenderQualityTier.FINAL.value,
+            or_(RenderArtifact.platform.is_(None), RenderArtifact.platform == release.platform),
         )
         .order_by(RenderArtifact.id.desc())
     )
@@ -293,13 +255,136 @@ def resolve_publish_job(session: Session, release_id: int) -> PublishJob | None:
     return session.exec(select(PublishJob).where(PublishJob.release_id == release_id)).first()
 
 
+def _artifact_matches_release(release: Release, artifact: RenderArtifact) -> bool:
+    if artifact.story_id != release.story_id or artifact.quality_tier != RenderQualityTier.FINAL.value:
+        return False
+    if artifact.platform is not None and artifact.platform != release.platform:
+        return False
+    if release.script_version_id is not None and artifact.script_version_id != release.script_version_id:
+        return False
+    if release.story_part_id is not None:
+        return artifact.story_part_id == release.story_part_id
+    return artifact.compilation_id == release.compilation_id
+
+
+def resolve_release_artifacts(session: Session, releases: Sequence[Release]) -> list[RenderArtifact | None]:
+    """Resolve ``resolve_release_artifact`` for many releases with at most two queries."""
+
+    pinned_ids = {release.render_artifact_id for release in releases if release.render_artifact_id}
+    pinned = (
+        {
+            artifact.id: artifact
+            for artifact in session.exec(select(RenderArtifact).where(RenderArtifact.id.in_(pinned_ids)))
+        }
+        if pinned_ids
+        else {}
+    )
+    unpinned = [release for release in releases if not release.render_artifact_id]
+    # Only fetch artifacts of the parts and compilations on this page, not the
+    # stories' whole render history.
+    part_ids = {release.story_part_id for release in unpinned if release.story_part_id is not None}
+    compilation_ids = {
+        release.compilation_id
+        for release in unpinned
+        if release.story_part_id is None and release.compilation_id is not None
+    }
+    targets = []
+    if part_ids:
+        targets.append(RenderArtifact.story_part_id.in_(part_ids))
+    if compilation_ids:
+        targets.append(RenderArtifact.compilation_id.in_(compilation_ids))
+    if any(release.story_part_id is None and release.compilation_id is None for release in unpinned):
+        targets.append(RenderArtifact.compilation_id.is_(None))
+    candidates: dict[int, list[RenderArtifact]] = {}
+    if targets:
+        for artifact in session.exec(
+            select(RenderArtifact)
+            .where(
+                RenderArtifact.story_id.in_({release.story_id for release in unpinned}),
+                RenderArtifact.quality_tier == RenderQualityTier.FINAL.value,
+                or_(*targets),
+            )
+            .order_by(RenderArtifact.id.desc())
+        ):
+            candidates.setdefault(artifact.story_id, []).append(artifact)
+    resolved: list[RenderArtifact | None] = []
+    for release in releases:
+        if release.render_artifact_id:
+            artifact = pinned.get(release.render_artifact_id)
+            # Same rule as resolve_release_artifact: a pinned draft backs nothing.
+            final = artifact is not None and artifact.quality_tier == RenderQualityTier.FINAL.value
+            resolved.append(artifact if final else None)
+            continue
+        resolved.append(
+            next(
+                (
+                    artifact
+                    for artifact in candidates.get(release.story_id, [])
+                    if _artifact_matches_release(release, artifact)
+                ),
+                None,
+            )
+        )
+    return resolved
+
+
+def release_reads(session: Session, releases: Sequence[Release]) -> list[ReleaseRead]:
+    """Serialize ``releases`` with a constant number of queries.
+
+    Artifacts, publish jobs and latest metrics snapshots are each loaded in
+    one query for the whole list rather than per release.
+    """
+
+    if not releases:
+        return []
+    artifacts = resolve_release_artifacts(session, releases)
+    release_ids = [release.id for release in releases if release.id is not None]
+    publish_jobs = (
+        {
+            job.release_id: job
+            for job in session.exec(
+                select(PublishJob).where(PublishJob.release_id.in_(release_ids)).order_by(PublishJob.id.desc())
+            )
+        }
+        if release_ids
+        else {}
+    )
+    snapshots = latest_release_snapshots(session, release_ids)
+    return [
+        _release_read_payload(
+            release,
+            artifact=artifact,
+            publish_job=publish_jobs.get(release.id) if release.id else None,
+            snapshot=snapshots.get(release.id) if release.id else None,
+        )
+        for release, artifact in zip(releases, artifacts)
+    ]
+
+
 def release_read(session: Session, release: Release) -> ReleaseRead:
-    artifact = resolve_release_artifact(session, release)
-    publish_job = resolve_publish_job(session, release.id or 0) if release.id else None
-    snapshot = latest_release_snapshot(session, release.id or 0) if release.id else None
+    return release_reads(session, [release])[0]
+
+
+def _release_read_payload(
+    release: Release,
+    *,
+    artifact: RenderArtifact | None,
+    publish_job: PublishJob | None,
+    snapshot: MetricsSnapshot | None,
+) -> ReleaseRead:
     payload = release.model_dump()
     payload["artifact_path"] = artifact.video_path if artifact else None
     payload["signed_asset_url"] = build_signed_artifact_url(release_id=release.id) if artifact and release.id else None
+    payload["signed_proxy_url"] = (
+        build_signed_artifact_url(release_id=release.id, preview="proxy")
+        if artifact and release.id and artifact_preview_path(artifact, "proxy")
+        else None
+    )
+    payload["signed_contact_sheet_url"] = (
+        build_signed_artifact_url(release_id=release.id, preview="contact-sheet")
+        if artifact and release.id and artifact_preview_path(artifact, "contact-sheet")
+        else None
+    )
     payload["publish_job_id"] = publish_job.id if publish_job else None
     payload["latest_metrics_sync_at"] = snapshot.captured_at if snapshot else None
     payload["latest_metrics"] = _snapshot_metrics_payload(snapshot) if snapshot else None
@@ -415,15 +500,8 @@ def derived_short_slots_utc(session: Session | None = None) -> list[str]:
     cron_utc = active_short_schedule_cron_utc(session)
     if cron_utc:
         day_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        end = day_start + timedelta(days=1)
-        candidate = day_start
-        slots: list[str] = []
-        parsed = _parse_short_schedule_cron(cron_utc)
-        while candidate < end:
-            if _cron_matches(candidate, parsed):
-                slots.append(candidate.strftime("%H:%M"))
-            candidate += timedelta(minutes=1)
-        return slots
+        slots = parse_cron(cron_utc).fire_times_between(day_start, day_start + timedelta(days=1))
+        return [slot.strftime("%H:%M") for slot in slots]
     return [f"{hour:02d}:{minute:02d}" for hour, minute in _shorts_publish_slots()]
 
 
@@ -523,15 +601,87 @@ def _release_metrics_payload(release: Release) -> dict[str, float]:
     }
 
 
-def latest_release_snapshot(session: Session, release_id: int) -> MetricsSnapshot | None:
-    return session.exec(
+def latest_release_snapshot_query(release_id: int) -> Any:
+    return (
         select(MetricsSnapshot)
         .where(
             MetricsSnapshot.release_id == release_id,
             MetricsSnapshot.source == "youtube_insights",
         )
         .order_by(MetricsSnapshot.captured_at.desc(), MetricsSnapshot.id.desc())
-    ).first()
+    )
+
+
+def latest_release_snapshot(session: Session, release_id: int) -> MetricsSnapshot | None:
+    return session.exec(latest_release_snapshot_query(release_id)).first()
+
+
+def latest_release_snapshots(session: Session, release_ids: Sequence[int]) -> dict[int, MetricsSnapshot]:
+    """Return the latest insights snapshot per release using one ranked query."""
+
+    if not release_ids:
+        return {}
+    ranked = (
+        select(
+            MetricsSnapshot.id.label("snapshot_id"),
+            func.row_number()
+            .over(
+                partition_by=MetricsSnapshot.release_id,
+                order_by=(MetricsSnapshot.captured_at.desc(), MetricsSnapshot.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(
+            MetricsSnapshot.release_id.in_(release_ids),
+            MetricsSnapshot.source == "youtube_insights",
+        )
+        .subquery()
+    )
+    snapshots = session.exec(
+        select(MetricsSnapshot)
+        .join(ranked, ranked.c.snapshot_id == MetricsSnapshot.id)
+        .where(ranked.c.position == 1)
+    ).all()
+    return {snapshot.release_id: snapshot for snapshot in snapshots}
+
+
+def metrics_sync_interval(age: timedelta) -> timedelta:
+    """Return the insights sync interval for a release published ``age`` ago.
+
+    Early numbers move quickly, so fresh releases sync every
+    ``INSIGHTS_SYNC_INTERVAL_SEC``; the interval relaxes as the release settles.
+    """
+
+    base = max(settings.INSIGHTS_SYNC_INTERVAL_SEC, 60)
+    for max_age, factor in METRICS_SYNC_AGE_TIERS:
+        if age < max_age:
+            return timedelta(seconds=base * factor)
+    return timedelta(seconds=base * METRICS_SYNC_SETTLED_FACTOR)
+
+
+def schedule_metrics_sync(release: Release, *, synced_at: datetime | None = None) -> None:
+    """Maintain ``release.next_metrics_sync_at``; the caller commits.
+
+    Published YouTube shorts become due as soon as they publish and, after each
+    insights snapshot, one age-based interval later. Other releases are not
+    tracked and have no due time.
+    """
+
+    if (
+        release.platform != "youtube"
+        or release.variant != RenderVariant.SHORT.value
+        or release.status != ReleaseStatus.PUBLISHED.value
+        or not release.platform_video_id
+        or release.published_at is None
+    ):
+        release.next_metrics_sync_at = None
+        return
+    published_at = release.published_at.astimezone(timezone.utc)
+    if synced_at is None:
+        release.next_metrics_sync_at = published_at
+        return
+    synced_at = synced_at.astimezone(timezone.utc)
+    release.next_metrics_sync_at = synced_at + metrics_sync_interval(synced_at - published_at)
 
 
 def _snapshot_metrics_payload(snapshot: MetricsSnapshot | None) -> dict[str, float]:
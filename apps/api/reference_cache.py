@@ -0,0 +1,112 @@
+"""In-process cache for slowly changing reference data.
+
+Studio settings, active prompt versions and render presets change a few times
+a month but are read inside per-release and per-part loops. Entries are kept
+per database engine (so test databases never share entries) for
+``REFERENCE_CACHE_TTL_SEC`` seconds and are keyed by ``(namespace, *args)``.
+
+Write endpoints call :func:`invalidate` after committing. That only clears the
+process that served the write; other API workers pick the change up when
+their entries expire, so the TTL bounds how stale a worker can be.
+
+Cached values must be plain data or detached read models, never ORM
+instances bound to the session that loaded them.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Hashable, TypeVar
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from shared.config import settings
+
+T = TypeVar("T")
+
+STUDIO_SETTING = "studio_setting"
+ACTIVE_PROMPT = "active_prompt"
+RENDER_PRESET = "render_preset"
+
+_lock = threading.Lock()
+_entries: WeakKeyDictionary[Engine, dict[tuple[Hashable, ...], tuple[float, Any]]] = WeakKeyDictionary()
+_hits: defaultdict[str, int] = defaultdict(int)
+_misses: defaultdict[str, int] = defaultdict(int)
+
+
+def _engine_of(session: Session) -> Engine:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def cached(
+    session: Session,
+    namespace: str,
+    *args: Hashable,
+    loader: Callable[[], T],
+    ttl: float | None = None,
+) -> T:
+    """Return the cached value for ``(namespace, *args)``, calling ``loader`` on a miss."""
+
+    ttl = settings.REFERENCE_CACHE_TTL_SEC if ttl is None else ttl
+    if ttl <= 0:
+        return loader()
+    engine = _engine_of(session)
+    key = (namespace, *args)
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(engine, {}).get(key)
+        if entry is not None and entry[0] > now:
+            _hits[namespace] += 1
+            return entry[1]
+        _misses[namespace] += 1
+    value = loader()
+    with _lock:
+        _entries.setdefault(engine, {})[key] = (time.monotonic() + ttl, value)
+    return value
+
+
+def invalidate(*namespaces: str) -> None:
+    """Drop every entry in ``namespaces`` for all engines in this process."""
+
+    with _lock:
+        for entries in _entries.values():
+            for key in [key for key in entries if key[0] in namespaces]:
+                del entries[key]
+
+
+def invalidate_all() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def reference_cache_stats() -> dict[str, dict[str, int]]:
+    """Hit, miss and live entry counts per namespace since process start."""
+
+    with _lock:
+        sizes: defaultdict[str, int] = defaultdict(int)
+        now = time.monotonic()
+        for entries in _entries.values():
+            for key, (expires_at, _value) in entries.items():
+                if expires_at > now:
+                    sizes[str(key[0])] += 1
+        namespaces = sorted(set(_hits) | set(_misses) | set(sizes))
+        return {
+            namespace: {"hits": _hits[namespace], "misses": _misses[namespace], "entries": sizes[namespace]}
+            for namespace in namespaces
+        }
+
+
+__all__ = [
+    "ACTIVE_PROMPT",
+    "RENDER_PRESET",
+    "STUDIO_SETTING",
+    "cached",
+    "invalidate",
+    "invalidate_all",
+    "reference_cache_stats",
+]
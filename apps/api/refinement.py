@@ -22,6 +22,7 @@ from .models import (
     AnalysisReport,
     MetricsSnapshot,
     PromptVersion,
+    PromptVersionRead,
     Release,
     ScriptBatch,
     ScriptVersion,
@@ -29,6 +30,7 @@ from .models import (
     StoryConcept,
     StoryPart,
 )
+from .reference_cache import ACTIVE_PROMPT, cached, invalidate
 
 SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
 WORD_RE = re.compile(r"[A-Za-z']+")
@@ -274,16 +276,17 @@ def ensure_default_prompt_versions(session: Session) -> None:
         changed = True
     if changed:
         session.commit()
+        invalidate(ACTIVE_PROMPT)
 
 
-def active_prompt(session: Session, kind: str) -> PromptVersion:
+def _load_active_prompt(session: Session, kind: str) -> PromptVersionRead:
     prompt = session.exec(
         select(PromptVersion)
         .where(PromptVersion.kind == kind, PromptVersion.status == "active")
         .order_by(PromptVersion.id.desc())
     ).first()
     if prompt:
-        return prompt
+        return PromptVersionRead.model_validate(prompt)
     ensure_default_prompt_versions(session)
     prompt = session.exec(
         select(PromptVersion)
@@ -292,7 +295,11 @@ def active_prompt(session: Session, kind: str) -> PromptVersion:
     ).first()
     if not prompt:
         raise RuntimeError(f"Missing active prompt for {kind}")
-    return prompt
+    return PromptVersionRead.model_validate(prompt)
+
+
+def active_prompt(session: Session, kind: str) -> PromptVersionRead:
+    return cached(session, ACTIVE_PROMPT, kind, loader=lambda: _load_active_prompt(session, kind))
 
 
 def _clip(text: str, limit: int = 160) -> str:
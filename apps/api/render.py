@@ -12,17 +12,19 @@ from .models import AssetBundle, Job, Story, StoryPart
 router = APIRouter(prefix="/render", tags=["render"])
 
 
+def next_series_query() -> Any:
+    return (
+        select(Job)
+        .where(Job.kind == "render_part", Job.status == "queued")
+        .order_by(Job.story_id, Job.id)
+        .limit(1)
+    )
+
+
 @router.get("/next-series")
 def next_series(session: Session = Depends(get_session)) -> dict[str, Any]:
     """Return the next story with queued render_part jobs and mark them running."""
-    job = (
-        session.exec(
-            select(Job)
-            .where(Job.kind == "render_part", Job.status == "queued")
-            .order_by(Job.story_id, Job.id)
-            .limit(1)
-        ).first()
-    )
+    job = session.exec(next_series_query()).first()
     if not job:
         return {}
     story_id = job.story_id
@@ -54,4 +56,4 @@ def next_series(session: Session = Depends(get_session)) -> dict[str, Any]:
     }
 
 
-__all__ = ["router"]
+__all__ = ["next_series_query", "router"]
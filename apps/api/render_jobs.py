@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.orm import aliased
 from sqlmodel import Field, SQLModel, Session, select
 
 from shared.config import settings
@@ -14,13 +19,15 @@ from shared.workflow import (
     JobStatus,
     PublishApprovalStatus,
     ReleaseStatus,
+    RenderQualityTier,
     StoryStatus,
     can_transition_job,
 )
 
-from .db import get_session
+from .db import AsyncSessionLike, get_async_session
 from .media_refs import bundle_asset_refs, bundle_part_asset_map
 from .models import (
+    Asset,
     AssetBundle,
     Compilation,
     Job,
@@ -38,12 +45,38 @@ from .pipeline import release_for_artifact
 router = APIRouter(prefix="/render-jobs", tags=["render-jobs"])
 
 DEFAULT_LEASE_SECONDS = 180
+RENDER_JOB_KINDS = ("render_part", "render_compilation")
+RENDER_CONTEXT_FULL = "full"
+RENDER_CONTEXT_SHORT = "short"
+RENDER_CONTEXT_COMPILATION = "compilation"
+RENDER_CONTEXT_PROFILE_PATTERN = "^(full|short|compilation)$"
+_VOLATILE_CONTEXT_FIELDS = {
+    "job": frozenset(
+        {
+            "status",
+            "lease_expires_at",
+            "retries",
+            "error_class",
+            "error_message",
+            "stderr_snippet",
+            "result",
+            "updated_at",
+        }
+    ),
+    "story": frozenset({"status", "updated_at"}),
+}
 
 
 class ClaimRequest(SQLModel):
     lease_seconds: int = DEFAULT_LEASE_SECONDS
 
 
+class PlatformOutput(BaseModel):
+    platform: str
+    artifact_path: str
+    bytes: int | None = None
+
+
 class RenderJobStatusUpdate(BaseModel):
     status: str
     artifact_path: str | None = None
@@ -55,6 +88,7 @@ class RenderJobStatusUpdate(BaseModel):
     error_message: str | None = None
     stderr_snippet: str | None = None
     metadata: dict | None = None
+    platform_outputs: list[PlatformOutput] | None = None
 
 
 def require_worker_token(authorization: str | None = Header(default=None)) -> None:
@@ -65,10 +99,25 @@ def require_worker_token(authorization: str | None = Header(default=None)) -> No
     if token != expected:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-def _assemble_render_context(job: Job, session: Session) -> dict[str, Any]:
+def _assemble_render_context(
+    job: Job,
+    session: Session,
+    *,
+    profile: str = RENDER_CONTEXT_FULL,
+) -> dict[str, Any]:
+    """Build the worker context for ``job``.
+
+    The ``short`` profile skips compilation inputs, prior artifacts and releases;
+    the ``compilation`` profile skips bundle assets and only loads primary final
+    short artifacts. Skipped sections are returned empty so consumers keep a
+    stable shape. ``full`` keeps the historical payload.
+    """
+
     story = session.get(Story, job.story_id) if job.story_id else None
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
+    want_assets = profile != RENDER_CONTEXT_COMPILATION
+    want_history = profile != RENDER_CONTEXT_SHORT
 
     script_version_id = job.script_version_id or story.active_script_version_id
     script_version = session.get(ScriptVersion, script_version_id) if script_version_id else None
@@ -78,38 +127,54 @@ def _assemble_render_context(job: Job, session: Session) -> dict[str, Any]:
         .where(StoryPart.story_id == story.id)
         .order_by(StoryPart.index)
     ).all()
-    bundle = session.get(AssetBundle, job.asset_bundle_id) if job.asset_bundle_id else None
+    bundle = session.get(AssetBundle, job.asset_bundle_id) if job.asset_bundle_id and want_assets else None
     asset_refs = bundle_asset_refs(bundle, session) if bundle else []
     part_asset_map = bundle_part_asset_map(bundle, parts, session) if bundle else []
     selected_asset = None
     story_part = None
     if job.story_part_id:
-        story_part = session.get(StoryPart, job.story_part_id)
+        story_part = next((part for part in parts if part.id == job.story_part_id), None)
+        if story_part is None:
+            story_part = session.get(StoryPart, job.story_part_id)
         selected_row = next((row for row in part_asset_map if row["story_part_id"] == job.story_part_id), None)
         if selected_row:
             selected_asset = selected_row["asset"]
         elif story_part and asset_refs:
             selected_asset = asset_refs[(max(story_part.index, 1) - 1) % len(asset_refs)]
 
-    compilation = session.get(Compilation, job.compilation_id) if job.compilation_id else None
-    prior_artifacts = session.exec(
-        select(RenderArtifact)
-        .where(RenderArtifact.story_id == story.id)
-        .order_by(RenderArtifact.id.desc())
-    ).all()
-    releases = session.exec(
-        select(Release)
-        .where(Release.story_id == story.id)
-        .order_by(Release.id.desc())
-    ).all()
+    compilation = None
+    prior_artifacts: list[RenderArtifact] = []
+    releases: list[Release] = []
+    if want_history:
+        compilation = session.get(Compilation, job.compilation_id) if job.compilation_id else None
+        artifact_query = (
+            select(RenderArtifact)
+            .where(RenderArtifact.story_id == story.id)
+            .order_by(RenderArtifact.id.desc())
+        )
+        if profile == RENDER_CONTEXT_COMPILATION:
+            artifact_query = artifact_query.where(
+                RenderArtifact.variant == "short",
+                RenderArtifact.quality_tier == RenderQualityTier.FINAL.value,
+                RenderArtifact.platform.is_(None),
+            )
+        prior_artifacts = session.exec(artifact_query).all()
+    if profile == RENDER_CONTEXT_FULL:
+        releases = session.exec(
+            select(Release)
+            .where(Release.story_id == story.id)
+            .order_by(Release.id.desc())
+        ).all()
 
     bundle_data = None
     if bundle:
         bundle_data = bundle.model_dump()
-        bundle_data["asset_refs"] = asset_refs
-        bundle_data["part_asset_map"] = part_asset_map
+        if profile == RENDER_CONTEXT_FULL:
+            bundle_data["asset_refs"] = asset_refs
+            bundle_data["part_asset_map"] = part_asset_map
 
     return {
+        "profile": profile,
         "job": JobRead.model_validate(job).model_dump(),
         "story": story.model_dump(),
         "story_part": story_part.model_dump() if story_part else None,
@@ -117,65 +182,141 @@ def _assemble_render_context(job: Job, session: Session) -> dict[str, Any]:
         "script_version": script_version.model_dump() if script_version else None,
         "render_preset": render_preset.model_dump() if render_preset else None,
         "asset_bundle": bundle_data,
-        "assets": asset_refs,
+        "assets": asset_refs if profile == RENDER_CONTEXT_FULL else [],
         "selected_asset": selected_asset,
-        "parts": [part.model_dump() for part in parts],
+        "parts": [part.model_dump() for part in parts] if want_history else [],
         "artifacts": [artifact.model_dump() for artifact in prior_artifacts],
         "releases": [release.model_dump() for release in releases],
     }
 
 
+def _stable(section: str, data: dict[str, Any]) -> dict[str, Any]:
+    fields = _VOLATILE_CONTEXT_FIELDS[section]
+    return {key: value for key, value in data.items() if key not in fields}
+
+
+def _row_version(session: Session, model: Any, row_id: int | None) -> Any:
+    if not row_id:
+        return None
+    return session.exec(select(model.updated_at).where(model.id == row_id)).first()
+
+
+def _rows_version(session: Session, model: Any, *criteria: Any) -> list[Any]:
+    count, last_id, last_updated = session.exec(
+        select(func.count(), func.max(model.id), func.max(model.updated_at)).where(*criteria)
+    ).one()
+    return [count, last_id, last_updated]
+
+
+def render_context_etag(session: Session, job: Job, story: Story, profile: str) -> str:
+    """Return a strong ETag for ``job``'s render context without assembling it.
+
+    The tag hashes the job's and story's render inputs with the ``updated_at``
+    of every other row the context reads, so it changes whenever the context
+    would. Lease and status bookkeeping on the job and story is left out so a
+    retry of the same job, whose render inputs have not changed, matches a
+    worker's cached copy.
+    """
+
+    script_version_id = job.script_version_id or story.active_script_version_id
+    inputs: dict[str, Any] = {
+        "profile": profile,
+        "job": _stable("job", JobRead.model_validate(job).model_dump()),
+        "story": _stable("story", story.model_dump()),
+        "script_version": _row_version(session, ScriptVersion, script_version_id),
+        "render_preset": _row_version(session, RenderPreset, job.render_preset_id),
+        "parts": _rows_version(session, StoryPart, StoryPart.story_id == story.id),
+    }
+    if profile != RENDER_CONTEXT_COMPILATION and job.asset_bundle_id:
+        inputs["asset_bundle"] = _row_version(session, AssetBundle, job.asset_bundle_id)
+        # Legacy bundles reference story assets by id.
+        inputs["assets"] = _rows_version(session, Asset, Asset.story_id == story.id)
+    if profile != RENDER_CONTEXT_SHORT:
+        inputs["compilation"] = _row_version(session, Compilation, job.compilation_id)
+        inputs["artifacts"] = _rows_version(session, RenderArtifact, RenderArtifact.story_id == story.id)
+    if profile == RENDER_CONTEXT_FULL:
+        inputs["releases"] = _rows_version(session, Release, Release.story_id == story.id)
+    canonical = json.dumps(
+        jsonable_encoder(inputs),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return '"' + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def compilation_ready_clause() -> Any:
+    """Return a SQL predicate that is true when a job's render dependencies are met.
+
+    Non-compilation jobs are always ready. A compilation is ready once its story
+    has parts and the latest final ``render_part`` job of every part is
+    publish-ready or published, so readiness is evaluated by the database in the
+    same query that lists or claims jobs.
+    """
+
+    part_job = aliased(Job)
+    latest_part_status = (
+        select(part_job.status)
+        .where(
+            part_job.story_part_id == StoryPart.id,
+            part_job.kind == "render_part",
+            part_job.quality_tier == RenderQualityTier.FINAL.value,
+        )
+        .order_by(part_job.id.desc())
+        .limit(1)
+        .correlate(StoryPart)
+        .scalar_subquery()
+    )
+    has_parts = exists().where(StoryPart.story_id == Job.story_id)
+    pending_parts = exists().where(
+        StoryPart.story_id == Job.story_id,
+        or_(
+            latest_part_status.is_(None),
+            latest_part_status.not_in(
+                [JobStatus.PUBLISH_READY.value, JobStatus.PUBLISHED.value]
+            ),
+        ),
+    )
+    return or_(
+        Job.kind != "render_compilation",
+        Job.story_id.is_(None),
+        and_(has_parts, ~pending_parts),
+    )
+
+
 def _compilation_dependencies_ready(job: Job, session: Session) -> bool:
     if job.kind != "render_compilation" or not job.story_id:
         return True
-    parts = session.exec(
-        select(StoryPart)
-        .where(StoryPart.story_id == job.story_id)
-    ).all()
-    if not parts:
-        return False
-    part_ids = {part.id for part in parts}
-    short_jobs = session.exec(
-        select(Job)
-        .where(
-            Job.story_id == job.story_id,
-            Job.kind == "render_part",
-            Job.story_part_id.is_not(None),
-        )
-    ).all()
-    jobs_by_part = {short_job.story_part_id: short_job for short_job in short_jobs if short_job.story_part_id is not None}
-    if set(jobs_by_part) != part_ids:
-        return False
-    terminal_statuses = {
-        JobStatus.PUBLISH_READY.value,
-        JobStatus.PUBLISHED.value,
-    }
-    return all(short_job.status in terminal_statuses for short_job in jobs_by_part.values())
+    ready = session.exec(
+        select(Job.id).where(Job.id == job.id, compilation_ready_clause())
+    ).first()
+    return ready is not None
+
+
+def render_jobs_query(status: str | None, limit: int) -> Any:
+    query = select(Job).where(
+        Job.kind.in_(RENDER_JOB_KINDS),
+        compilation_ready_clause(),
+    )
+    if status:
+        query = query.where(Job.status == status)
+    return query.order_by(Job.id).limit(max(limit, 0))
+
+
+def _list_render_jobs(session: Session, status: str | None, limit: int) -> list[JobRead]:
+    return [JobRead.model_validate(job) for job in session.exec(render_jobs_query(status, limit)).all()]
 
 
 @router.get("/", response_model=list[JobRead])
-def list_render_jobs(
+async def list_render_jobs(
     status: str | None = None,
     limit: int = 100,
-    session: Session = Depends(get_session),
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
-) -> list[Job]:
-    query = select(Job).where(Job.kind.ilike("render_%"))
-    if status:
-        query = query.where(Job.status == status)
-    query = query.order_by(Job.id)
-    jobs = session.exec(query).all()
-    ready_jobs = [job for job in jobs if _compilation_dependencies_ready(job, session)]
-    return ready_jobs[:limit]
+) -> list[JobRead]:
+    return await session.run_sync(_list_render_jobs, status, limit)
 
 
-@router.post("/{job_id}/claim")
-def claim_render_job(
-    job_id: int,
-    request: ClaimRequest,
-    session: Session = Depends(get_session),
-    _: None = Depends(require_worker_token),
-) -> dict:
+def _claim_render_job(session: Session, job_id: int, request: ClaimRequest) -> dict:
     job = session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -191,12 +332,17 @@ def claim_render_job(
     return {"lease_expires_at": job.lease_expires_at}
 
 
-@router.post("/{job_id}/heartbeat")
-def heartbeat_render_job(
+@router.post("/{job_id}/claim")
+async def claim_render_job(
     job_id: int,
-    session: Session = Depends(get_session),
+    request: ClaimRequest,
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
 ) -> dict:
+    return await session.run_sync(_claim_render_job, job_id, request)
+
+
+def _heartbeat_render_job(session: Session, job_id: int) -> dict:
     job = session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -211,23 +357,59 @@ def heartbeat_render_job(
     return {"lease_expires_at": job.lease_expires_at}
 
 
-@router.get("/{job_id}/context")
-def get_render_job_context(
+@router.post("/{job_id}/heartbeat")
+async def heartbeat_render_job(
     job_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
-) -> dict[str, Any]:
+) -> dict:
+    return await session.run_sync(_heartbeat_render_job, job_id)
+
+
+def _load_render_context(
+    session: Session,
+    job_id: int,
+    profile: str,
+    if_none_match: str | None,
+) -> tuple[str, dict[str, Any] | None]:
+    """Return the context's ETag and the context, or None when the worker's copy is current."""
+
     job = session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return _assemble_render_context(job, session)
+    story = session.get(Story, job.story_id) if job.story_id else None
+    if not story:
+        raise HTTPException(status_code=404, detail="Story not found")
+    etag = render_context_etag(session, job, story, profile)
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return etag, None
+    return etag, _assemble_render_context(job, session, profile=profile)
+
+
+@router.get("/{job_id}/context")
+async def get_render_job_context(
+    job_id: int,
+    response: Response,
+    profile: str = Query(default=RENDER_CONTEXT_FULL, pattern=RENDER_CONTEXT_PROFILE_PATTERN),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSessionLike = Depends(get_async_session),
+    _: None = Depends(require_worker_token),
+) -> dict[str, Any]:
+    etag, context = await session.run_sync(_load_render_context, job_id, profile, if_none_match)
+    if context is None:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return context
 
 
 def _upsert_artifact(job: Job, update: RenderJobStatusUpdate, session: Session) -> RenderArtifact | None:
     if not update.artifact_path:
         return None
     artifact = session.exec(
-        select(RenderArtifact).where(RenderArtifact.job_id == job.id)
+        select(RenderArtifact).where(
+            RenderArtifact.job_id == job.id,
+            RenderArtifact.platform.is_(None),
+        )
     ).first()
     metadata = update.metadata or {}
     if not artifact:
@@ -238,6 +420,7 @@ def _upsert_artifact(job: Job, update: RenderJobStatusUpdate, session: Session)
             script_version_id=job.script_version_id,
             compilation_id=job.compilation_id,
             variant=job.variant,
+            quality_tier=job.quality_tier,
             video_path=update.artifact_path,
             subtitle_path=update.subtitle_path,
             waveform_path=update.waveform_path,
@@ -258,13 +441,54 @@ def _upsert_artifact(job: Job, update: RenderJobStatusUpdate, session: Session)
     return artifact
 
 
-@router.post("/{job_id}/status", response_model=JobRead)
-def update_render_job_status(
-    job_id: int,
+def _upsert_platform_artifacts(
+    job: Job,
     update: RenderJobStatusUpdate,
-    session: Session = Depends(get_session),
-    _: None = Depends(require_worker_token),
-) -> Job:
+    primary: RenderArtifact,
+    session: Session,
+) -> dict[str, RenderArtifact]:
+    """Register each platform encode from the output ladder as its own artifact."""
+
+    if not update.platform_outputs:
+        return {}
+    existing = {
+        artifact.platform: artifact
+        for artifact in session.exec(
+            select(RenderArtifact).where(
+                RenderArtifact.job_id == job.id,
+                RenderArtifact.platform.is_not(None),
+            )
+        ).all()
+    }
+    artifacts: dict[str, RenderArtifact] = {}
+    for output in update.platform_outputs:
+        artifact = existing.get(output.platform) or RenderArtifact(
+            job_id=job.id,
+            story_id=primary.story_id,
+            story_part_id=primary.story_part_id,
+            compilation_id=primary.compilation_id,
+            variant=primary.variant,
+            platform=output.platform,
+            video_path=output.artifact_path,
+        )
+        artifact.quality_tier = primary.quality_tier
+        artifact.script_version_id = primary.script_version_id
+        artifact.video_path = output.artifact_path
+        artifact.subtitle_path = primary.subtitle_path
+        artifact.bytes = output.bytes
+        artifact.duration_ms = primary.duration_ms
+        artifact.details = {
+            **(primary.details or {}),
+            "platform": output.platform,
+            "primary_artifact_id": primary.id,
+        }
+        session.add(artifact)
+        artifacts[output.platform] = artifact
+    session.flush()
+    return artifacts
+
+
+def _update_render_job_status(session: Session, job_id: int, update: RenderJobStatusUpdate) -> JobRead:
     job = session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -290,67 +514,80 @@ def update_render_job_status(
             job.result["duration_ms"] = update.duration_ms
 
     artifact = _upsert_artifact(job, update, session)
-    if artifact and update.status == JobStatus.RENDERED.value:
-        story = session.get(Story, job.story_id) if job.story_id else None
-        if story:
-            story.status = StoryStatus.RENDERED.value
-            session.add(story)
-        for release in release_for_artifact(
-            session,
-            story_id=job.story_id or 0,
-            story_part_id=job.story_part_id,
-            compilation_id=job.compilation_id,
-            script_version_id=job.script_version_id,
-        ):
-            release.render_artifact_id = artifact.id
-            release.delivery_mode = delivery_mode_for_platform(release.platform)
-            release.last_error = None
-            if release.approval_status == PublishApprovalStatus.APPROVED.value:
-                next_status = approval_payload_status(release.publish_at)
-                release.status = next_status
-                release.publish_status = next_status
-                ensure_publish_job(
-                    session,
-                    release,
-                    not_before=release.publish_at,
-                    payload={
-                        "delivery_mode": release.delivery_mode,
-                        "variant": release.variant,
-                        "auto_scheduled": True,
-                    },
-                )
-            else:
-                release.status = ReleaseStatus.READY.value
-                release.publish_status = ReleaseStatus.READY.value
-                release.approval_status = PublishApprovalStatus.PENDING.value
-            session.add(release)
-        if job.compilation_id:
-            compilation = session.get(Compilation, job.compilation_id)
-            if compilation:
-                compilation.render_artifact_id = artifact.id
-                compilation.status = StoryStatus.RENDERED.value
-                session.add(compilation)
-        job.status = JobStatus.PUBLISH_READY.value
-        if story:
-            story.status = StoryStatus.PUBLISH_READY.value
-            session.add(story)
-    elif update.status == JobStatus.ERRORED.value:
-        for release in release_for_artifact(
-            session,
-            story_id=job.story_id or 0,
-            story_part_id=job.story_part_id,
-            compilation_id=job.compilation_id,
-            script_version_id=job.script_version_id,
-        ):
-            release.status = ReleaseStatus.ERRORED.value
-            release.publish_status = ReleaseStatus.ERRORED.value
-            release.last_error = update.error_message or update.stderr_snippet or "Render failed"
-            session.add(release)
+    platform_artifacts = _upsert_platform_artifacts(job, update, artifact, session) if artifact else {}
+    # Draft renders are for operator review only; neither success nor failure touches releases.
+    if job.quality_tier != RenderQualityTier.DRAFT.value:
+        if artifact and update.status == JobStatus.RENDERED.value:
+            story = session.get(Story, job.story_id) if job.story_id else None
+            if story:
+                story.status = StoryStatus.RENDERED.value
+                session.add(story)
+            for release in release_for_artifact(
+                session,
+                story_id=job.story_id or 0,
+                story_part_id=job.story_part_id,
+                compilation_id=job.compilation_id,
+                script_version_id=job.script_version_id,
+            ):
+                release.render_artifact_id = (platform_artifacts.get(release.platform) or artifact).id
+                release.delivery_mode = delivery_mode_for_platform(release.platform)
+                release.last_error = None
+                if release.approval_status == PublishApprovalStatus.APPROVED.value:
+                    next_status = approval_payload_status(release.publish_at)
+                    release.status = next_status
+                    release.publish_status = next_status
+                    ensure_publish_job(
+                        session,
+                        release,
+                        not_before=release.publish_at,
+                        payload={
+                            "delivery_mode": release.delivery_mode,
+                            "variant": release.variant,
+                            "auto_scheduled": True,
+                        },
+                    )
+                else:
+                    release.status = ReleaseStatus.READY.value
+                    release.publish_status = ReleaseStatus.READY.value
+                    release.approval_status = PublishApprovalStatus.PENDING.value
+                session.add(release)
+            if job.compilation_id:
+                compilation = session.get(Compilation, job.compilation_id)
+                if compilation:
+                    compilation.render_artifact_id = artifact.id
+                    compilation.status = StoryStatus.RENDERED.value
+                    session.add(compilation)
+            job.status = JobStatus.PUBLISH_READY.value
+            if story:
+                story.status = StoryStatus.PUBLISH_READY.value
+                session.add(story)
+        elif update.status == JobStatus.ERRORED.value:
+            for release in release_for_artifact(
+                session,
+                story_id=job.story_id or 0,
+                story_part_id=job.story_part_id,
+                compilation_id=job.compilation_id,
+                script_version_id=job.script_version_id,
+            ):
+                release.status = ReleaseStatus.ERRORED.value
+                release.publish_status = ReleaseStatus.ERRORED.value
+                release.last_error = update.error_message or update.stderr_snippet or "Render failed"
+                session.add(release)
 
     session.add(job)
     session.commit()
     session.refresh(job)
-    return job
+    return JobRead.model_validate(job)
+
+
+@router.post("/{job_id}/status", response_model=JobRead)
+async def update_render_job_status(
+    job_id: int,
+    update: RenderJobStatusUpdate,
+    session: AsyncSessionLike = Depends(get_async_session),
+    _: None = Depends(require_worker_token),
+) -> JobRead:
+    return await session.run_sync(_update_render_job_status, job_id, update)
 
 
-__all__ = ["router"]
+__all__ = ["render_jobs_query", "router"]
@@ -12,7 +12,7 @@ from sqlmodel import SQLModel, Session, select
 from shared.config import settings
 from shared.workflow import JobStatus, can_transition_job
 
-from .db import get_session
+from .db import AsyncSessionLike, get_async_session, get_session
 from .models import (
     AnalysisReport,
     AnalysisReportRead,
@@ -25,7 +25,6 @@ from .models import (
     PromptVersionRead,
     Release,
     ReleaseRead,
-    RenderPreset,
     ScriptBatch,
     ScriptBatchRead,
     ScriptVersion,
@@ -36,8 +35,9 @@ from .models import (
     StoryPart,
     StoryPartRead,
 )
-from .pipeline import create_short_releases, ensure_default_presets
-from .publishing import active_publish_platforms, release_read, validate_release_platform
+from .pipeline import create_short_releases, render_preset_by_slug
+from .publishing import active_publish_platforms, release_reads, validate_release_platform
+from .reference_cache import ACTIVE_PROMPT, invalidate
 from .refinement import (
     activate_script_version,
     build_analysis,
@@ -125,12 +125,24 @@ def _batch_scripts(session: Session, batch_id: int) -> list[ScriptVersion]:
     ).all()
 
 
+def script_parts_query(script_version_id: int) -> Any:
+    return select(StoryPart).where(StoryPart.script_version_id == script_version_id).order_by(StoryPart.index)
+
+
+def published_script_releases_query(script_version_id: int) -> Any:
+    return (
+        select(Release)
+        .where(
+            Release.script_version_id == script_version_id,
+            Release.platform == "youtube",
+            Release.published_at.is_not(None),
+        )
+        .order_by(Release.story_part_id)
+    )
+
+
 def _script_parts(session: Session, script_version_id: int) -> list[StoryPart]:
-    return session.exec(
-        select(StoryPart)
-        .where(StoryPart.script_version_id == script_version_id)
-        .order_by(StoryPart.index)
-    ).all()
+    return session.exec(script_parts_query(script_version_id)).all()
 
 
 def _serialize_script(session: Session, script: ScriptVersion) -> dict[str, Any]:
@@ -202,11 +214,7 @@ def _apply_metrics_for_window(session: Session, batch: ScriptBatch, window_hours
     weights = ((policy_prompt.config or {}).get("weights") if policy_prompt and policy_prompt.config else None) or {}
     for script in scripts:
         parts = _script_parts(session, script.id or 0)
-        release_rows = session.exec(
-            select(Release)
-            .where(Release.script_version_id == script.id, Release.platform == "youtube", Release.published_at.is_not(None))
-            .order_by(Release.story_part_id)
-        ).all()
+        release_rows = session.exec(published_script_releases_query(script.id or 0)).all()
         part_metrics: list[dict[str, float]] = []
         metrics_by_index: dict[int, dict[str, float]] = {}
         for release in release_rows:
@@ -459,8 +467,7 @@ def create_script_version_releases(
     if not script:
         raise HTTPException(status_code=404, detail="Script version not found")
     story = _get_story(session, script.story_id)
-    ensure_default_presets(session)
-    preset = session.exec(select(RenderPreset).where(RenderPreset.slug == payload.preset_slug)).first()
+    preset = render_preset_by_slug(session, payload.preset_slug)
     if not preset:
         raise HTTPException(status_code=404, detail="Render preset not found")
     platforms = payload.platforms or active_publish_platforms(session)
@@ -489,7 +496,7 @@ def create_script_version_releases(
         created.script_version_id = script.id
         session.add(created)
     session.commit()
-    return [release_read(session, release) for release in releases]
+    return release_reads(session, releases)
 
 
 @router.get("/analysis-reports", response_model=list[AnalysisReportRead])
@@ -533,6 +540,7 @@ def create_prompt_version(
     )
     session.add(prompt)
     session.commit()
+    invalidate(ACTIVE_PROMPT)
     session.refresh(prompt)
     return prompt
 
@@ -549,6 +557,7 @@ def activate_prompt_version(
         sibling.status = "active" if sibling.id == prompt.id else "archived"
         session.add(sibling)
     session.commit()
+    invalidate(ACTIVE_PROMPT)
     session.refresh(prompt)
     return prompt
 
@@ -564,6 +573,7 @@ def archive_prompt_version(
     prompt.status = "archived"
     session.add(prompt)
     session.commit()
+    invalidate(ACTIVE_PROMPT)
     session.refresh(prompt)
     return prompt
 
@@ -592,26 +602,24 @@ def enqueue_due_refinement_jobs(
     return {"enqueued": enqueued}
 
 
-@router.get("/refinement-jobs", response_model=list[JobRead])
-def list_refinement_jobs(
-    status: str | None = None,
-    limit: int = 100,
-    session: Session = Depends(get_session),
-    _: None = Depends(require_worker_token),
-) -> list[Job]:
+def _list_refinement_jobs(session: Session, status: str | None, limit: int) -> list[JobRead]:
     query = select(Job).where(Job.kind.ilike(f"{REFINEMENT_KIND_PREFIX}%"))
     if status:
         query = query.where(Job.status == status)
-    return session.exec(query.order_by(Job.id).limit(limit)).all()
+    return [JobRead.model_validate(job) for job in session.exec(query.order_by(Job.id).limit(limit)).all()]
 
 
-@router.post("/refinement-jobs/{job_id}/claim")
-def claim_refinement_job(
-    job_id: int,
-    request: ClaimRequest,
-    session: Session = Depends(get_session),
+@router.get("/refinement-jobs", response_model=list[JobRead])
+async def list_refinement_jobs(
+    status: str | None = None,
+    limit: int = 100,
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
-) -> dict[str, Any]:
+) -> list[JobRead]:
+    return await session.run_sync(_list_refinement_jobs, status, limit)
+
+
+def _claim_refinement_job(session: Session, job_id: int, request: ClaimRequest) -> dict[str, Any]:
     job = session.get(Job, job_id)
     if not job or not job.kind.startswith(REFINEMENT_KIND_PREFIX):
         raise HTTPException(status_code=404, detail="Refinement job not found")
@@ -625,12 +633,17 @@ def claim_refinement_job(
     return {"lease_expires_at": job.lease_expires_at}
 
 
-@router.post("/refinement-jobs/{job_id}/heartbeat")
-def heartbeat_refinement_job(
+@router.post("/refinement-jobs/{job_id}/claim")
+async def claim_refinement_job(
     job_id: int,
-    session: Session = Depends(get_session),
+    request: ClaimRequest,
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
 ) -> dict[str, Any]:
+    return await session.run_sync(_claim_refinement_job, job_id, request)
+
+
+def _heartbeat_refinement_job(session: Session, job_id: int) -> dict[str, Any]:
     job = session.get(Job, job_id)
     if not job or not job.kind.startswith(REFINEMENT_KIND_PREFIX):
         raise HTTPException(status_code=404, detail="Refinement job not found")
@@ -645,12 +658,16 @@ def heartbeat_refinement_job(
     return {"lease_expires_at": job.lease_expires_at}
 
 
-@router.get("/refinement-jobs/{job_id}/context")
-def refinement_job_context(
+@router.post("/refinement-jobs/{job_id}/heartbeat")
+async def heartbeat_refinement_job(
     job_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSessionLike = Depends(get_async_session),
     _: None = Depends(require_worker_token),
 ) -> dict[str, Any]:
+    return await session.run_sync(_heartbeat_refinement_job, job_id)
+
+
+def _refinement_job_context(session: Session, job_id: int) -> dict[str, Any]:
     job = session.get(Job, job_id)
     if not job or not job.kind.startswith(REFINEMENT_KIND_PREFIX):
         raise HTTPException(status_code=404, detail="Refinement job not found")
@@ -668,10 +685,33 @@ def refinement_job_context(
         "concept": StoryConceptRead.model_validate(concept).model_dump() if concept else None,
         "prompts": {prompt.kind: PromptVersionRead.model_validate(prompt).model_dump() for prompt in session.exec(select(PromptVersion)).all()},
         "scripts": [_serialize_script(session, script) for script in scripts],
-        "releases": [release_read(session, release).model_dump() for release in session.exec(select(Release).where(Release.script_version_id.in_([script.id for script in scripts if script.id is not None]))).all()] if scripts else [],
+        "releases": [
+            read.model_dump()
+            for read in release_reads(
+                session,
+                session.exec(
+                    select(Release).where(
+                        Release.script_version_id.in_([script.id for script in scripts if script.id is not None])
+                    )
+                ).all(),
+            )
+        ]
+        if scripts
+        else [],
     }
 
 
+@router.get("/refinement-jobs/{job_id}/context")
+async def refinement_job_context(
+    job_id: int,
+    session: AsyncSessionLike = Depends(get_async_session),
+    _: None = Depends(require_worker_token),
+) -> dict[str, Any]:
+    return await session.run_sync(_refinement_job_context, job_id)
+
+
+# Stays sync: the extract/generate fallbacks can call the OpenAI API and must
+# not block the event loop.
 @router.post("/refinement-jobs/{job_id}/status")
 def update_refinement_job_status(
     job_id: int,
@@ -772,4 +812,10 @@ def update_refinement_job_status(
     return job
 
 
-__all__ = ["enqueue_compat_script_generation", "router", "run_compat_script_generation"]
+__all__ = [
+    "enqueue_compat_script_generation",
+    "published_script_releases_query",
+    "router",
+    "run_compat_script_generation",
+    "script_parts_query",
+]
@@ -4,21 +4,24 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 import logging
-import mimetypes
 from pathlib import Path
 import re
-from typing import Any
-from urllib.parse import urlparse
+from typing import Any, Iterator
 import requests
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 from sqlmodel import Session, select
 
+from shared import pixabay
 from shared.config import settings
-from shared.workflow import PublishApprovalStatus, PublishJobStatus, ReleaseStatus, RenderVariant, StoryStatus, can_transition_story
+from shared.workflow import AssetDownloadStatus, PublishApprovalStatus, PublishJobStatus, ReleaseStatus, RenderVariant, StoryStatus, can_transition_story
 
+from .asset_index import enqueue_local_asset_index, run_local_asset_index_job
+from .asset_tags import library_tag_filter
+from .bundle_downloads import download_bundle_assets, is_downloaded, needs_download, requeue_pending_downloads
 from .db import get_session
 from .media_refs import asset_to_media_ref, bundle_asset_refs, bundle_part_asset_map, media_key, normalize_asset_refs, normalize_media_ref, ordered_part_asset_map
 from .models import (
@@ -26,10 +29,10 @@ from .models import (
     AssetBundle,
     AssetBundleRead,
     AssetRead,
-    ScriptBatch,
-    ScriptBatchRead,
     Compilation,
     CompilationRead,
+    Job,
+    JobRead,
     Release,
     ReleaseRead,
     RenderArtifact,
@@ -40,12 +43,17 @@ from .models import (
     ScriptVersionRead,
     MediaReference,
     PartMediaSelection,
+    RELEASE_QUEUE_FAR_FUTURE,
+    RELEASE_QUEUE_FAR_PAST,
     Story,
     StoryCreate,
     StoryPart,
     StoryPartRead,
     StoryRead,
+    StorySearchRead,
     StoryUpdate,
+    as_utc,
+    release_queue_sort_keys,
 )
 from .publishing import (
     active_publish_platforms,
@@ -55,21 +63,36 @@ from .publishing import (
     manual_handoff_metadata,
     maybe_mark_story_published,
     release_read,
+    release_reads,
     resolve_publish_job,
+    schedule_metrics_sync,
     short_release_schedule_from,
     weekly_compilation_schedule,
     validate_release_platform,
 )
+from .pagination import (
+    count_response,
+    cursor_id,
+    decode_cursor,
+    page_limit,
+    set_next_cursor,
+)
 from .pipeline import (
     create_asset_bundle,
+    create_draft_render_jobs,
     create_short_releases,
     create_weekly_compilation,
     ensure_default_presets,
     generate_release_metadata,
+    render_preset_by_slug,
     upsert_script,
 )
-from .script_refinement import enqueue_compat_script_generation, run_compat_script_generation
+from .script_refinement import enqueue_compat_script_generation, require_worker_token, run_compat_script_generation
 from .story_duplicates import find_duplicate_story
+from .story_overview import clear_story_overview, read_story_overview
+from .story_search import full_text_enabled, story_search_filter, story_search_headline, story_search_rank
+from .story_similarity import clear_near_duplicate_index, index_story
+from .streaming import STREAM_BATCH_SIZE, id_batches, ndjson_response
 
 router = APIRouter(tags=["stories"])
 logger = logging.getLogger(__name__)
@@ -143,6 +166,12 @@ class ReleaseCreate(BaseModel):
     asset_bundle_id: int | None = None
 
 
+class DraftRenderCreate(BaseModel):
+    preset_slug: str = "short-form"
+    asset_bundle_id: int | None = None
+    part_ids: list[int] | None = None
+
+
 class CompilationCreate(BaseModel):
     preset_slug: str = "weekly-full"
     platforms: list[str] = ["youtube"]
@@ -178,12 +207,13 @@ def _get_story(session: Session, story_id: int) -> Story:
 
 
 def _serialize_releases(session: Session, releases: list[Release]) -> list[ReleaseRead]:
-    return [release_read(session, release) for release in releases]
+    return release_reads(session, releases)
 
 
 def _sync_release_state(release: Release, status: str) -> None:
     release.status = status
     release.publish_status = status
+    schedule_metrics_sync(release)
 
 
 def _extract_image_keywords(story: Story) -> str:
@@ -251,25 +281,22 @@ def _pixabay_hit_score(hit: dict[str, Any]) -> float:
 
 
 def _fetch_pixabay_assets(keywords: str, *, page: int = 1) -> list[dict[str, Any]]:
-    if not settings.PIXABAY_API_KEY:
-        logger.warning("pixabay_assets_skipped_missing_key", extra={"keywords": keywords, "page": page})
+    if not pixabay.provider_ready():
+        logger.warning(
+            "pixabay_assets_skipped_unconfigured",
+            extra={"keywords": keywords, "page": page, "provider": settings.PIXABAY_PROVIDER},
+        )
         return []
     try:
-        response = requests.get(
-            "https://pixabay.com/api/",
-            params={
-                "key": settings.PIXABAY_API_KEY,
+        payload = pixabay.search_images(
+            {
                 "q": keywords,
                 "image_type": "photo",
                 "per_page": PIXABAY_RESULT_LIMIT,
                 "page": max(page, 1),
                 "safesearch": "true",
-            },
-            headers={"User-Agent": "dark-life-api/1.0"},
-            timeout=(3.05, 8),
+            }
         )
-        response.raise_for_status()
-        payload = response.json()
     except requests.RequestException as exc:
         logger.warning(
             "pixabay_assets_request_failed",
@@ -300,7 +327,7 @@ def _fetch_pixabay_assets(keywords: str, *, page: int = 1) -> list[dict[str, Any
         reverse=True,
     )
     for hit in sorted_hits[:12]:
-        remote_url = hit.get("webformatURL") or hit.get("largeImageURL")
+        remote_url = pixabay.hit_url(hit)
         if not remote_url:
             continue
         assets.append(
@@ -433,87 +460,15 @@ def _validate_bundle_payload(
     return ordered_refs, normalized_map
 
 
-def _remote_asset_suffix(asset: dict[str, Any], response: requests.Response | None = None) -> str:
-    remote_url = str(asset.get("remote_url") or "")
-    suffix = Path(urlparse(remote_url).path).suffix.lower()
-    if suffix:
-        return suffix
-    content_type = response.headers.get("content-type") if response is not None else None
-    if content_type:
-        guessed = mimetypes.guess_extension(content_type.split(";", 1)[0].strip())
-        if guessed:
-            return guessed
-    return ".jpg"
-
-
-def _resolve_pixabay_asset_url(provider_id: str) -> str | None:
-    if not settings.PIXABAY_API_KEY:
-        return None
-    response = requests.get(
-        "https://pixabay.com/api/",
-        params={
-            "key": settings.PIXABAY_API_KEY,
-            "id": provider_id,
-        },
-        timeout=12,
-    )
-    response.raise_for_status()
-    payload = response.json()
-    hit = next(iter(payload.get("hits", [])), None)
-    if not isinstance(hit, dict):
-        return None
-    return hit.get("webformatURL") or hit.get("largeImageURL")
-
-
-def _download_bundle_asset(story_id: int, asset: dict[str, Any]) -> tuple[str | None, str | None]:
-    remote_url = asset.get("remote_url")
-    if not remote_url:
-        return asset.get("local_path"), None
-    resolved_remote_url = remote_url
-    response: requests.Response | None = None
-    try:
-        response = requests.get(remote_url, timeout=60, stream=True)
-        response.raise_for_status()
-    except requests.HTTPError:
-        provider = str(asset.get("provider") or "")
-        provider_id = str(asset.get("provider_id") or "")
-        if provider == "pixabay" and provider_id:
-            refreshed_url = _resolve_pixabay_asset_url(provider_id)
-            if refreshed_url and refreshed_url != remote_url:
-                resolved_remote_url = refreshed_url
-                response = requests.get(refreshed_url, timeout=60, stream=True)
-                response.raise_for_status()
-            else:
-                raise
-        else:
-            raise
-
-    if response is None:
-        raise FileNotFoundError("Asset download did not start")
-
-    bundle_dir = settings.VISUALS_DIR / "stories" / str(story_id) / "bundles"
-    bundle_dir.mkdir(parents=True, exist_ok=True)
-    stem = str(asset.get("provider_id") or asset.get("key") or "selected-media")
-    suffix = _remote_asset_suffix(asset, response=response)
-    target = bundle_dir / f"{stem}{suffix}"
-    tmp = target.with_suffix(f"{target.suffix}.tmp")
-    with tmp.open("wb") as handle:
-        for chunk in response.iter_content(chunk_size=1024 * 1024):
-            if chunk:
-                handle.write(chunk)
-        handle.flush()
-        handle.close()
-    tmp.replace(target)
-    return str(target), resolved_remote_url
-
-
 def _persist_bundle_assets(
     session: Session,
     story: Story,
     *,
     asset_refs: list[dict[str, Any]],
     part_asset_map: list[dict[str, Any]],
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[tuple[int, dict[str, Any]]]]:
+    """Upsert the bundle's assets; remote downloads are returned for the background downloader."""
+
     normalized_refs = normalize_asset_refs(asset_refs)
     existing_assets = session.exec(select(Asset).where(Asset.story_id == story.id)).all()
     existing_by_provider = {
@@ -525,6 +480,7 @@ def _persist_bundle_assets(
         asset.remote_url: asset for asset in existing_assets if asset.remote_url
     }
     persisted_by_key: dict[str, dict[str, Any]] = {}
+    downloads: list[tuple[int, dict[str, Any]]] = []
 
     for ref in normalized_refs:
         provider = str(ref.get("provider") or "")
@@ -534,20 +490,21 @@ def _persist_bundle_assets(
         if asset is None and remote_url:
             asset = existing_by_remote.get(remote_url)
 
-        local_path = ref.get("local_path")
-        refreshed_remote_url = remote_url
-        if provider == "pixabay" and remote_url:
-            local_path, refreshed_remote_url = _download_bundle_asset(story.id, ref)
+        # An asset another worker is downloading keeps its claim.
+        in_flight = asset is not None and asset.download_status == AssetDownloadStatus.DOWNLOADING.value
+        download = needs_download(ref) and not is_downloaded(asset) and not in_flight
+        local_path = None if download else ref.get("local_path")
+        download_status = AssetDownloadStatus.PENDING.value if download else None
 
         if asset is None:
             asset = Asset(
                 story_id=story.id,
                 type=ref.get("type") or "image",
-                remote_url=refreshed_remote_url,
+                remote_url=remote_url,
                 local_path=local_path,
                 provider=provider or None,
                 provider_id=provider_id or None,
-                source="remote" if refreshed_remote_url else "local",
+                source="remote" if remote_url else "local",
                 selected=True,
                 duration_ms=ref.get("duration_ms"),
                 width=ref.get("width"),
@@ -555,13 +512,21 @@ def _persist_bundle_assets(
                 orientation=ref.get("orientation"),
                 attribution=ref.get("attribution"),
                 tags=ref.get("tags"),
+                download_status=download_status,
             )
             session.add(asset)
             session.flush()
         else:
             asset.type = ref.get("type") or asset.type
-            asset.remote_url = refreshed_remote_url
+            asset.remote_url = remote_url
             asset.local_path = local_path or asset.local_path
+            if download:
+                asset.download_status = download_status
+                # A rebuilt bundle gives exhausted downloads a fresh set of attempts.
+                asset.download_attempts = 0
+                if asset.local_path and not Path(asset.local_path).exists():
+                    # The renderer falls back to remote_url only when no local path is set.
+                    asset.local_path = None
             asset.provider = provider or asset.provider
             asset.provider_id = provider_id or asset.provider_id
             asset.source = "remote" if asset.remote_url else "local"
@@ -577,6 +542,8 @@ def _persist_bundle_assets(
 
         persisted_ref = asset_to_media_ref(asset)
         persisted_by_key[ref["key"]] = persisted_ref
+        if download:
+            downloads.append((asset.id, persisted_ref))
 
     persisted_map = [
         {
@@ -586,7 +553,7 @@ def _persist_bundle_assets(
         for row in part_asset_map
     ]
     persisted_refs = [persisted_by_key[ref["key"]] for ref in normalized_refs if ref["key"] in persisted_by_key]
-    return persisted_refs, persisted_map
+    return persisted_refs, persisted_map, downloads
 
 
 def _sentence_spans(text: str) -> list[tuple[str, int, int]]:
@@ -614,21 +581,98 @@ def _snap_boundaries(text: str, start: int, end: int) -> tuple[int, int]:
     return start, end
 
 
-@router.get("/stories", response_model=list[StoryRead])
+def _story_filters(session: Session, *, status: str | None, q: str | None) -> list[Any]:
+    filters: list[Any] = []
+    if status:
+        filters.append(Story.status == status)
+    if q:
+        filters.append(story_search_filter(session, q))
+    return filters
+
+
+def _search_stories(
+    session: Session,
+    response: Response,
+    *,
+    status: str | None,
+    q: str,
+    cursor: str | None,
+    limit: int,
+) -> list[StorySearchRead]:
+    """Rank full-text matches, paging on ``(rank, id)``."""
+
+    rank = story_search_rank(q)
+    query = select(Story, rank.label("search_rank"), story_search_headline(q).label("search_headline")).where(
+        *_story_filters(session, status=status, q=q)
+    )
+    if cursor:
+        values = decode_cursor(cursor)
+        last_rank, last_id = values.get("rank"), values.get("id")
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(or_(rank < last_rank, and_(rank == last_rank, Story.id < last_id)))
+    rows = session.exec(query.order_by(rank.desc(), Story.id.desc()).limit(limit)).all()
+    hits = [
+        StorySearchRead.model_validate(story).model_copy(
+            update={"search_rank": search_rank, "search_headline": search_headline}
+        )
+        for story, search_rank, search_headline in rows
+    ]
+    if hits:
+        set_next_cursor(response, hits, limit, rank=hits[-1].search_rank)
+    return hits
+
+
+@router.get("/stories", response_model=list[StorySearchRead])
 def list_stories(
+    response: Response,
     status: str | None = None,
     q: str | None = None,
-    page: int = 1,
-    limit: int = 50,
+    page: int = Query(default=1, ge=1, description="Deprecated offset paging; prefer cursor"),
+    cursor: str | None = None,
+    after_id: int | None = None,
+    limit: int = page_limit(50),
     session: Session = Depends(get_session),
-) -> list[Story]:
-    query = select(Story)
-    if status:
-        query = query.where(Story.status == status)
-    if q:
-        query = query.where(Story.title.ilike(f"%{q}%"))
-    query = query.order_by(Story.id.desc()).offset((page - 1) * limit).limit(limit)
-    return session.exec(query).all()
+) -> list[Any]:
+    if q and full_text_enabled(session) and after_id is None and page == 1:
+        return _search_stories(session, response, status=status, q=q, cursor=cursor, limit=limit)
+    query = select(Story).where(*_story_filters(session, status=status, q=q)).order_by(Story.id.desc())
+    last_id = cursor_id(cursor, after_id)
+    if last_id is not None:
+        query = query.where(Story.id < last_id)
+    elif page > 1:
+        query = query.offset((page - 1) * limit)
+    stories = session.exec(query.limit(limit)).all()
+    set_next_cursor(response, stories, limit)
+    return stories
+
+
+@router.get("/stories/stream", response_class=StreamingResponse)
+def stream_stories(
+    status: str | None = None,
+    q: str | None = None,
+    session: Session = Depends(get_session),
+) -> StreamingResponse:
+    """Every matching story as NDJSON, newest first and unranked."""
+
+    query = select(Story).where(*_story_filters(session, status=status, q=q))
+    return ndjson_response(
+        id_batches(session, query, Story.id),
+        lambda stories: (StoryRead.model_validate(story) for story in stories),
+    )
+
+
+@router.get("/stories/count")
+def count_stories(
+    response: Response,
+    status: str | None = None,
+    q: str | None = None,
+    session: Session = Depends(get_session),
+) -> dict[str, int]:
+    total = session.exec(
+        select(func.count()).select_from(Story).where(*_story_filters(session, status=status, q=q))
+    ).one()
+    return count_response(response, total)
 
 
 @router.get("/stories/{story_id}", response_model=StoryRead)
@@ -653,6 +697,8 @@ def create_story(story_in: StoryCreate, session: Session = Depends(get_session))
         )
     story = Story(**payload)
     session.add(story)
+    session.flush()
+    index_story(session, story)
     session.commit()
     session.refresh(story)
     return story
@@ -673,6 +719,8 @@ def update_story(
         setattr(story, key, value)
     story.updated_at = datetime.now(timezone.utc)
     session.add(story)
+    if "body_md" in data:
+        index_story(session, story)
     session.commit()
     session.refresh(story)
     return story
@@ -681,6 +729,8 @@ def update_story(
 @router.delete("/stories/{story_id}")
 def delete_story(story_id: int, session: Session = Depends(get_session)) -> Response:
     story = _get_story(session, story_id)
+    clear_near_duplicate_index(session, story_id)
+    clear_story_overview(session, story_id)
     session.delete(story)
     session.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -796,25 +846,69 @@ def replace_parts(
     ).all()
 
 
+def _library_query(asset_type: str | None, q: str | None = None) -> Any:
+    query = select(Asset).where(Asset.story_id.is_(None))
+    if asset_type:
+        query = query.where(Asset.type == asset_type)
+    terms = (q or "").split()
+    if terms:
+        query = query.where(library_tag_filter(terms))
+    return query
+
+
 @router.get("/assets/library", response_model=list[AssetRead])
 def list_asset_library(
+    response: Response,
     q: str | None = None,
     asset_type: str | None = Query(default=None, alias="type"),
+    cursor: str | None = None,
+    after_id: int | None = None,
+    limit: int = page_limit(),
     session: Session = Depends(get_session),
 ) -> list[Asset]:
-    query = select(Asset).where(Asset.story_id.is_(None))
-    if asset_type:
-        query = query.where(Asset.type == asset_type)
-    assets = session.exec(query.order_by(Asset.id.desc())).all()
-    if not q:
-        return assets
-    terms = {term.lower() for term in q.split() if term.strip()}
-    return [
-        asset
-        for asset in assets
-        if terms.intersection(set(asset.tags or []))
-        or any(term in (asset.local_path or "").lower() for term in terms)
-    ]
+    query = _library_query(asset_type, q).order_by(Asset.id.desc())
+    last_id = cursor_id(cursor, after_id)
+    if last_id is not None:
+        query = query.where(Asset.id < last_id)
+    assets = session.exec(query.limit(limit)).all()
+    set_next_cursor(response, assets, limit)
+    return assets
+
+
+@router.get("/assets/library/count")
+def count_asset_library(
+    response: Response,
+    q: str | None = None,
+    asset_type: str | None = Query(default=None, alias="type"),
+    session: Session = Depends(get_session),
+) -> dict[str, int]:
+    total = session.exec(
+        select(func.count()).select_from(_library_query(asset_type, q).subquery())
+    ).one()
+    return count_response(response, total)
+
+
+@router.post("/assets/library/index", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+def index_asset_library(
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+) -> Job:
+    """Start indexing ``VISUALS_DIR``, or return the index job already in flight."""
+
+    job, created = enqueue_local_asset_index(session)
+    if created:
+        background_tasks.add_task(run_local_asset_index_job, session.get_bind(), job.id)
+    return job
+
+
+@router.post("/assets/downloads/maintenance")
+def requeue_asset_downloads(
+    session: Session = Depends(get_session),
+    _: None = Depends(require_worker_token),
+) -> dict[str, int]:
+    """Queue pending, retryable failed and abandoned bundle asset downloads."""
+
+    return {"queued": requeue_pending_downloads(session.get_bind())}
 
 
 @router.post("/stories/{story_id}/assets/index", response_model=list[MediaReference])
@@ -863,6 +957,7 @@ def list_asset_bundles(story_id: int, session: Session = Depends(get_session)) -
 def create_bundle(
     story_id: int,
     bundle_in: AssetBundleCreate,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
 ) -> AssetBundle:
     story = _get_story(session, story_id)
@@ -880,7 +975,7 @@ def create_bundle(
         asset_refs=[asset.model_dump() if isinstance(asset, MediaReference) else asset for asset in bundle_in.asset_refs],
         part_asset_map=part_asset_rows,
     )
-    persisted_asset_refs, persisted_part_asset_map = _persist_bundle_assets(
+    persisted_asset_refs, persisted_part_asset_map, downloads = _persist_bundle_assets(
         session,
         story,
         asset_refs=asset_refs,
@@ -898,6 +993,8 @@ def create_bundle(
     )
     session.commit()
     session.refresh(bundle)
+    if downloads:
+        background_tasks.add_task(download_bundle_assets, session.get_bind(), bundle.id, downloads)
     return bundle
 
 
@@ -914,8 +1011,7 @@ def create_releases(
     session: Session = Depends(get_session),
 ) -> list[ReleaseRead]:
     story = _get_story(session, story_id)
-    ensure_default_presets(session)
-    preset = session.exec(select(RenderPreset).where(RenderPreset.slug == payload.preset_slug)).first()
+    preset = render_preset_by_slug(session, payload.preset_slug)
     if not preset:
         raise HTTPException(status_code=404, detail="Render preset not found")
     platforms = payload.platforms or active_publish_platforms(session)
@@ -947,6 +1043,37 @@ def create_releases(
     return _serialize_releases(session, releases)
 
 
+@router.post("/stories/{story_id}/drafts", response_model=list[JobRead])
+def create_draft_renders(
+    story_id: int,
+    payload: DraftRenderCreate,
+    session: Session = Depends(get_session),
+) -> list[Job]:
+    story = _get_story(session, story_id)
+    preset = render_preset_by_slug(session, payload.preset_slug)
+    if not preset:
+        raise HTTPException(status_code=404, detail="Render preset not found")
+    bundle_id = payload.asset_bundle_id or story.active_asset_bundle_id
+    if not bundle_id:
+        raise HTTPException(status_code=400, detail="Active asset bundle required")
+    bundle = session.get(AssetBundle, bundle_id)
+    if not bundle:
+        raise HTTPException(status_code=404, detail="Asset bundle not found")
+    parts_query = select(StoryPart).where(StoryPart.story_id == story_id)
+    if story.active_script_version_id:
+        parts_query = parts_query.where(StoryPart.script_version_id == story.active_script_version_id)
+    parts = session.exec(parts_query.order_by(StoryPart.index)).all()
+    if payload.part_ids is not None:
+        parts = [part for part in parts if part.id in set(payload.part_ids)]
+    if not parts:
+        raise HTTPException(status_code=400, detail="No story parts to render")
+    jobs = create_draft_render_jobs(session, story, preset=preset, asset_bundle=bundle, parts=parts)
+    session.commit()
+    for job in jobs:
+        session.refresh(job)
+    return jobs
+
+
 @router.get("/stories/{story_id}/releases", response_model=list[ReleaseRead])
 def list_releases(story_id: int, session: Session = Depends(get_session)) -> list[ReleaseRead]:
     _get_story(session, story_id)
@@ -958,35 +1085,121 @@ def list_releases(story_id: int, session: Session = Depends(get_session)) -> lis
     return _serialize_releases(session, releases)
 
 
-@router.get("/releases/queue", response_model=list[ReleaseRead])
-def release_queue(session: Session = Depends(get_session)) -> list[ReleaseRead]:
+def _release_queue_filter() -> Any:
     recent_published_cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.EARLY_SIGNAL_WINDOW_HOURS)
-    releases = session.exec(
-        select(Release)
-        .where(
+    return or_(
+        Release.status.in_(
+            [
+                ReleaseStatus.READY.value,
+                ReleaseStatus.APPROVED.value,
+                ReleaseStatus.SCHEDULED.value,
+                ReleaseStatus.PUBLISHING.value,
+                ReleaseStatus.MANUAL_HANDOFF.value,
+                ReleaseStatus.ERRORED.value,
+            ]
+        ),
+        and_(
+            Release.status == ReleaseStatus.PUBLISHED.value,
+            Release.published_at.is_not(None),
+            Release.published_at >= recent_published_cutoff,
+        ),
+    )
+
+
+def _queue_sort_values(release: Release) -> tuple[datetime, datetime]:
+    return (
+        as_utc(release.publish_at) if release.publish_at else RELEASE_QUEUE_FAR_FUTURE,
+        as_utc(release.published_at) if release.published_at else RELEASE_QUEUE_FAR_PAST,
+    )
+
+
+def release_queue_query(*, after: tuple[datetime, datetime, int] | None, limit: int) -> Any:
+    # Sentinels stand in for NULLs so the order can be resumed by keyset.
+    publish_key, published_key = release_queue_sort_keys()
+    query = select(Release).where(_release_queue_filter())
+    if after is not None:
+        after_publish, after_published, after_id = after
+        query = query.where(
             or_(
-                Release.status.in_(
-                    [
-                        ReleaseStatus.READY.value,
-                        ReleaseStatus.APPROVED.value,
-                        ReleaseStatus.SCHEDULED.value,
-                        ReleaseStatus.PUBLISHING.value,
-                        ReleaseStatus.MANUAL_HANDOFF.value,
-                        ReleaseStatus.ERRORED.value,
-                    ]
-                ),
+                publish_key > after_publish,
                 and_(
-                    Release.status == ReleaseStatus.PUBLISHED.value,
-                    Release.published_at.is_not(None),
-                    Release.published_at >= recent_published_cutoff,
+                    publish_key == after_publish,
+                    or_(
+                        published_key < after_published,
+                        and_(published_key == after_published, Release.id > after_id),
+                    ),
                 ),
             )
         )
-        .order_by(Release.publish_at.asc().nullslast(), Release.published_at.desc().nullslast(), Release.id.asc())
-    ).all()
+    return query.order_by(publish_key.asc(), published_key.desc(), Release.id.asc()).limit(limit)
+
+
+def _release_queue_page(
+    session: Session,
+    *,
+    after: tuple[datetime, datetime, int] | None,
+    limit: int,
+) -> list[Release]:
+    return list(session.exec(release_queue_query(after=after, limit=limit)).all())
+
+
+@router.get("/releases/queue", response_model=list[ReleaseRead])
+def release_queue(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = page_limit(),
+    session: Session = Depends(get_session),
+) -> list[ReleaseRead]:
+    after: tuple[datetime, datetime, int] | None = None
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            after = (
+                datetime.fromisoformat(values["publish_at"]),
+                datetime.fromisoformat(values["published_at"]),
+                int(values["id"]),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    releases = _release_queue_page(session, after=after, limit=limit)
+    if releases and len(releases) >= limit:
+        publish_at, published_at = _queue_sort_values(releases[-1])
+        set_next_cursor(
+            response,
+            releases,
+            limit,
+            publish_at=publish_at.isoformat(),
+            published_at=published_at.isoformat(),
+        )
     return _serialize_releases(session, releases)
 
 
+@router.get("/releases/queue/stream", response_class=StreamingResponse)
+def stream_release_queue(session: Session = Depends(get_session)) -> StreamingResponse:
+    """The whole release queue as NDJSON, in queue order."""
+
+    def batches() -> Iterator[list[Release]]:
+        after: tuple[datetime, datetime, int] | None = None
+        while True:
+            releases = _release_queue_page(session, after=after, limit=STREAM_BATCH_SIZE)
+            if not releases:
+                return
+            yield releases
+            if len(releases) < STREAM_BATCH_SIZE:
+                return
+            publish_at, published_at = _queue_sort_values(releases[-1])
+            after = (publish_at, published_at, releases[-1].id or 0)
+            session.expunge_all()
+
+    return ndjson_response(batches(), lambda releases: _serialize_releases(session, releases))
+
+
+@router.get("/releases/queue/count")
+def count_release_queue(response: Response, session: Session = Depends(get_session)) -> dict[str, int]:
+    total = session.exec(select(func.count()).select_from(Release).where(_release_queue_filter())).one()
+    return count_response(response, total)
+
+
 @router.post("/releases/{release_id}/approve", response_model=ReleaseRead)
 def approve_release(
     release_id: int,
@@ -1182,7 +1395,7 @@ def reschedule_release_queue(
     session.commit()
     return ReleaseRescheduleResult(
         total_rescheduled=len(releases),
-        releases=[release_read(session, release) for release in releases],
+        releases=release_reads(session, releases),
     )
 
 
@@ -1193,8 +1406,7 @@ def create_compilation(
     session: Session = Depends(get_session),
 ) -> Compilation:
     story = _get_story(session, story_id)
-    ensure_default_presets(session)
-    preset = session.exec(select(RenderPreset).where(RenderPreset.slug == payload.preset_slug)).first()
+    preset = render_preset_by_slug(session, payload.preset_slug)
     if not preset:
         raise HTTPException(status_code=404, detail="Render preset not found")
     for platform in payload.platforms:
@@ -1251,62 +1463,33 @@ def list_compilations(story_id: int, session: Session = Depends(get_session)) ->
 
 
 @router.get("/stories/{story_id}/artifacts", response_model=list[RenderArtifactRead])
-def list_artifacts(story_id: int, session: Session = Depends(get_session)) -> list[RenderArtifact]:
+def list_artifacts(
+    story_id: int,
+    response: Response,
+    cursor: str | None = None,
+    after_id: int | None = None,
+    limit: int = page_limit(),
+    session: Session = Depends(get_session),
+) -> list[RenderArtifact]:
     _get_story(session, story_id)
-    return session.exec(
-        select(RenderArtifact)
-        .where(RenderArtifact.story_id == story_id)
-        .order_by(RenderArtifact.id.desc())
-    ).all()
+    query = select(RenderArtifact).where(RenderArtifact.story_id == story_id)
+    last_id = cursor_id(cursor, after_id)
+    if last_id is not None:
+        query = query.where(RenderArtifact.id < last_id)
+    artifacts = session.exec(query.order_by(RenderArtifact.id.desc()).limit(limit)).all()
+    set_next_cursor(response, artifacts, limit)
+    return artifacts
+
+
+@router.get("/stories/{story_id}/artifacts/count")
+def count_artifacts(story_id: int, response: Response, session: Session = Depends(get_session)) -> dict[str, int]:
+    _get_story(session, story_id)
+    total = session.exec(
+        select(func.count()).select_from(RenderArtifact).where(RenderArtifact.story_id == story_id)
+    ).one()
+    return count_response(response, total)
 
 
 @router.get("/stories/{story_id}/overview")
 def story_overview(story_id: int, session: Session = Depends(get_session)) -> dict[str, Any]:
-    story = _get_story(session, story_id)
-    script = session.get(ScriptVersion, story.active_script_version_id) if story.active_script_version_id else None
-    parts = session.exec(
-        select(StoryPart)
-        .where(
-            StoryPart.story_id == story_id,
-            StoryPart.script_version_id == story.active_script_version_id,
-        )
-        .order_by(StoryPart.index)
-    ).all()
-    script_versions = session.exec(
-        select(ScriptVersion)
-        .where(ScriptVersion.story_id == story_id)
-        .order_by(ScriptVersion.id.desc())
-    ).all()
-    script_batches = session.exec(
-        select(ScriptBatch)
-        .where(ScriptBatch.story_id == story_id)
-        .order_by(ScriptBatch.id.desc())
-    ).all()
-    bundles = session.exec(
-        select(AssetBundle)
-        .where(AssetBundle.story_id == story_id)
-        .order_by(AssetBundle.id.desc())
-    ).all()
-    for bundle in bundles:
-        bundle.asset_refs = bundle_asset_refs(bundle, session)
-        bundle.part_asset_map = bundle_part_asset_map(bundle, parts, session)
-    releases = session.exec(
-        select(Release).where(Release.story_id == story_id).order_by(Release.id.desc())
-    ).all()
-    return {
-        "story": StoryRead.model_validate(story).model_dump(),
-        "active_script": ScriptVersionRead.model_validate(script).model_dump() if script else None,
-        "script_versions": [ScriptVersionRead.model_validate(item).model_dump() for item in script_versions],
-        "script_batches": [ScriptBatchRead.model_validate(item).model_dump() for item in script_batches],
-        "parts": [StoryPartRead.model_validate(part).model_dump() for part in parts],
-        "asset_bundles": [AssetBundleRead.model_validate(bundle).model_dump() for bundle in bundles],
-        "releases": [release_read(session, release).model_dump() for release in releases],
-        "artifacts": [
-            RenderArtifactRead.model_validate(artifact).model_dump()
-            for artifact in session.exec(
-                select(RenderArtifact)
-                .where(RenderArtifact.story_id == story_id)
-                .order_by(RenderArtifact.id.desc())
-            ).all()
-        ],
-    }
+    return read_story_overview(session, _get_story(session, story_id))
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import re
 
+from sqlalchemy import event, inspect
 from sqlmodel import Session, select
 
+from shared.config import settings
+
 from .models import Story
+from .story_similarity import find_near_duplicate_story
 
 WHITESPACE_RE = re.compile(r"\s+")
+KEY_SEPARATOR = "\x1f"
+DUPLICATE_KEY_FIELDS = ("title", "author", "body_md")
 
 
 def _canonical_text(value: str | None) -> str:
@@ -21,6 +28,26 @@ def story_duplicate_key(*, title: str | None, author: str | None, body_md: str |
     )
 
 
+def story_duplicate_key_hash(*, title: str | None, author: str | None, body_md: str | None) -> str:
+    key = story_duplicate_key(title=title, author=author, body_md=body_md)
+    return hashlib.sha256(KEY_SEPARATOR.join(key).encode("utf-8")).hexdigest()
+
+
+@event.listens_for(Story, "before_insert")
+@event.listens_for(Story, "before_update")
+def _sync_duplicate_key_hash(_mapper, _connection, story: Story) -> None:
+    state = inspect(story)
+    if state.has_identity and story.duplicate_key_hash and not any(
+        state.attrs[name].history.has_changes() for name in DUPLICATE_KEY_FIELDS
+    ):
+        return
+    story.duplicate_key_hash = story_duplicate_key_hash(
+        title=story.title,
+        author=story.author,
+        body_md=story.body_md,
+    )
+
+
 def find_duplicate_story(
     session: Session,
     *,
@@ -30,9 +57,12 @@ def find_duplicate_story(
     exclude_story_id: int | None = None,
 ) -> Story | None:
     requested_key = story_duplicate_key(title=title, author=author, body_md=body_md)
-    for story in session.exec(select(Story)).all():
-        if exclude_story_id is not None and story.id == exclude_story_id:
-            continue
+    query = select(Story).where(
+        Story.duplicate_key_hash == story_duplicate_key_hash(title=title, author=author, body_md=body_md)
+    )
+    if exclude_story_id is not None:
+        query = query.where(Story.id != exclude_story_id)
+    for story in session.exec(query.order_by(Story.id)).all():
         story_key = story_duplicate_key(
             title=story.title,
             author=story.author,
@@ -40,4 +70,12 @@ def find_duplicate_story(
         )
         if story_key == requested_key:
             return story
+    if settings.STORY_NEAR_DUPLICATE_ENABLED:
+        near_duplicate = find_near_duplicate_story(
+            session,
+            body_md=body_md,
+            exclude_story_id=exclude_story_id,
+        )
+        if near_duplicate:
+            return near_duplicate.story
     return None
@@ -0,0 +1,251 @@
+"""Materialized story overview documents.
+
+``GET /stories/{id}/overview`` reads one ``StoryOverview`` row instead of
+assembling parts, scripts, batches, bundles, releases and artifacts per
+request. Session hooks collect the stories touched by each flush and, just
+before the transaction commits, rebuild the overview rows that already exist
+for them, so every write path (render job status updates, release approval,
+batch creation, ...) keeps the document current in the same transaction.
+Stories without a row are built on first read, which keeps bulk ingestion
+from paying for overviews nobody has opened.
+
+Signed release URLs expire, so they are re-signed on every read. Early
+signals change once a short leaves its early-signal window; ``stale_after``
+records the next such moment and the read path rebuilds past it.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from shared.config import settings
+from shared.workflow import ReleaseStatus, RenderVariant
+
+from .media_refs import bundle_asset_refs, bundle_part_asset_map
+from .models import (
+    Asset,
+    AssetBundle,
+    AssetBundleRead,
+    MetricsSnapshot,
+    PublishJob,
+    Release,
+    RenderArtifact,
+    RenderArtifactRead,
+    ScriptBatch,
+    ScriptBatchRead,
+    ScriptVersion,
+    ScriptVersionRead,
+    Story,
+    StoryOverview,
+    StoryPart,
+    StoryPartRead,
+    StoryRead,
+    as_utc,
+)
+from .publishing import build_signed_artifact_url, release_reads
+
+OVERVIEW_VERSION = 1
+_PENDING_STORIES = "story_overview_pending_stories"
+_PENDING_RELEASES = "story_overview_pending_releases"
+_STORY_SCOPED = (StoryPart, ScriptVersion, ScriptBatch, AssetBundle, Asset, Release, RenderArtifact, MetricsSnapshot)
+_SIGNED_URL_FIELDS = {
+    "signed_asset_url": None,
+    "signed_proxy_url": "proxy",
+    "signed_contact_sheet_url": "contact-sheet",
+}
+
+
+def _stale_after(releases: Iterable[Release], now: datetime) -> datetime | None:
+    window = timedelta(hours=settings.EARLY_SIGNAL_WINDOW_HOURS)
+    boundaries = [
+        as_utc(release.published_at) + window
+        for release in releases
+        if release.published_at is not None
+        and release.variant == RenderVariant.SHORT.value
+        and release.status == ReleaseStatus.PUBLISHED.value
+    ]
+    upcoming = [boundary for boundary in boundaries if boundary > now]
+    return min(upcoming) if upcoming else None
+
+
+def build_story_overview(session: Session, story: Story) -> tuple[dict[str, Any], datetime | None]:
+    """Assemble the overview document and the time it next needs a rebuild."""
+
+    story_id = story.id
+    script = session.get(ScriptVersion, story.active_script_version_id) if story.active_script_version_id else None
+    parts = session.exec(
+        select(StoryPart)
+        .where(
+            StoryPart.story_id == story_id,
+            StoryPart.script_version_id == story.active_script_version_id,
+        )
+        .order_by(StoryPart.index)
+    ).all()
+    script_versions = session.exec(
+        select(ScriptVersion)
+        .where(ScriptVersion.story_id == story_id)
+        .order_by(ScriptVersion.id.desc())
+    ).all()
+    script_batches = session.exec(
+        select(ScriptBatch)
+        .where(ScriptBatch.story_id == story_id)
+        .order_by(ScriptBatch.id.desc())
+    ).all()
+    bundles = session.exec(
+        select(AssetBundle)
+        .where(AssetBundle.story_id == story_id)
+        .order_by(AssetBundle.id.desc())
+    ).all()
+    releases = session.exec(
+        select(Release).where(Release.story_id == story_id).order_by(Release.id.desc())
+    ).all()
+    artifacts = session.exec(
+        select(RenderArtifact)
+        .where(RenderArtifact.story_id == story_id)
+        .order_by(RenderArtifact.id.desc())
+    ).all()
+    document = {
+        "story": StoryRead.model_validate(story).model_dump(mode="json"),
+        "active_script": ScriptVersionRead.model_validate(script).model_dump(mode="json") if script else None,
+        "script_versions": [ScriptVersionRead.model_validate(item).model_dump(mode="json") for item in script_versions],
+        "script_batches": [ScriptBatchRead.model_validate(item).model_dump(mode="json") for item in script_batches],
+        "parts": [StoryPartRead.model_validate(part).model_dump(mode="json") for part in parts],
+        # Resolved refs go on the read model only; the bundle rows must stay untouched
+        # because this also runs inside before_commit.
+        "asset_bundles": [
+            AssetBundleRead.model_validate(bundle)
+            .model_copy(
+                update={
+                    "asset_refs": bundle_asset_refs(bundle, session),
+                    "part_asset_map": bundle_part_asset_map(bundle, list(parts), session),
+                }
+            )
+            .model_dump(mode="json")
+            for bundle in bundles
+        ],
+        "releases": [read.model_dump(mode="json") for read in release_reads(session, releases)],
+        "artifacts": [RenderArtifactRead.model_validate(artifact).model_dump(mode="json") for artifact in artifacts],
+    }
+    return document, _stale_after(releases, datetime.now(timezone.utc))
+
+
+def store_story_overview(session: Session, story: Story) -> StoryOverview:
+    """Build and stage the overview row for ``story``; the caller commits."""
+
+    document, stale_after = build_story_overview(session, story)
+    overview = session.get(StoryOverview, story.id) or StoryOverview(story_id=story.id)
+    overview.version = OVERVIEW_VERSION
+    overview.document = document
+    overview.stale_after = stale_after
+    overview.built_at = datetime.now(timezone.utc)
+    session.add(overview)
+    return overview
+
+
+def clear_story_overview(session: Session, story_id: int) -> None:
+    overview = session.get(StoryOverview, story_id)
+    if overview is not None:
+        session.delete(overview)
+
+
+def refresh_story_overviews(session: Session, story_ids: Iterable[int]) -> int:
+    """Rebuild existing overview rows for ``story_ids``. Returns rows rebuilt."""
+
+    story_ids = sorted(set(story_ids))
+    if not story_ids:
+        return 0
+    rebuilt = 0
+    for overview in session.exec(select(StoryOverview).where(StoryOverview.story_id.in_(story_ids))).all():
+        story = session.get(Story, overview.story_id)
+        if story is None:
+            session.delete(overview)
+            continue
+        store_story_overview(session, story)
+        rebuilt += 1
+    return rebuilt
+
+
+def _resign_releases(document: dict[str, Any]) -> dict[str, Any]:
+    for release in document.get("releases") or []:
+        for field, preview in _SIGNED_URL_FIELDS.items():
+            if release.get(field):
+                release[field] = build_signed_artifact_url(release_id=release["id"], preview=preview)
+    return document
+
+
+def read_story_overview(session: Session, story: Story) -> dict[str, Any]:
+    """Return the stored overview for ``story``, building it when missing or stale."""
+
+    overview = session.get(StoryOverview, story.id)
+    now = datetime.now(timezone.utc)
+    if (
+        overview is None
+        or overview.version != OVERVIEW_VERSION
+        or (overview.stale_after is not None and as_utc(overview.stale_after) <= now)
+    ):
+        overview = store_story_overview(session, story)
+        document = overview.document
+        try:
+            session.commit()
+        except IntegrityError:
+            # A concurrent reader stored the same overview first.
+            session.rollback()
+        return _resign_releases(document)
+    return _resign_releases(overview.document)
+
+
+def _story_id_of(instance: object) -> int | None:
+    if isinstance(instance, Story):
+        return instance.id
+    if isinstance(instance, _STORY_SCOPED):
+        return instance.story_id
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_stories(session: Session, _flush_context: Any) -> None:
+    stories: set[int] = session.info.setdefault(_PENDING_STORIES, set())
+    releases: set[int] = session.info.setdefault(_PENDING_RELEASES, set())
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, PublishJob):
+            releases.add(instance.release_id)
+            continue
+        story_id = _story_id_of(instance)
+        if story_id is not None:
+            stories.add(story_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_touched_overviews(session: Session) -> None:
+    session.flush()
+    story_ids: set[int] = session.info.pop(_PENDING_STORIES, set())
+    release_ids: set[int] = session.info.pop(_PENDING_RELEASES, set())
+    if release_ids:
+        story_ids.update(session.exec(select(Release.story_id).where(Release.id.in_(release_ids))).all())
+    if story_ids:
+        refresh_story_overviews(session, story_ids)
+        session.flush()
+    session.info.pop(_PENDING_STORIES, None)
+    session.info.pop(_PENDING_RELEASES, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched_stories(session: Session) -> None:
+    session.info.pop(_PENDING_STORIES, None)
+    session.info.pop(_PENDING_RELEASES, None)
+
+
+__all__ = [
+    "OVERVIEW_VERSION",
+    "build_story_overview",
+    "clear_story_overview",
+    "read_story_overview",
+    "refresh_story_overviews",
+    "store_story_overview",
+]
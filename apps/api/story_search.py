@@ -0,0 +1,69 @@
+"""Story search for ``/stories?q=``.
+
+On PostgreSQL, stories carry a generated ``search_vector`` (title weighted
+above body) with a GIN index, and ``story.title`` has a ``pg_trgm`` GIN index.
+A query matches on the full-text vector, a title substring, or a fuzzy title
+word match; results are ranked by ``ts_rank_cd`` plus title word similarity
+and carry a ``ts_headline`` excerpt of the body with ``<mark>`` highlights.
+
+Other databases (sqlite in tests) keep the plain ``title ILIKE`` filter with
+no ranking or highlighting.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Float, String, func, literal, literal_column, or_
+from sqlmodel import Session
+
+from .models import Story
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=24, MinWords=8"
+# Generated by migration 0017; not mapped on ``Story`` so sqlite create_all stays valid.
+SEARCH_VECTOR = literal_column("story.search_vector")
+
+
+def full_text_enabled(session: Session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _ts_query(q: str) -> Any:
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+def story_search_filter(session: Session, q: str) -> Any:
+    if not full_text_enabled(session):
+        return Story.title.ilike(f"%{q}%")
+    return or_(
+        SEARCH_VECTOR.op("@@")(_ts_query(q)),
+        Story.title.ilike(f"%{q}%"),
+        literal(q, type_=String).op("<%")(Story.title),
+    )
+
+
+def story_search_rank(q: str) -> Any:
+    """Relevance score; PostgreSQL only."""
+
+    return func.ts_rank_cd(SEARCH_VECTOR, _ts_query(q), type_=Float) + func.word_similarity(q, Story.title, type_=Float)
+
+
+def story_search_headline(q: str) -> Any:
+    """Highlighted body excerpt; PostgreSQL only."""
+
+    return func.ts_headline(
+        SEARCH_CONFIG,
+        func.coalesce(Story.body_md, ""),
+        _ts_query(q),
+        HEADLINE_OPTIONS,
+    )
+
+
+__all__ = [
+    "SEARCH_CONFIG",
+    "full_text_enabled",
+    "story_search_filter",
+    "story_search_headline",
+    "story_search_rank",
+]
@@ -0,0 +1,219 @@
+"""MinHash/LSH near-duplicate index for story bodies.
+
+Bodies are normalized with the ingestor's ``normalize_markdown`` (which drops
+``EDIT:``/``TL;DR`` lines), split into word shingles and summarised as a
+MinHash signature. The signature is cut into ``LSH_BANDS`` bands of
+``LSH_ROWS`` rows; each band is stored as a ``StoryLshBucket`` row, so a
+lookup only compares the incoming body against stories that share at least
+one bucket instead of scanning the corpus. Candidates are confirmed with the
+exact shingle Jaccard similarity against ``STORY_NEAR_DUPLICATE_THRESHOLD``.
+
+With 32 bands of 4 rows a pair at similarity 0.7 shares a bucket with
+probability above 0.99 and a pair at 0.5 about 87% of the time, so recall
+holds for thresholds down to roughly 0.5. Changing the band layout or the
+shingle size requires ``make reindex-duplicates``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, tuple_
+from sqlmodel import Session, select
+
+from services.reddit_ingestor.normalizer import normalize_markdown
+from shared.config import settings
+
+from .models import Story, StoryLshBucket
+
+LSH_BANDS = 32
+LSH_ROWS = 4
+SIGNATURE_SLOTS = LSH_BANDS * LSH_ROWS
+MAX_CANDIDATES = 25
+_DENSIFY_OFFSET = 1 << 64
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class NearDuplicate:
+    story: Story
+    similarity: float
+
+
+@dataclass(frozen=True)
+class BodySignature:
+    shingles: frozenset[str]
+    buckets: tuple[tuple[int, str], ...]
+
+
+def shingles(text: str | None, *, size: int | None = None) -> frozenset[str]:
+    """Return the word shingles of the normalized ``text``."""
+
+    size = max(1, size or settings.STORY_NEAR_DUPLICATE_SHINGLE_SIZE)
+    words = _WORD_RE.findall(normalize_markdown(text or "").casefold())
+    if len(words) < size:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[index : index + size]) for index in range(len(words) - size + 1))
+
+
+def minhash_signature(items: frozenset[str]) -> tuple[int, ...]:
+    """Return a one-permutation MinHash signature with ``SIGNATURE_SLOTS`` slots.
+
+    Each shingle is hashed once and routed to a slot by its hash, keeping the
+    per-slot minimum, so signing a long story is linear in its shingle count.
+    Empty slots borrow the next filled slot's value, offset by distance, which
+    keeps the collision probability of each slot equal to the Jaccard
+    similarity (rotation densification).
+    """
+
+    slots: list[int | None] = [None] * SIGNATURE_SLOTS
+    for item in items:
+        value = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        slot = value % SIGNATURE_SLOTS
+        value //= SIGNATURE_SLOTS
+        current = slots[slot]
+        if current is None or value < current:
+            slots[slot] = value
+    if all(value is None for value in slots):
+        return ()
+    signature: list[int] = []
+    for slot, value in enumerate(slots):
+        distance = 0
+        while value is None:
+            distance += 1
+            value = slots[(slot + distance) % SIGNATURE_SLOTS]
+        signature.append(value + distance * _DENSIFY_OFFSET)
+    return tuple(signature)
+
+
+def lsh_buckets(signature: tuple[int, ...]) -> list[tuple[int, str]]:
+    """Return ``(band, bucket)`` pairs for a MinHash signature."""
+
+    buckets: list[tuple[int, str]] = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]
+        if len(rows) < LSH_ROWS:
+            break
+        digest = hashlib.blake2b(",".join(map(str, rows)).encode("ascii"), digest_size=8).hexdigest()
+        buckets.append((band, digest))
+    return buckets
+
+
+def jaccard(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def body_signature(body_md: str | None) -> BodySignature | None:
+    """Return the shingles and LSH buckets for ``body_md``, or ``None`` when too short."""
+
+    items = shingles(body_md)
+    if len(items) < settings.STORY_NEAR_DUPLICATE_MIN_SHINGLES:
+        return None
+    return BodySignature(shingles=items, buckets=tuple(lsh_buckets(minhash_signature(items))))
+
+
+def clear_near_duplicate_index(session: Session, story_id: int) -> None:
+    session.execute(delete(StoryLshBucket).where(StoryLshBucket.story_id == story_id))
+
+
+def index_story_signature(session: Session, story_id: int, signature: BodySignature | None) -> int:
+    """Replace the LSH buckets for ``story_id``; the caller commits."""
+
+    clear_near_duplicate_index(session, story_id)
+    if signature is None:
+        return 0
+    session.add_all(
+        StoryLshBucket(story_id=story_id, band=band, bucket=bucket) for band, bucket in signature.buckets
+    )
+    return len(signature.buckets)
+
+
+def index_story(session: Session, story: Story) -> int:
+    """Replace the LSH buckets for ``story``; the caller commits.
+
+    Returns the number of buckets written, which is zero for short bodies.
+    """
+
+    if story.id is None:
+        raise ValueError("story must be flushed before it can be indexed")
+    return index_story_signature(session, story.id, body_signature(story.body_md))
+
+
+def find_near_duplicate_story(
+    session: Session,
+    *,
+    body_md: str | None,
+    exclude_story_id: int | None = None,
+    threshold: float | None = None,
+    signature: BodySignature | None = None,
+) -> NearDuplicate | None:
+    """Return the most similar indexed story at or above ``threshold``."""
+
+    signature = signature or body_signature(body_md)
+    if signature is None:
+        return None
+    threshold = settings.STORY_NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+    query = (
+        select(StoryLshBucket.story_id)
+        .where(tuple_(StoryLshBucket.band, StoryLshBucket.bucket).in_(signature.buckets))
+        .group_by(StoryLshBucket.story_id)
+        .order_by(func.count().desc(), StoryLshBucket.story_id)
+        .limit(MAX_CANDIDATES)
+    )
+    if exclude_story_id is not None:
+        query = query.where(StoryLshBucket.story_id != exclude_story_id)
+    candidate_ids = session.exec(query).all()
+    if not candidate_ids:
+        return None
+    best: NearDuplicate | None = None
+    for story in session.exec(select(Story).where(Story.id.in_(candidate_ids)).order_by(Story.id)).all():
+        similarity = jaccard(signature.shingles, shingles(story.body_md))
+        if similarity >= threshold and (best is None or similarity > best.similarity):
+            best = NearDuplicate(story=story, similarity=similarity)
+    return best
+
+
+def rebuild_near_duplicate_index(session: Session, *, batch_size: int = 200) -> int:
+    """Re-index every story in id order, committing per batch. Returns stories indexed."""
+
+    indexed = 0
+    last_id = 0
+    while True:
+        stories = session.exec(
+            select(Story).where(Story.id > last_id).order_by(Story.id).limit(batch_size)
+        ).all()
+        if not stories:
+            return indexed
+        for story in stories:
+            index_story(session, story)
+        session.commit()
+        indexed += len(stories)
+        last_id = stories[-1].id
+
+
+__all__ = [
+    "BodySignature",
+    "NearDuplicate",
+    "body_signature",
+    "clear_near_duplicate_index",
+    "find_near_duplicate_story",
+    "index_story",
+    "index_story_signature",
+    "jaccard",
+    "lsh_buckets",
+    "minhash_signature",
+    "rebuild_near_duplicate_index",
+    "shingles",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - operational entry point
+    from .db import engine
+
+    with Session(engine) as session:
+        count = rebuild_near_duplicate_index(session)
+    print(f"indexed {count} stories")
@@ -0,0 +1,60 @@
+"""NDJSON streaming for bulk consumers of the listing endpoints.
+
+Each ``/stream`` variant walks the same order as its paged listing in batches
+of ``STREAM_BATCH_SIZE`` rows and writes one JSON document per line, serialized
+to bytes by Pydantic. Exports of a whole table therefore hold at most one batch
+in memory, and clients can process rows as they arrive.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlmodel import Session
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+
+def id_batches(
+    session: Session,
+    query: Any,
+    id_column: Any,
+    *,
+    descending: bool = True,
+    batch_size: int | None = None,
+) -> Iterator[Sequence[Any]]:
+    """Yield ``query`` rows in id keyset batches, expunging each batch after use."""
+
+    batch_size = batch_size or STREAM_BATCH_SIZE
+    last_id: int | None = None
+    while True:
+        page = query
+        if last_id is not None:
+            page = page.where(id_column < last_id if descending else id_column > last_id)
+        rows = session.exec(page.order_by(id_column.desc() if descending else id_column.asc()).limit(batch_size)).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1].id
+        session.expunge_all()
+
+
+def ndjson_response(
+    batches: Iterable[Sequence[Any]],
+    serialize: Callable[[Sequence[Any]], Iterable[BaseModel]],
+) -> StreamingResponse:
+    """Stream ``batches`` as NDJSON, converting each batch with ``serialize``."""
+
+    def lines() -> Iterator[bytes]:
+        for batch in batches:
+            yield b"".join(item.model_dump_json().encode("utf-8") + b"\n" for item in serialize(batch))
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+__all__ = ["NDJSON_MEDIA_TYPE", "STREAM_BATCH_SIZE", "id_batches", "ndjson_response"]
@@ -1,5 +1,5 @@
 import { afterEach, describe, expect, it, vi } from "vitest";
-import { adminFetch } from "./api";
+import { adminFetch, apiFetchAll, apiFetchPage } from "./api";
 
 describe("adminFetch", () => {
   afterEach(() => {
@@ -38,3 +38,37 @@ describe("adminFetch", () => {
     );
   });
 });
+
+describe("keyset pages", () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  function pageResponse(items: number[], nextCursor: string | null): Response {
+    return {
+      ok: true,
+      headers: new Headers(nextCursor ? { "X-Next-Cursor": nextCursor } : {}),
+      json: async () => items,
+    } as Response;
+  }
+
+  it("fetches a single page and hands back the next cursor", async () => {
+    const fetchMock = vi.spyOn(globalThis, "fetch").mockResolvedValue(pageResponse([3, 4], "c2"));
+
+    const page = await apiFetchPage<number>("/assets/library?q=fog", "c1");
+
+    expect(page).toEqual({ items: [3, 4], nextCursor: "c2" });
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(fetchMock.mock.calls[0][0]).toBe("/api/assets/library?q=fog&cursor=c1");
+  });
+
+  it("follows cursors until the last page", async () => {
+    const fetchMock = vi
+      .spyOn(globalThis, "fetch")
+      .mockResolvedValueOnce(pageResponse([1], "c1"))
+      .mockResolvedValueOnce(pageResponse([2], null));
+
+    await expect(apiFetchAll<number>("/jobs")).resolves.toEqual([1, 2]);
+    expect(fetchMock.mock.calls.map(([url]) => url)).toEqual(["/api/jobs", "/api/jobs?cursor=c1"]);
+  });
+});
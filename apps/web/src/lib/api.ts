@@ -1,4 +1,6 @@
-async function jsonFetch<T>(url: string, init?: RequestInit): Promise<T> {
+const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+
+async function checkedFetch(url: string, init?: RequestInit): Promise<Response> {
   const res = await fetch(url, {
     ...init,
     cache: init?.cache ?? "no-store",
@@ -13,17 +15,54 @@ async function jsonFetch<T>(url: string, init?: RequestInit): Promise<T> {
     }
     throw new Error(message);
   }
+  return res;
+}
+
+async function jsonFetch<T>(url: string, init?: RequestInit): Promise<T> {
+  const res = await checkedFetch(url, init);
   return (await res.json()) as T;
 }
 
-export async function apiFetch<T>(path: string, init?: RequestInit): Promise<T> {
+function apiUrl(path: string): string {
   if (!path.startsWith("/")) {
     throw new Error("apiFetch path must start with '/'");
   }
   const base =
     (import.meta.env.VITE_API_BASE_URL as string | undefined)?.replace(/\/$/, "") || "/api";
-  const url = base.startsWith("http") ? `${base}${path}` : `${base}${path}`;
-  return jsonFetch<T>(url, init);
+  return base.startsWith("http") ? `${base}${path}` : `${base}${path}`;
+}
+
+export async function apiFetch<T>(path: string, init?: RequestInit): Promise<T> {
+  return jsonFetch<T>(apiUrl(path), init);
+}
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// Fetch one page of a keyset-paginated listing; pass nextCursor back for the next.
+export async function apiFetchPage<T>(path: string, cursor?: string | null, init?: RequestInit): Promise<Page<T>> {
+  const separator = path.includes("?") ? "&" : "?";
+  const pagePath = cursor ? `${path}${separator}cursor=${encodeURIComponent(cursor)}` : path;
+  const res = await checkedFetch(apiUrl(pagePath), init);
+  return {
+    items: (await res.json()) as T[],
+    nextCursor: res.headers.get(NEXT_CURSOR_HEADER),
+  };
+}
+
+// Fetch every page of a keyset-paginated listing by following X-Next-Cursor.
+// Only for views that still aggregate a whole table; prefer apiFetchPage.
+export async function apiFetchAll<T>(path: string, init?: RequestInit): Promise<T[]> {
+  const rows: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await apiFetchPage<T>(path, cursor, init);
+    rows.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return rows;
 }
 
 export async function adminFetch<T>(path: string, init?: RequestInit): Promise<T> {
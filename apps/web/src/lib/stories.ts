@@ -4,7 +4,7 @@ import type {
   RenderVariant,
   StoryStatus,
 } from "@dark-life/shared-types";
-import { adminFetch, apiFetch } from "./api";
+import { adminFetch, apiFetch, apiFetchAll, apiFetchPage, type Page } from "./api";
 
 export interface Story {
   id: number;
@@ -504,7 +504,8 @@ export async function indexStoryAssets(id: number): Promise<MediaRef[]> {
 export async function listLibraryAssets(params: {
   q?: string;
   type?: string;
-} = {}): Promise<Asset[]> {
+  cursor?: string | null;
+} = {}): Promise<Page<Asset>> {
   const search = new URLSearchParams();
   if (params.q) {
     search.set("q", params.q);
@@ -513,7 +514,7 @@ export async function listLibraryAssets(params: {
     search.set("type", params.type);
   }
   const suffix = search.toString();
-  return apiFetch<Asset[]>(`/assets/library${suffix ? `?${suffix}` : ""}`);
+  return apiFetchPage<Asset>(`/assets/library${suffix ? `?${suffix}` : ""}`, params.cursor);
 }
 
 export async function createAssetBundle(
@@ -560,17 +561,19 @@ export async function createCompilation(
   });
 }
 
+// Stopgap: the jobs and release queue views count and reschedule across the
+// whole table, so these still walk every page until those views page themselves.
 export async function listJobs(params: { story_id?: number } = {}): Promise<Job[]> {
   const search = new URLSearchParams();
   if (params.story_id) {
     search.set("story_id", String(params.story_id));
   }
   const qs = search.toString();
-  return apiFetch<Job[]>(`/jobs${qs ? `?${qs}` : ""}`);
+  return apiFetchAll<Job>(`/jobs${qs ? `?${qs}` : ""}`);
 }
 
 export async function listReleaseQueue(): Promise<Release[]> {
-  return apiFetch<Release[]>("/releases/queue");
+  return apiFetchAll<Release>("/releases/queue");
 }
 
 export async function listInsightsReleases(days = 30): Promise<Release[]> {
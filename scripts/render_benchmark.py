@@ -0,0 +1,379 @@
+"""Offline renderer benchmark using synthetic ffmpeg fixtures.
+
+Generates test-pattern visuals, a sine/noise voice track and a music bed with
+``lavfi``, then times the renderer stages that normally need real assets, API
+keys and a database:
+
+* ``compile_short`` – ``compile_short_render`` planning only
+* ``short_image`` / ``short_video`` – ``run_commands`` over compiled plans
+* ``subtitles`` – ``subtitles.generate_result`` (synthetic transcriber unless
+  faster-whisper is installed and ``--real-whisper`` is passed)
+* ``tts_concat`` – XTTS chunk concatenation
+* ``compilation`` – ``render_compilation_job`` over the rendered shorts
+
+Each stage reports wall time, CPU time (this process plus ffmpeg children),
+its own peak RSS and bytes written as JSON. The peak covers the ffmpeg and
+ffprobe processes the stage ran, read from ``os.wait4`` as each is reaped,
+and this process, whose ``VmHWM`` is reset at the start of every stage.
+A child's figure starts from this process's RSS when it was spawned, which
+never exceeds the process's own peak for the stage. Resetting needs Linux's
+``/proc/self/clear_refs``; elsewhere only children are counted. Passing ``--baseline`` compares wall time against a previous
+report and exits non-zero when any stage regresses by more than
+``--threshold``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+import typer
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.renderer import subtitles, tts  # noqa: E402
+from services.renderer.compiler import RenderInput, compile_short_render  # noqa: E402
+from services.renderer.executor import run_commands  # noqa: E402
+from services.renderer.pipeline import render_compilation_job  # noqa: E402
+from shared.config import settings  # noqa: E402
+
+APP = typer.Typer(add_completion=False)
+
+SHORT_PRESET = {"slug": "short-form", "width": 1080, "height": 1920, "fps": 30, "music_gain_db": -3.0, "ducking_db": -12.0}
+WEEKLY_PRESET = {"slug": "weekly-full", "width": 1920, "height": 1080, "fps": 30}
+
+
+@dataclass
+class StageResult:
+    name: str
+    wall_ms: int
+    cpu_ms: int
+    peak_rss_kb: int
+    bytes_written: int
+
+
+def _ffmpeg(*args: str) -> None:
+    subprocess.run(["ffmpeg", "-v", "error", "-y", *args], check=True)
+
+
+def _dir_bytes(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _reset_own_peak_rss() -> bool:
+    try:
+        Path("/proc/self/clear_refs").write_text("5", encoding="ascii")
+    except OSError:
+        return False
+    return True
+
+
+def _own_peak_rss_kb() -> int:
+    for line in Path("/proc/self/status").read_text(encoding="ascii").splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+    return 0
+
+
+@contextmanager
+def _child_peak_rss() -> Iterator[list[int]]:
+    """Collect ``ru_maxrss`` of every child reaped inside the block.
+
+    ``subprocess`` reaps through ``os.waitpid``; ``os.wait4`` does the same
+    and also returns the child's resource usage.
+    """
+
+    peaks: list[int] = []
+    waitpid = os.waitpid
+
+    def wait4(pid: int, options: int) -> tuple[int, int]:
+        reaped, status, usage = os.wait4(pid, options)
+        if reaped:
+            peaks.append(usage.ru_maxrss)
+        return reaped, status
+
+    os.waitpid = wait4
+    try:
+        yield peaks
+    finally:
+        os.waitpid = waitpid
+
+
+@contextmanager
+def _stage(name: str, results: list[StageResult], output_dir: Path) -> Iterator[None]:
+    bytes_before = _dir_bytes(output_dir)
+    cpu_before = _cpu_seconds()
+    own_tracked = _reset_own_peak_rss()
+    started = time.perf_counter()
+    with _child_peak_rss() as child_peaks:
+        yield
+    results.append(
+        StageResult(
+            name=name,
+            wall_ms=int((time.perf_counter() - started) * 1000),
+            cpu_ms=int((_cpu_seconds() - cpu_before) * 1000),
+            peak_rss_kb=max([*child_peaks, _own_peak_rss_kb() if own_tracked else 0]),
+            bytes_written=max(_dir_bytes(output_dir) - bytes_before, 0),
+        )
+    )
+
+
+def _make_fixtures(fixtures: Path, *, duration_sec: float, chunks: int) -> dict[str, Path]:
+    fixtures.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "image": fixtures / "testsrc.png",
+        "video": fixtures / "testsrc.mp4",
+        "voice": fixtures / "vo.wav",
+        "music": fixtures / "music.mp3",
+    }
+    _ffmpeg("-f", "lavfi", "-i", "testsrc2=s=1280x720", "-frames:v", "1", str(paths["image"]))
+    _ffmpeg("-f", "lavfi", "-i", "testsrc2=s=1280x720:r=30:d=5", "-pix_fmt", "yuv420p", str(paths["video"]))
+    _ffmpeg(
+        "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=44100:duration={duration_sec}",
+        "-f", "lavfi", "-i", f"anoisesrc=color=pink:amplitude=0.05:sample_rate=44100:duration={duration_sec}",
+        "-filter_complex", "[0:a][1:a]amix=inputs=2:duration=first[out]",
+        "-map", "[out]", "-ac", "1", "-c:a", "pcm_s16le", str(paths["voice"]),
+    )
+    _ffmpeg(
+        "-f", "lavfi", "-i", f"sine=frequency=880:duration={duration_sec * 2}",
+        "-c:a", "libmp3lame", "-q:a", "9", str(paths["music"]),
+    )
+    chunk_sec = max(duration_sec / max(chunks, 1), 0.5)
+    for index in range(chunks):
+        _ffmpeg(
+            "-f", "lavfi", "-i", f"sine=frequency={300 + index * 40}:sample_rate=24000:duration={chunk_sec}",
+            "-c:a", "pcm_s16le", str(fixtures / f"chunk-{index}.wav"),
+        )
+    return paths
+
+
+def _render_input(
+    paths: dict[str, Path],
+    *,
+    job_id: int,
+    part_id: int,
+    visual: Path,
+    subtitle_path: Path,
+    output_root: Path,
+    job_dir: Path,
+    duration_ms: int,
+    burn: bool,
+) -> RenderInput:
+    return RenderInput(
+        job_id=job_id,
+        story_id=1,
+        part_id=part_id,
+        correlation_id=f"bench-{job_id}",
+        voice_path=paths["voice"],
+        subtitle_path=subtitle_path,
+        visual_path=visual,
+        music_path=paths["music"],
+        output_root=output_root,
+        job_dir=job_dir,
+        duration_ms=duration_ms,
+        subtitle_format="srt",
+        asset={"key": f"bench:{visual.name}", "type": "image" if visual.suffix == ".png" else "video"},
+        preset=SHORT_PRESET,
+        burn_subtitles=burn,
+        music_policy="first",
+    )
+
+
+class _SyntheticWhisper:
+    """Stand-in transcriber that emits evenly spaced segments."""
+
+    def __init__(self, *_args, **_kwargs) -> None:
+        pass
+
+    def transcribe(self, path: str):
+        duration = subtitles._probe_duration_ms(Path(path)) / 1000.0
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(start + 1.7, duration)
+            segments.append(subtitles.Segment(start, end, "the fog rolled in over the empty road"))
+            start = end
+        return segments, None
+
+
+def compare_to_baseline(current: dict, baseline: dict, *, threshold: float) -> list[str]:
+    """Return stages whose wall time exceeds the baseline by more than ``threshold``."""
+
+    previous = {stage["name"]: stage for stage in baseline.get("stages", [])}
+    regressions: list[str] = []
+    for stage in current.get("stages", []):
+        before = previous.get(stage["name"])
+        if not before or before["wall_ms"] <= 0:
+            continue
+        ratio = stage["wall_ms"] / before["wall_ms"]
+        if ratio > 1.0 + threshold:
+            regressions.append(f"{stage['name']}: {before['wall_ms']}ms -> {stage['wall_ms']}ms ({ratio:.2f}x)")
+    return regressions
+
+
+def run_benchmark(
+    workdir: Path,
+    *,
+    duration_sec: float = 20.0,
+    parts: int = 2,
+    burn: bool = True,
+    tts_chunks: int = 6,
+    real_whisper: bool = False,
+) -> dict:
+    fixtures = workdir / "fixtures"
+    output_dir = workdir / "output"
+    tmp_dir = workdir / "tmp"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    settings.OUTPUT_DIR = output_dir
+    settings.TMP_DIR = tmp_dir
+    settings.SUBTITLES_FORMAT = "srt"
+    settings.SUBTITLES_BURN_IN = False
+    settings.WHISPER_PROVIDER = "local"
+
+    results: list[StageResult] = []
+    with _stage("fixtures", results, fixtures):
+        paths = _make_fixtures(fixtures, duration_sec=duration_sec, chunks=tts_chunks)
+    duration_ms = int(duration_sec * 1000)
+
+    job_dir = tmp_dir / "1"
+    job_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(paths["voice"], job_dir / "vo.wav")
+    if not real_whisper or subtitles.WhisperModel is None:
+        subtitles.WhisperModel = _SyntheticWhisper  # type: ignore[assignment]
+    with _stage("subtitles", results, tmp_dir):
+        subtitle = subtitles.generate_result(job_id=1, part_id=1)
+
+    with _stage("tts_concat", results, tmp_dir):
+        chunk_paths = sorted(fixtures.glob("chunk-*.wav"))
+        tts._concat_wavs(chunk_paths, tmp_dir / "tts-concat.wav")
+
+    plans = []
+    with _stage("compile_short", results, output_dir):
+        for index in range(parts):
+            visual = paths["image"] if index % 2 == 0 else paths["video"]
+            plans.append(
+                compile_short_render(
+                    _render_input(
+                        paths,
+                        job_id=100 + index,
+                        part_id=index + 1,
+                        visual=visual,
+                        subtitle_path=subtitle.path,
+                        output_root=output_dir / "shorts" / str(index + 1),
+                        job_dir=tmp_dir / f"short-{index + 1}",
+                        duration_ms=duration_ms,
+                        burn=burn,
+                    )
+                )
+            )
+
+    for index, plan in enumerate(plans):
+        plan.artifacts.video_path.parent.mkdir(parents=True, exist_ok=True)
+        (tmp_dir / f"short-{index + 1}").mkdir(parents=True, exist_ok=True)
+        stage_name = "short_image" if index % 2 == 0 else "short_video"
+        if index > 1:
+            stage_name = f"{stage_name}_{index + 1}"
+        with _stage(stage_name, results, output_dir):
+            run_commands(plan.commands, timeout_sec=settings.JOB_TIMEOUT_SEC)
+
+    context = {
+        "job": {"id": 900, "kind": "render_compilation"},
+        "story": {"id": 1},
+        "compilation": {"id": 1},
+        "render_preset": WEEKLY_PRESET,
+        "parts": [{"id": index + 1, "index": index + 1} for index in range(parts)],
+        "artifacts": [
+            {
+                "variant": "short",
+                "story_part_id": index + 1,
+                "video_path": str(plan.artifacts.video_path),
+            }
+            for index, plan in enumerate(plans)
+        ],
+    }
+    with _stage("compilation", results, output_dir):
+        render_compilation_job(context)
+
+    return {
+        "config": {
+            "duration_sec": duration_sec,
+            "parts": parts,
+            "burn_subtitles": burn,
+            "tts_chunks": tts_chunks,
+            "short_preset": SHORT_PRESET,
+            "weekly_preset": WEEKLY_PRESET,
+        },
+        "stages": [asdict(result) for result in results],
+        "total_wall_ms": sum(result.wall_ms for result in results if result.name != "fixtures"),
+    }
+
+
+@APP.command()
+def run(
+    duration_sec: float = typer.Option(20.0, help="Voice duration for each synthetic short"),
+    parts: int = typer.Option(2, help="Number of shorts rendered and concatenated"),
+    burn: bool = typer.Option(True, help="Burn subtitles into the shorts"),
+    tts_chunks: int = typer.Option(6, help="Number of WAV chunks concatenated in the TTS stage"),
+    real_whisper: bool = typer.Option(False, help="Use faster-whisper when installed instead of the synthetic transcriber"),
+    output: Path | None = typer.Option(None, help="Write the JSON report to this path"),
+    baseline: Path | None = typer.Option(None, help="Previous JSON report to compare wall times against"),
+    threshold: float = typer.Option(0.15, help="Allowed fractional wall-time regression per stage"),
+    workdir: Path | None = typer.Option(None, help="Working directory; a temporary one is used by default"),
+) -> None:
+    """Run the offline renderer benchmark and print a JSON report."""
+
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        typer.echo("ffmpeg and ffprobe are required", err=True)
+        raise typer.Exit(code=2)
+    root = workdir or Path(tempfile.mkdtemp(prefix="render-bench-"))
+    try:
+        report = run_benchmark(
+            root,
+            duration_sec=duration_sec,
+            parts=parts,
+            burn=burn,
+            tts_chunks=tts_chunks,
+            real_whisper=real_whisper,
+        )
+    finally:
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+    rendered = json.dumps(report, indent=2)
+    if output:
+        output.write_text(rendered + "\n", encoding="utf-8")
+    typer.echo(rendered)
+    if baseline:
+        regressions = compare_to_baseline(
+            report,
+            json.loads(baseline.read_text(encoding="utf-8")),
+            threshold=threshold,
+        )
+        if regressions:
+            for line in regressions:
+                typer.echo(f"regression: {line}", err=True)
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    APP()
@@ -1,8 +1,8 @@
 """Incremental fetching utilities for new Reddit posts.
 
 This module no longer touches the database directly.  Fetch state is persisted
-through the API's ``/admin/reddit/state`` endpoint and stories are created via
-``/admin/stories``.
+through the API's ``/admin/reddit/state`` endpoint and stories are created in
+batches via ``/admin/stories/bulk``.
 """
 
 from __future__ import annotations
@@ -26,11 +26,12 @@ from .monitoring import (
 from .normalizer import normalize_post
 from .media import extract_image_urls
 from .events import push_new_story
-from .storage import insert_post
+from .storage import insert_posts
 from shared.config import settings
 
 logger = logging.getLogger(__name__)
 MIN_UPVOTES = int(os.getenv("REDDIT_MIN_UPVOTES", "0"))
+BULK_BATCH_SIZE = 100
 
 
 def _auth_headers() -> Dict[str, str]:
@@ -100,6 +101,7 @@ def _process_posts(subreddit: str, posts: List[dict]) -> Tuple[int, Optional[str
     rejected = 0
     newest_fullname: Optional[str] = None
     newest_dt: Optional[datetime] = None
+    pending: List[dict] = []
 
     for post in posts:
         created_dt = datetime.fromtimestamp(int(post.get("created_utc", 0)), tz=timezone.utc)
@@ -127,14 +129,20 @@ def _process_posts(subreddit: str, posts: List[dict]) -> Tuple[int, Optional[str
             "hash_title_body": normalized.hash_title_body,
             "image_urls": extract_image_urls(post),
         }
-        if insert_post(payload):
+        pending.append(payload)
+
+    for offset in range(0, len(pending), BULK_BATCH_SIZE):
+        batch = pending[offset : offset + BULK_BATCH_SIZE]
+        for payload, stored in zip(batch, insert_posts(batch)):
+            if not stored:
+                duplicates += 1
+                continue
             inserted += 1
             push_new_story(payload)
+            created_dt = payload["created_utc"]
             if newest_dt is None or created_dt > newest_dt:
                 newest_dt = created_dt
-                newest_fullname = fullname
-        else:
-            duplicates += 1
+                newest_fullname = payload["reddit_id"]
 
     if inserted and newest_fullname and newest_dt:
         _update_fetch_state(subreddit, newest_fullname, newest_dt)
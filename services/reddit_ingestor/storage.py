@@ -2,14 +2,14 @@ from __future__ import annotations
 
 """API-based persistence helpers for the Reddit ingestion service.
 
-This module exposes a single ``insert_post`` function which translates a
-normalized Reddit payload into the API's ``StoryIn`` schema and POSTs it to the
-``/admin/stories`` endpoint.  Database access has been removed; callers are
+This module exposes ``insert_post`` and ``insert_posts``, which translate
+normalized Reddit payloads into the API's ``StoryIn`` schema and POST them to
+``/admin/stories`` and ``/admin/stories/bulk`` respectively.  Database access has been removed; callers are
 expected to interact solely with the HTTP API.
 """
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import random
 import time
@@ -18,17 +18,8 @@ import requests
 from shared.config import settings
 
 
-def insert_post(payload: Dict[str, Any]) -> bool:
-    """Persist a Reddit post via the API.
-
-    Returns ``True`` when the story was created/updated and ``False`` when the
-    API reports a duplicate (HTTP 409).
-    """
-
-    if not settings.API_BASE_URL:
-        raise RuntimeError("API_BASE_URL must be configured for ingestion")
-
-    story = {
+def _story_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "external_id": payload["reddit_id"],
         "source": "reddit",
         "subreddit": payload.get("subreddit"),
@@ -44,18 +35,21 @@ def insert_post(payload: Dict[str, Any]) -> bool:
         "tags": None,
     }
 
+
+def _post_with_retry(path: str, body: Any) -> requests.Response:
+    """POST ``body`` to the API, retrying 429 and 5xx responses."""
+
+    if not settings.API_BASE_URL:
+        raise RuntimeError("API_BASE_URL must be configured for ingestion")
+
     headers: Dict[str, str] = {}
     if settings.API_AUTH_TOKEN:
         headers["Authorization"] = f"Bearer {settings.API_AUTH_TOKEN}"
 
-    url = f"{settings.API_BASE_URL.rstrip('/')}/admin/stories"
+    url = f"{settings.API_BASE_URL.rstrip('/')}{path}"
 
     for attempt in range(3):
-        resp = requests.post(url, json=story, headers=headers, timeout=10)
-        if resp.status_code in (200, 201):
-            return True
-        if resp.status_code == 409:
-            return False
+        resp = requests.post(url, json=body, headers=headers, timeout=10)
         if resp.status_code in (429,) or resp.status_code >= 500:
             retry_after = resp.headers.get("Retry-After")
             if retry_after is not None:
@@ -68,9 +62,39 @@ def insert_post(payload: Dict[str, Any]) -> bool:
                 delay += random.uniform(0, 1)
             time.sleep(delay)
             continue
-        resp.raise_for_status()
+        return resp
+    return resp
+
+
+def insert_post(payload: Dict[str, Any]) -> bool:
+    """Persist a Reddit post via the API.
+
+    Returns ``True`` when the story was created/updated and ``False`` when the
+    API reports a duplicate (HTTP 409).
+    """
+
+    resp = _post_with_retry("/admin/stories", _story_payload(payload))
+    if resp.status_code in (200, 201):
+        return True
+    if resp.status_code == 409:
+        return False
     resp.raise_for_status()
     return False
 
 
-__all__ = ["insert_post"]
+def insert_posts(payloads: List[Dict[str, Any]]) -> List[bool]:
+    """Persist a batch of Reddit posts through ``/admin/stories/bulk``.
+
+    Returns one flag per payload, in order: ``True`` when the story was
+    created or updated and ``False`` when the API reports a duplicate.
+    """
+
+    if not payloads:
+        return []
+    resp = _post_with_retry("/admin/stories/bulk", [_story_payload(payload) for payload in payloads])
+    resp.raise_for_status()
+    results = sorted(resp.json(), key=lambda result: result["index"])
+    return [result["status"] in ("created", "updated") for result in results]
+
+
+__all__ = ["insert_post", "insert_posts"]
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import copy
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 
@@ -9,6 +12,10 @@ import requests
 
 from shared.config import settings
 
+CONTEXT_CACHE_SIZE = 64
+_context_cache: OrderedDict[tuple[int, str], tuple[str, dict[str, Any]]] = OrderedDict()
+_context_cache_lock = threading.Lock()
+
 
 def auth_headers() -> dict[str, str]:
     if settings.API_AUTH_TOKEN:
@@ -60,14 +67,33 @@ class RenderApiClient:
         )
         return self._raise_or_json(resp)
 
-    def get_context(self, job_id: int) -> dict[str, Any]:
+    def get_context(self, job_id: int, *, profile: str = "full") -> dict[str, Any]:
+        """Fetch a job context, revalidating a cached copy by ETag on retries."""
+
+        key = (job_id, profile)
+        headers = auth_headers()
+        with _context_cache_lock:
+            cached = _context_cache.get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
         resp = self.session.get(
             f"{self.base_url}/render-jobs/{job_id}/context",
+            params={"profile": profile},
             timeout=30,
-            headers=auth_headers(),
+            headers=headers,
         )
+        if cached and resp.status_code == 304:
+            return copy.deepcopy(cached[1])
         resp.raise_for_status()
-        return resp.json()
+        context = resp.json()
+        etag = (getattr(resp, "headers", None) or {}).get("ETag")
+        if etag:
+            with _context_cache_lock:
+                _context_cache[key] = (etag, context)
+                _context_cache.move_to_end(key)
+                while len(_context_cache) > CONTEXT_CACHE_SIZE:
+                    _context_cache.popitem(last=False)
+        return context
 
     @staticmethod
     def _raise_or_json(resp: Any) -> dict[str, Any]:
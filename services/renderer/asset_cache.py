@@ -10,6 +10,7 @@ from urllib.parse import urlparse
 
 import requests
 
+from shared import pixabay
 from shared.config import settings
 
 
@@ -33,23 +34,11 @@ def _suffix_for_asset(asset: dict, response: requests.Response | None = None) ->
     return ".mp4" if asset.get("type") == "video" else ".jpg"
 
 
-def _resolve_pixabay_remote_url(provider_id: str) -> str | None:
-    if not settings.PIXABAY_API_KEY:
+def _resolve_pixabay_remote_url(provider_id: str, *, stale_url: str | None = None) -> str | None:
+    if not pixabay.provider_ready():
         return None
-    response = requests.get(
-        "https://pixabay.com/api/",
-        params={
-            "key": settings.PIXABAY_API_KEY,
-            "id": provider_id,
-        },
-        timeout=12,
-    )
-    response.raise_for_status()
-    payload = response.json()
-    hit = next(iter(payload.get("hits", [])), None)
-    if not isinstance(hit, dict):
-        return None
-    return hit.get("webformatURL") or hit.get("largeImageURL")
+    hit = pixabay.lookup_image(provider_id, stale_url=stale_url)
+    return pixabay.hit_url(hit) if hit is not None else None
 
 
 def materialize_asset(
@@ -80,7 +69,7 @@ def materialize_asset(
         provider_id = str(asset.get("provider_id") or "")
         if provider != "pixabay" or not provider_id:
             raise
-        refreshed_url = _resolve_pixabay_remote_url(provider_id)
+        refreshed_url = _resolve_pixabay_remote_url(provider_id, stale_url=remote_url)
         if not refreshed_url or refreshed_url == remote_url:
             raise
         remote_url = refreshed_url
@@ -1,10 +1,14 @@
 from .models import ArtifactSpec, CommandSpec, RenderInput, RenderPlan
+from .profiles import PLATFORM_PROFILES, PlatformProfile, resolve_profiles
 from .short import compile_short_render
 
 __all__ = [
     "ArtifactSpec",
     "CommandSpec",
+    "PLATFORM_PROFILES",
+    "PlatformProfile",
     "RenderInput",
     "RenderPlan",
     "compile_short_render",
+    "resolve_profiles",
 ]
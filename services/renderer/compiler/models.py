@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from .profiles import PlatformProfile
+
 
 @dataclass(frozen=True)
 class CommandSpec:
@@ -22,6 +24,9 @@ class ArtifactSpec:
     subtitle_path: Path
     mixed_audio_path: Path | None = None
     staged_visual_path: Path | None = None
+    proxy_path: Path | None = None
+    contact_sheet_path: Path | None = None
+    platform_paths: dict[str, Path] = field(default_factory=dict)
 
 
 @dataclass(frozen=True)
@@ -42,6 +47,10 @@ class RenderInput:
     preset: dict
     burn_subtitles: bool
     music_policy: str | None = None
+    previews: bool = False
+    music_normalized: bool = False
+    quality_tier: str = "final"
+    platform_profiles: tuple[PlatformProfile, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,56 @@
+"""Per-platform delivery encode profiles for the short output ladder."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PlatformProfile:
+    name: str
+    video_bitrate: str
+    max_video_bitrate: str
+    audio_bitrate: str = "192k"
+    loudness_lufs: float | None = None
+    true_peak_db: float = -1.5
+    faststart: bool = True
+
+
+PLATFORM_PROFILES: dict[str, PlatformProfile] = {
+    "youtube": PlatformProfile(
+        name="youtube",
+        video_bitrate="8M",
+        max_video_bitrate="12M",
+        audio_bitrate="192k",
+        loudness_lufs=-14.0,
+    ),
+    "instagram": PlatformProfile(
+        name="instagram",
+        video_bitrate="5M",
+        max_video_bitrate="6M",
+        audio_bitrate="128k",
+        loudness_lufs=-14.0,
+    ),
+    "tiktok": PlatformProfile(
+        name="tiktok",
+        video_bitrate="4M",
+        max_video_bitrate="5M",
+        audio_bitrate="128k",
+        loudness_lufs=-14.0,
+    ),
+}
+
+
+def resolve_profiles(platforms: list[str] | None, enabled: list[str]) -> tuple[PlatformProfile, ...]:
+    """Return known profiles for ``platforms`` that are enabled for the ladder."""
+
+    allowed = {name.lower() for name in enabled}
+    resolved: list[PlatformProfile] = []
+    for platform in dict.fromkeys(name.lower() for name in platforms or []):
+        profile = PLATFORM_PROFILES.get(platform)
+        if profile and platform in allowed:
+            resolved.append(profile)
+    return tuple(resolved)
+
+
+__all__ = ["PLATFORM_PROFILES", "PlatformProfile", "resolve_profiles"]
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
 
 from shared.config import settings
 
 from ..ffmpeg import background_filter
 from .models import ArtifactSpec, CommandSpec, RenderInput, RenderPlan
+from .profiles import PlatformProfile
 
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+DRAFT_TIER = "draft"
+CONTACT_SHEET_COLUMNS = 6
+CONTACT_SHEET_TILE_WIDTH = 180
 
 
 def _scale_filter(preset: dict, *, duration_sec: float) -> str:
@@ -19,6 +24,202 @@ def _scale_filter(preset: dict, *, duration_sec: float) -> str:
     return background_filter(width, height, duration_sec=duration_sec)
 
 
+def _even(value: float) -> int:
+    return max(int(value) // 2 * 2, 2)
+
+
+def _tier_preset(render_input: RenderInput) -> dict:
+    """Return the preset scaled down for draft-tier renders."""
+
+    if render_input.quality_tier != DRAFT_TIER:
+        return render_input.preset
+    scale = float(settings.RENDER_DRAFT_SCALE)
+    return {
+        **render_input.preset,
+        "width": _even(int(render_input.preset["width"]) * scale),
+        "height": _even(int(render_input.preset["height"]) * scale),
+        "fps": min(int(render_input.preset["fps"]), int(settings.RENDER_DRAFT_FPS)),
+    }
+
+
+def _encoder_args(render_input: RenderInput) -> list[str]:
+    if render_input.quality_tier != DRAFT_TIER:
+        return []
+    return ["-preset", "ultrafast"]
+
+
+def _proxy_filter() -> str:
+    return f"scale=-2:{int(settings.RENDER_PREVIEW_HEIGHT)}"
+
+
+def _contact_sheet_filter(*, duration_sec: float) -> str:
+    frames = max(int(settings.RENDER_PREVIEW_CONTACT_SHEET_FRAMES), 1)
+    columns = min(frames, CONTACT_SHEET_COLUMNS)
+    rows = -(-frames // columns)
+    return (
+        f"fps={frames / duration_sec:.6f},"
+        f"scale={CONTACT_SHEET_TILE_WIDTH}:-2,"
+        f"tile={columns}x{rows}"
+    )
+
+
+def _proxy_output_args(*, video_map: str, audio_map: str, proxy_path: Path) -> list[str]:
+    bitrate = settings.RENDER_PREVIEW_VIDEO_BITRATE
+    return [
+        "-map",
+        video_map,
+        "-map",
+        audio_map,
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-b:v",
+        bitrate,
+        "-maxrate",
+        bitrate,
+        "-bufsize",
+        bitrate,
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-b:a",
+        "64k",
+        "-ac",
+        "2",
+        "-shortest",
+        "-movflags",
+        "+faststart",
+        str(proxy_path),
+    ]
+
+
+def _contact_sheet_output_args(*, video_map: str, contact_sheet_path: Path) -> list[str]:
+    return [
+        "-map",
+        video_map,
+        "-frames:v",
+        "1",
+        "-update",
+        "1",
+        str(contact_sheet_path),
+    ]
+
+
+def _platform_output_args(
+    profile: PlatformProfile,
+    *,
+    video_map: str,
+    audio_map: str,
+    output_path: Path,
+    encoder_args: list[str],
+) -> list[str]:
+    return [
+        "-map",
+        video_map,
+        "-map",
+        audio_map,
+        "-c:v",
+        "libx264",
+        *encoder_args,
+        "-b:v",
+        profile.video_bitrate,
+        "-maxrate",
+        profile.max_video_bitrate,
+        "-bufsize",
+        profile.max_video_bitrate,
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-b:a",
+        profile.audio_bitrate,
+        "-ac",
+        "2",
+        "-ar",
+        "48000",
+        "-shortest",
+        *(["-movflags", "+faststart"] if profile.faststart else []),
+        str(output_path),
+    ]
+
+
+@dataclass(frozen=True)
+class _Fanout:
+    filter_complex: str
+    output_args: list[str]
+    expected_outputs: list[str]
+
+
+def _compile_fanout(
+    render_input: RenderInput,
+    *,
+    video_in: str,
+    audio_in: str,
+    source_filter: str | None,
+    include_main: bool,
+    proxy_path: Path | None,
+    contact_sheet_path: Path | None,
+    platform_paths: dict[str, Path],
+    duration_sec: float,
+    encoder_args: list[str],
+) -> _Fanout:
+    """Split one decoded video/audio pass into previews and platform encodes.
+
+    When ``include_main`` is set the ``[main]`` pad carries ``source_filter``
+    output for the caller's primary encode.
+    """
+
+    profiles = [profile for profile in render_input.platform_profiles if profile.name in platform_paths]
+    video_pads = ["main"] if include_main else []
+    if proxy_path and contact_sheet_path:
+        video_pads += ["proxy", "sheet"]
+    video_pads += [f"v_{profile.name}" for profile in profiles]
+
+    chain = f"{source_filter}," if source_filter else ""
+    if len(video_pads) == 1:
+        graph = [f"[{video_in}]{source_filter or 'null'}[{video_pads[0]}]"]
+    else:
+        graph = [f"[{video_in}]{chain}split={len(video_pads)}" + "".join(f"[{pad}]" for pad in video_pads)]
+
+    output_args: list[str] = []
+    expected: list[str] = []
+    audio_map = f"{audio_in}:0"
+    if proxy_path and contact_sheet_path:
+        graph.append(f"[proxy]{_proxy_filter()}[proxyv]")
+        graph.append(f"[sheet]{_contact_sheet_filter(duration_sec=duration_sec)}[sheetv]")
+        output_args += _proxy_output_args(video_map="[proxyv]", audio_map=audio_map, proxy_path=proxy_path)
+        output_args += _contact_sheet_output_args(video_map="[sheetv]", contact_sheet_path=contact_sheet_path)
+        expected += [str(proxy_path), str(contact_sheet_path)]
+
+    loud_profiles = [profile for profile in profiles if profile.loudness_lufs is not None]
+    if len(loud_profiles) > 1:
+        graph.append(
+            f"[{audio_in}]asplit={len(loud_profiles)}"
+            + "".join(f"[a_{profile.name}_src]" for profile in loud_profiles)
+        )
+    for profile in loud_profiles:
+        source = f"a_{profile.name}_src" if len(loud_profiles) > 1 else audio_in
+        graph.append(
+            f"[{source}]loudnorm=I={profile.loudness_lufs}:TP={profile.true_peak_db}:LRA=11,"
+            f"aresample=48000[a_{profile.name}]"
+        )
+
+    for profile in profiles:
+        output_path = platform_paths[profile.name]
+        output_args += _platform_output_args(
+            profile,
+            video_map=f"[v_{profile.name}]",
+            audio_map=f"[a_{profile.name}]" if profile.loudness_lufs is not None else audio_map,
+            output_path=output_path,
+            encoder_args=encoder_args,
+        )
+        expected.append(str(output_path))
+
+    return _Fanout(filter_complex=";".join(graph), output_args=output_args, expected_outputs=expected)
+
+
 def compile_short_render(render_input: RenderInput) -> RenderPlan:
     output_root = render_input.output_root
     background_path = render_input.job_dir / "background.mp4"
@@ -26,19 +227,33 @@ def compile_short_render(render_input: RenderInput) -> RenderPlan:
     muxed_path = render_input.job_dir / "muxed.mp4"
     final_video_path = output_root / "video.mp4"
     final_subtitle_path = output_root / f"subtitles.{render_input.subtitle_format}"
+    proxy_path = output_root / "proxy.mp4" if render_input.previews else None
+    contact_sheet_path = output_root / "contact_sheet.jpg" if render_input.previews else None
+    platform_paths = {
+        profile.name: output_root / f"video.{profile.name}.mp4"
+        for profile in render_input.platform_profiles
+    }
     duration_sec = max(render_input.duration_ms / 1000.0, 1.0)
-    vf = _scale_filter(render_input.preset, duration_sec=duration_sec)
-    fps = str(int(render_input.preset["fps"]))
+    preset = _tier_preset(render_input)
+    encoder_args = _encoder_args(render_input)
+    vf = _scale_filter(preset, duration_sec=duration_sec)
+    fps = str(int(preset["fps"]))
     commands: list[CommandSpec] = []
 
     if render_input.music_path:
         music_gain_db = float(render_input.preset.get("music_gain_db", settings.MUSIC_GAIN_DB))
         ducking_db = abs(float(render_input.preset.get("ducking_db", settings.DUCKING_DB)))
         threshold = 0.000976563
+        # Indexed beds are already stereo and loudness-normalized.
+        music_chain = (
+            f"volume={music_gain_db}dB"
+            if render_input.music_normalized
+            else f"aformat=channel_layouts=stereo,volume={music_gain_db}dB"
+        )
         filter_complex = (
-            "[0:a]pan=stereo|c0=c0|c1=c0[vo];"
-            f"[1:a]aformat=channel_layouts=stereo,volume={music_gain_db}dB[m];"
-            f"[m][vo]sidechaincompress=threshold={threshold}:ratio=20:attack=5:release=50:makeup={ducking_db}[d];"
+            "[0:a]pan=stereo|c0=c0|c1=c0,asplit=2[vo][key];"
+            f"[1:a]{music_chain}[m];"
+            f"[m][key]sidechaincompress=threshold={threshold}:ratio=20:attack=5:release=50:makeup={ducking_db}[d];"
             "[vo][d]amix=inputs=2:duration=first:dropout_transition=2,volume=-1dB,"
             "aformat=channel_layouts=stereo[out]"
         )
@@ -50,6 +265,8 @@ def compile_short_render(render_input: RenderInput) -> RenderPlan:
                     "-y",
                     "-i",
                     str(render_input.voice_path),
+                    "-t",
+                    f"{duration_sec:.3f}",
                     "-i",
                     str(render_input.music_path),
                     "-filter_complex",
@@ -77,6 +294,7 @@ def compile_short_render(render_input: RenderInput) -> RenderPlan:
             f"{duration_sec:.3f}",
             "-r",
             fps,
+            *encoder_args,
             "-pix_fmt",
             "yuv420p",
             str(background_path),
@@ -95,6 +313,7 @@ def compile_short_render(render_input: RenderInput) -> RenderPlan:
             "-r",
             fps,
             "-an",
+            *encoder_args,
             "-pix_fmt",
             "yuv420p",
             str(background_path),
@@ -110,49 +329,105 @@ def compile_short_render(render_input: RenderInput) -> RenderPlan:
 
     audio_path = mixed_audio_path if render_input.music_path else render_input.voice_path
     mux_output = muxed_path if render_input.burn_subtitles else final_video_path
+    mux_inputs = ["-y", "-i", str(background_path), "-i", str(audio_path)]
+    mux_filter: list[str] = []
+    mux_output_args = [
+        "-map",
+        "0:v:0",
+        "-map",
+        "1:a:0",
+        "-c:v",
+        "copy",
+        "-c:a",
+        "aac",
+        "-ac",
+        "2",
+        "-shortest",
+        str(mux_output),
+    ]
+    mux_expected = [str(mux_output)]
+    has_fanout = bool(proxy_path or platform_paths)
+    if has_fanout and not render_input.burn_subtitles:
+        # The final output is a stream copy, so previews and platform encodes
+        # decode the staged background once inside the same ffmpeg invocation.
+        fanout = _compile_fanout(
+            render_input,
+            video_in="0:v",
+            audio_in="1:a",
+            source_filter=None,
+            include_main=False,
+            proxy_path=proxy_path,
+            contact_sheet_path=contact_sheet_path,
+            platform_paths=platform_paths,
+            duration_sec=duration_sec,
+            encoder_args=encoder_args,
+        )
+        mux_filter = ["-filter_complex", fanout.filter_complex]
+        mux_output_args += fanout.output_args
+        mux_expected += fanout.expected_outputs
+    mux_args = [*mux_inputs, *mux_filter, *mux_output_args]
     commands.append(
         CommandSpec(
             label="mux_av",
             binary="ffmpeg",
-            args=[
+            args=mux_args,
+            expected_outputs=mux_expected,
+        )
+    )
+
+    if render_input.burn_subtitles:
+        subtitle_filter = f"subtitles={render_input.subtitle_path}"
+        if has_fanout:
+            # Split the subtitled frames so previews and platform encodes share
+            # the burn-in pass with the final encode.
+            fanout = _compile_fanout(
+                render_input,
+                video_in="0:v",
+                audio_in="0:a",
+                source_filter=subtitle_filter,
+                include_main=True,
+                proxy_path=proxy_path,
+                contact_sheet_path=contact_sheet_path,
+                platform_paths=platform_paths,
+                duration_sec=duration_sec,
+                encoder_args=encoder_args,
+            )
+            burn_args = [
                 "-y",
                 "-i",
-                str(background_path),
-                "-i",
-                str(audio_path),
+                str(muxed_path),
+                "-filter_complex",
+                fanout.filter_complex,
                 "-map",
-                "0:v:0",
+                "[main]",
                 "-map",
-                "1:a:0",
-                "-c:v",
+                "0:a:0",
+                *encoder_args,
+                "-c:a",
                 "copy",
+                str(final_video_path),
+                *fanout.output_args,
+            ]
+            burn_expected = [str(final_video_path), *fanout.expected_outputs]
+        else:
+            burn_args = [
+                "-y",
+                "-i",
+                str(muxed_path),
+                "-vf",
+                subtitle_filter,
+                *encoder_args,
                 "-c:a",
-                "aac",
-                "-ac",
-                "2",
-                "-shortest",
-                str(mux_output),
-            ],
-            expected_outputs=[str(mux_output)],
-        )
-    )
-
-    if render_input.burn_subtitles:
+                "copy",
+                str(final_video_path),
+            ]
+            burn_expected = [str(final_video_path)]
         commands.append(
             CommandSpec(
                 label="burn_subtitles",
                 binary="ffmpeg",
-                args=[
-                    "-y",
-                    "-i",
-                    str(muxed_path),
-                    "-vf",
-                    f"subtitles={render_input.subtitle_path}",
-                    "-c:a",
-                    "copy",
-                    str(final_video_path),
-                ],
-                expected_outputs=[str(final_video_path)],
+                args=burn_args,
+                expected_outputs=burn_expected,
             )
         )
 
@@ -163,11 +438,21 @@ def compile_short_render(render_input: RenderInput) -> RenderPlan:
             subtitle_path=final_subtitle_path,
             mixed_audio_path=mixed_audio_path if render_input.music_path else None,
             staged_visual_path=background_path,
+            proxy_path=proxy_path,
+            contact_sheet_path=contact_sheet_path,
+            platform_paths=platform_paths,
         ),
         metadata={
             "compiler": "renderer.short.v1",
             "command_labels": [command.label for command in commands],
             "burn_subtitles": render_input.burn_subtitles,
+            "previews": render_input.previews,
+            "quality_tier": render_input.quality_tier,
+            "platform_profiles": sorted(platform_paths),
+            "output_width": int(preset["width"]),
+            "output_height": int(preset["height"]),
+            "output_fps": int(preset["fps"]),
+            "music_normalized": render_input.music_normalized,
             "selected_asset_id": render_input.asset.get("key") or render_input.asset.get("id"),
         },
     )
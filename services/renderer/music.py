@@ -9,6 +9,8 @@ from pathlib import Path
 from shared.config import settings
 from shared.logging import log_error, log_info
 
+from . import music_index
+
 
 def _list_tracks() -> list[Path]:
     """Return sorted list of available mp3 tracks."""
@@ -16,13 +18,41 @@ def _list_tracks() -> list[Path]:
     return sorted(music_dir.glob("*.mp3"))
 
 
-def select_track(selection: str | None = None, *, required: bool = False) -> Path | None:
+def _select_fitting(tracks: list[Path], min_duration_ms: int | None) -> Path:
+    """Return the shortest indexed track covering ``min_duration_ms``.
+
+    Falls back to the longest indexed track when none is long enough, and to
+    the first sorted track when the index has no usable entries.
+    """
+
+    if not settings.MUSIC_INDEX_ENABLED:
+        return tracks[0]
+    indexed = {entry.name: entry for entry in music_index.refresh_index()}
+    candidates = [indexed[t.name] for t in tracks if t.name in indexed]
+    if not candidates:
+        return tracks[0]
+    required_ms = min_duration_ms or 0
+    fitting = [entry for entry in candidates if entry.duration_ms >= required_ms]
+    if fitting:
+        chosen = min(fitting, key=lambda entry: (entry.duration_ms, entry.name))
+    else:
+        chosen = max(candidates, key=lambda entry: (entry.duration_ms, entry.name))
+    return chosen.path
+
+
+def select_track(
+    selection: str | None = None,
+    *,
+    required: bool = False,
+    min_duration_ms: int | None = None,
+) -> Path | None:
     """Select a music track based on ``selection`` policy.
 
-    ``selection`` may be ``"named:<filename>"`` to choose a specific file or
-    ``None``/``"first"`` to return the first sorted ``*.mp3`` file. When
-    ``required`` is True, a missing track raises :class:`FileNotFoundError` and
-    an error is logged.
+    ``selection`` may be ``"named:<filename>"`` to choose a specific file,
+    ``"fit"`` to choose the shortest indexed track at least ``min_duration_ms``
+    long, or ``None``/``"first"`` to return the first sorted ``*.mp3`` file.
+    When ``required`` is True, a missing track raises
+    :class:`FileNotFoundError` and an error is logged.
     """
 
     tracks = _list_tracks()
@@ -45,6 +75,8 @@ def select_track(selection: str | None = None, *, required: bool = False) -> Pat
             if required:
                 raise FileNotFoundError(f"named track not found: {target}")
             return None
+    elif selection == "fit":
+        chosen = _select_fitting(tracks, min_duration_ms)
     else:
         chosen = tracks[0]
 
@@ -66,9 +98,9 @@ def mix(voice: Path, music: Path | None, out_path: Path) -> Path:
 
     threshold = 0.000976563
     filter_complex = (
-        "[0:a]pan=stereo|c0=c0|c1=c0[vo];"
+        "[0:a]pan=stereo|c0=c0|c1=c0,asplit=2[vo][key];"
         f"[1:a]aformat=channel_layouts=stereo,volume={settings.MUSIC_GAIN_DB}dB[m];"
-        f"[m][vo]sidechaincompress=threshold={threshold}:ratio=20:attack=5:release=50[d];"
+        f"[m][key]sidechaincompress=threshold={threshold}:ratio=20:attack=5:release=50[d];"
         "[vo][d]amix=inputs=2:duration=first:dropout_transition=2,volume=-1dB,"
         "aformat=channel_layouts=stereo[out]"
     )
@@ -0,0 +1,322 @@
+"""Persistent music library index with loudness analysis and pre-decoded beds.
+
+Each ``*.mp3`` in ``MUSIC_DIR`` is analysed once with ffmpeg ``loudnorm`` and
+decoded into a loudness-normalized stereo FLAC bed under ``MUSIC_INDEX_DIR``.
+Entries are keyed by file name and refreshed whenever the source track's size
+or mtime changes, so render jobs read a ready bed instead of decoding MP3s.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from shared.config import settings
+from shared.logging import log_error, log_info
+
+from . import ffmpeg
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "index.json"
+BED_SAMPLE_RATE = 48000
+_LOUDNORM_JSON = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}", re.DOTALL)
+_refresh_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class MusicTrack:
+    name: str
+    path: Path
+    bed_path: Path
+    size: int
+    mtime_ns: int
+    duration_ms: int
+    integrated_lufs: float
+    true_peak_db: float
+    target_lufs: float
+
+    def to_json(self) -> dict[str, object]:
+        payload = asdict(self)
+        payload["path"] = str(self.path)
+        payload["bed_path"] = str(self.bed_path)
+        return payload
+
+    @classmethod
+    def from_json(cls, payload: dict) -> "MusicTrack":
+        return cls(
+            name=str(payload["name"]),
+            path=Path(payload["path"]),
+            bed_path=Path(payload["bed_path"]),
+            size=int(payload["size"]),
+            mtime_ns=int(payload["mtime_ns"]),
+            duration_ms=int(payload["duration_ms"]),
+            integrated_lufs=float(payload["integrated_lufs"]),
+            true_peak_db=float(payload["true_peak_db"]),
+            target_lufs=float(payload["target_lufs"]),
+        )
+
+
+@dataclass(frozen=True)
+class FailedTrack:
+    """A track whose analysis failed; skipped until its size or mtime changes."""
+
+    name: str
+    size: int
+    mtime_ns: int
+    target_lufs: float
+    error: str
+
+    def to_json(self) -> dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, payload: dict) -> "FailedTrack":
+        return cls(
+            name=str(payload["name"]),
+            size=int(payload["size"]),
+            mtime_ns=int(payload["mtime_ns"]),
+            target_lufs=float(payload["target_lufs"]),
+            error=str(payload.get("error", "")),
+        )
+
+
+def _index_path() -> Path:
+    return Path(settings.MUSIC_INDEX_DIR) / INDEX_FILENAME
+
+
+def _loudnorm_args() -> str:
+    return (
+        f"I={settings.MUSIC_BED_TARGET_LUFS}:"
+        f"TP={settings.MUSIC_BED_TRUE_PEAK_DB}:"
+        "LRA=11"
+    )
+
+
+def _bed_path_for(track: Path, stat: os.stat_result) -> Path:
+    digest = hashlib.sha256(
+        f"{track.name}:{stat.st_size}:{stat.st_mtime_ns}:{settings.MUSIC_BED_TARGET_LUFS}".encode("utf-8")
+    ).hexdigest()[:16]
+    return Path(settings.MUSIC_INDEX_DIR) / "beds" / f"{track.stem}-{digest}.flac"
+
+
+def _measure_loudness(track: Path) -> dict[str, float]:
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            str(track),
+            "-af",
+            f"loudnorm={_loudnorm_args()}:print_format=json",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = _LOUDNORM_JSON.search(result.stderr)
+    if not match:
+        raise RuntimeError(f"loudnorm analysis produced no measurements for {track.name}")
+    payload = json.loads(match.group(0))
+    return {key: float(value) for key, value in payload.items() if key != "normalization_type"}
+
+
+def _decode_bed(track: Path, measured: dict[str, float], bed_path: Path) -> None:
+    bed_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = bed_path.with_suffix(".tmp.flac")
+    loudnorm = (
+        f"loudnorm={_loudnorm_args()}:"
+        f"measured_I={measured['input_i']}:"
+        f"measured_TP={measured['input_tp']}:"
+        f"measured_LRA={measured['input_lra']}:"
+        f"measured_thresh={measured['input_thresh']}:"
+        f"offset={measured['target_offset']}:"
+        "linear=true"
+    )
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-hide_banner",
+            "-i",
+            str(track),
+            "-vn",
+            "-af",
+            f"{loudnorm},aresample={BED_SAMPLE_RATE},aformat=channel_layouts=stereo",
+            "-c:a",
+            "flac",
+            str(tmp),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    os.replace(tmp, bed_path)
+
+
+def _analyse_track(track: Path, stat: os.stat_result) -> MusicTrack:
+    bed_path = _bed_path_for(track, stat)
+    measured = _measure_loudness(track)
+    _decode_bed(track, measured, bed_path)
+    entry = MusicTrack(
+        name=track.name,
+        path=track,
+        bed_path=bed_path,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        duration_ms=ffmpeg.probe_duration_ms(bed_path),
+        integrated_lufs=measured["input_i"],
+        true_peak_db=measured["input_tp"],
+        target_lufs=float(settings.MUSIC_BED_TARGET_LUFS),
+    )
+    log_info(
+        "music_index_track",
+        track=track.name,
+        duration_ms=entry.duration_ms,
+        integrated_lufs=entry.integrated_lufs,
+        true_peak_db=entry.true_peak_db,
+    )
+    return entry
+
+
+def _read_payload() -> dict:
+    path = _index_path()
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if payload.get("version") == INDEX_VERSION else {}
+
+
+def _parse_records(raw_records: list, parse) -> dict:
+    records = {}
+    for raw in raw_records:
+        try:
+            record = parse(raw)
+        except (KeyError, TypeError, ValueError):
+            continue
+        records[record.name] = record
+    return records
+
+
+def _read_index() -> dict[str, MusicTrack]:
+    return _parse_records(_read_payload().get("tracks", []), MusicTrack.from_json)
+
+
+def _write_index(entries: dict[str, MusicTrack], failures: dict[str, FailedTrack] | None = None) -> None:
+    path = _index_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps(
+            {
+                "version": INDEX_VERSION,
+                "tracks": [entries[name].to_json() for name in sorted(entries)],
+                "failures": [failures[name].to_json() for name in sorted(failures or {})],
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+def _same_file(record: MusicTrack | FailedTrack | None, stat: os.stat_result) -> bool:
+    return bool(
+        record
+        and record.size == stat.st_size
+        and record.mtime_ns == stat.st_mtime_ns
+        and record.target_lufs == float(settings.MUSIC_BED_TARGET_LUFS)
+    )
+
+
+def _is_fresh(entry: MusicTrack | None, stat: os.stat_result) -> bool:
+    return _same_file(entry, stat) and entry.bed_path.exists()
+
+
+def refresh_index() -> list[MusicTrack]:
+    """Return the indexed tracks, analysing any new or modified files.
+
+    Tracks whose size and mtime match the stored entry are reused as-is, and
+    beds for tracks removed from ``MUSIC_DIR`` are deleted. A track that fails
+    analysis is logged and left out of the index so selection falls back to
+    the raw file; the failure is recorded with its size and mtime so it is
+    not re-analysed on every render until the file changes.
+    """
+
+    music_dir = Path(settings.MUSIC_DIR)
+    with _refresh_lock:
+        payload = _read_payload()
+        existing: dict[str, MusicTrack] = _parse_records(payload.get("tracks", []), MusicTrack.from_json)
+        known_failures: dict[str, FailedTrack] = _parse_records(payload.get("failures", []), FailedTrack.from_json)
+        entries: dict[str, MusicTrack] = {}
+        failures: dict[str, FailedTrack] = {}
+        changed = False
+        for track in sorted(music_dir.glob("*.mp3")):
+            stat = track.stat()
+            entry = existing.get(track.name)
+            if _is_fresh(entry, stat):
+                entries[track.name] = entry
+                continue
+            failure = known_failures.get(track.name)
+            if _same_file(failure, stat):
+                failures[track.name] = failure
+                continue
+            changed = True
+            if entry:
+                entry.bed_path.unlink(missing_ok=True)
+            try:
+                entries[track.name] = _analyse_track(track, stat)
+            except (OSError, RuntimeError, subprocess.CalledProcessError, ValueError) as exc:
+                log_error("music_index_track", track=track.name, error=str(exc))
+                failures[track.name] = FailedTrack(
+                    name=track.name,
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
+                    target_lufs=float(settings.MUSIC_BED_TARGET_LUFS),
+                    error=str(exc)[:300],
+                )
+        if failures.keys() != known_failures.keys():
+            changed = True
+        for name, entry in existing.items():
+            if name not in entries and not (music_dir / name).exists():
+                entry.bed_path.unlink(missing_ok=True)
+                changed = True
+        if changed or not _index_path().exists():
+            _write_index(entries, failures)
+            log_info("music_index_refresh", music_dir=str(music_dir), tracks=len(entries))
+        return [entries[name] for name in sorted(entries)]
+
+
+def lookup(track: Path) -> MusicTrack | None:
+    """Return the fresh index entry for ``track`` without re-analysing it."""
+
+    entry = _read_index().get(track.name)
+    try:
+        stat = track.stat()
+    except FileNotFoundError:
+        return None
+    return entry if _is_fresh(entry, stat) else None
+
+
+def ensure_bed(track: Path) -> MusicTrack | None:
+    """Return the index entry for ``track``, refreshing the index on a miss."""
+
+    entry = lookup(track)
+    if entry is None:
+        entry = next((item for item in refresh_index() if item.name == track.name), None)
+    return entry
+
+
+__all__ = ["MusicTrack", "ensure_bed", "lookup", "refresh_index"]
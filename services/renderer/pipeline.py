@@ -6,12 +6,13 @@ import shutil
 from pathlib import Path
 from typing import Any
 
-from shared.config import settings
+from shared.config import parse_csv_list, settings
 from shared.logging import log_info
+from shared.workflow import RenderQualityTier
 
-from . import ffmpeg, music, subtitles, tts
+from . import ffmpeg, music, music_index, subtitles, tts
 from .asset_cache import materialize_asset
-from .compiler import RenderInput, compile_short_render
+from .compiler import RenderInput, compile_short_render, resolve_profiles
 from .executor import run_commands
 
 
@@ -73,11 +74,14 @@ def render_short_job(
     )
 
     selected_music = None
+    music_bed = None
     if preset.get("music_enabled", True):
         policy = bundle.get("music_policy") or "first"
         if bundle.get("music_track"):
             policy = f"named:{bundle['music_track']}"
-        selected_music = music.select_track(policy, required=False)
+        selected_music = music.select_track(policy, required=False, min_duration_ms=voice_result.duration_ms)
+        if selected_music and settings.MUSIC_INDEX_ENABLED:
+            music_bed = music_index.ensure_bed(selected_music)
 
     log_info("render_stage", job_id=job_id, story_id=story["id"], part_id=part["id"], stage="asset_materialize_start")
     materialized = materialize_asset(asset, output_dir=job_dir, session=session)
@@ -90,6 +94,11 @@ def render_short_job(
         asset_cache_hit=materialized.cache_hit,
         asset_path=str(materialized.path),
     )
+    quality_tier = job.get("quality_tier") or RenderQualityTier.FINAL.value
+    draft = quality_tier == RenderQualityTier.DRAFT.value
+    burn_subtitles = bool(settings.SUBTITLES_BURN_IN or preset.get("burn_subtitles"))
+    if draft and not settings.RENDER_DRAFT_BURN_SUBTITLES:
+        burn_subtitles = False
     render_input = RenderInput(
         job_id=job_id,
         story_id=story["id"],
@@ -98,15 +107,24 @@ def render_short_job(
         voice_path=voice_result.path,
         subtitle_path=subtitle_result.path,
         visual_path=materialized.path,
-        music_path=selected_music,
+        music_path=music_bed.bed_path if music_bed else selected_music,
         output_root=output_root,
         job_dir=job_dir,
         duration_ms=voice_result.duration_ms,
         subtitle_format=settings.SUBTITLES_FORMAT.lower(),
         asset=asset,
         preset=preset,
-        burn_subtitles=bool(settings.SUBTITLES_BURN_IN or preset.get("burn_subtitles")),
+        burn_subtitles=burn_subtitles,
         music_policy=bundle.get("music_policy"),
+        previews=settings.RENDER_PREVIEWS_ENABLED and not draft,
+        music_normalized=music_bed is not None,
+        quality_tier=quality_tier,
+        platform_profiles=()
+        if draft
+        else resolve_profiles(
+            (job.get("payload") or {}).get("platforms"),
+            parse_csv_list(settings.RENDER_OUTPUT_LADDER),
+        ),
     )
     plan = compile_short_render(render_input)
     log_info(
@@ -130,9 +148,12 @@ def render_short_job(
         "selected_asset_id": asset.get("key") or asset.get("provider_id") or asset.get("remote_url"),
         "selected_asset_provider": asset.get("provider"),
         "selected_music_track": selected_music.name if selected_music else None,
+        "music_integrated_lufs": music_bed.integrated_lufs if music_bed else None,
         "tts_cache_hit": voice_result.cache_hit,
         "subtitle_provider": subtitle_result.provider,
         "asset_cache_hit": materialized.cache_hit,
+        "proxy_path": str(plan.artifacts.proxy_path) if plan.artifacts.proxy_path else None,
+        "contact_sheet_path": str(plan.artifacts.contact_sheet_path) if plan.artifacts.contact_sheet_path else None,
     }
     return {
         "artifact_path": str(plan.artifacts.video_path),
@@ -140,6 +161,14 @@ def render_short_job(
         "bytes": plan.artifacts.video_path.stat().st_size,
         "duration_ms": duration_ms,
         "metadata": metadata,
+        "platform_outputs": [
+            {
+                "platform": platform,
+                "artifact_path": str(path),
+                "bytes": path.stat().st_size,
+            }
+            for platform, path in sorted(plan.artifacts.platform_paths.items())
+        ],
     }
 
 
@@ -157,13 +186,19 @@ def render_compilation_job(context: dict[str, Any]) -> dict[str, object]:
         for part in context.get("parts", [])
         if part.get("id") is not None
     }
-    artifact_rows = [
-        artifact
-        for artifact in context.get("artifacts", [])
-        if artifact.get("variant") == "short"
-        and artifact.get("story_part_id") in part_index_by_id
-        and artifact.get("video_path")
-    ]
+    # Context artifacts arrive newest first; keep the latest primary final
+    # render per part and ignore drafts and platform ladder variants.
+    latest_by_part: dict[int, dict[str, Any]] = {}
+    for artifact in context.get("artifacts", []):
+        if (
+            artifact.get("variant") == "short"
+            and artifact.get("story_part_id") in part_index_by_id
+            and artifact.get("video_path")
+            and (artifact.get("quality_tier") or RenderQualityTier.FINAL.value) == RenderQualityTier.FINAL.value
+            and not artifact.get("platform")
+        ):
+            latest_by_part.setdefault(artifact["story_part_id"], artifact)
+    artifact_rows = list(latest_by_part.values())
     if not artifact_rows:
         raise FileNotFoundError("Weekly compilation requires rendered short artifacts")
     artifact_rows.sort(key=lambda artifact: part_index_by_id[artifact["story_part_id"]])
@@ -19,6 +19,7 @@ from shared.workflow import JobStatus
 
 from .api_client import RenderApiClient, auth_headers
 from .executor import CommandExecutionError, CommandTimeoutError
+from .music_index import refresh_index as refresh_music_index
 from .pipeline import render_job as render_pipeline_job
 from .tts import resolve_xtts_paths
 
@@ -115,7 +116,8 @@ def _heartbeat_loop(
 
 def render_job(job: dict, session: requests.sessions.Session | None = None) -> dict[str, object]:
     client = RenderApiClient(session or requests)
-    context = client.get_context(int(job["id"]))
+    profile = "compilation" if job.get("kind") == "render_compilation" else "short"
+    context = client.get_context(int(job["id"]), profile=profile)
     log_info(
         "context",
         job_id=job["id"],
@@ -223,6 +225,11 @@ def run() -> None:  # pragma: no cover - continuous loop
     log_info("start", cid="poller", max_concurrent=max_concurrent)
     HEARTBEAT_FILE.parent.mkdir(parents=True, exist_ok=True)
     HEARTBEAT_FILE.touch()
+    if settings.MUSIC_INDEX_ENABLED:
+        try:
+            refresh_music_index()
+        except OSError as exc:
+            log_error("music_index_refresh", error=str(exc))
     backoff = backoff_schedule(settings.POLL_INTERVAL_MS, factor=1.0)
     with ThreadPoolExecutor(max_workers=max_concurrent) as pool:
         running: dict[int, object] = {}
@@ -8,6 +8,7 @@ from pathlib import Path
 
 import requests
 
+from shared import pixabay
 from shared.config import settings
 from shared.logging import log_error, log_info
 
@@ -182,6 +183,22 @@ def run_once(
     except Exception as exc:
         log_error("scheduler_refinement_maintenance_error", error=str(exc))
 
+    try:
+        res = sess.post(
+            f"{base}/assets/downloads/maintenance",
+            headers=_headers(),
+            timeout=30,
+        )
+        res.raise_for_status()
+        log_info("scheduler_asset_downloads_requeued", **res.json())
+    except Exception as exc:
+        log_error("scheduler_asset_downloads_error", error=str(exc))
+
+    try:
+        log_info("scheduler_pixabay_cache_pruned", removed=pixabay.prune_cache())
+    except Exception as exc:
+        log_error("scheduler_pixabay_cache_prune_error", error=str(exc))
+
 
 def run() -> None:  # pragma: no cover - continuous loop
     log_info("scheduler_start", interval_sec=settings.SCHEDULER_INTERVAL_SEC)
@@ -0,0 +1,277 @@
+"""Cached Pixabay image search behind a pluggable provider.
+
+Searches and id lookups go through :func:`search_images` and
+:func:`lookup_image`. Payloads are cached as JSON files under
+``PIXABAY_CACHE_DIR``: id lookups for ``PIXABAY_CACHE_TTL_SEC`` (Pixabay asks
+clients to cache results for 24 hours), searches only for
+``PIXABAY_SEARCH_CACHE_TTL_SEC`` because the image URLs in their hits expire
+and callers store them. :func:`prune_cache` deletes files no TTL can reuse.
+The cache key is the provider name plus the request parameters without the API
+key, so the API and the renderer share entries on the content volume.
+Identical requests made at the same time in one process share a single
+upstream call.
+
+``PIXABAY_PROVIDER`` selects the upstream: ``pixabay`` for the live API, or
+``fixture`` to answer from Pixabay-shaped JSON files (``{"hits": [...]}``) in
+``PIXABAY_FIXTURE_DIR``, so the asset pipeline can run offline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+import requests
+
+from shared.config import settings
+from shared.logging import log_error
+
+API_URL = "https://pixabay.com/api/"
+USER_AGENT = "dark-life-api/1.0"
+REQUEST_TIMEOUT = (3.05, 8)
+TMP_FILE_GRACE_SEC = 3600
+_TAG_SPLIT_RE = re.compile(r"[,\s]+")
+
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+class PixabayProvider(Protocol):
+    name: str
+
+    def ready(self) -> bool: ...
+
+    def fetch(self, params: dict[str, Any]) -> dict[str, Any]: ...
+
+
+class LivePixabayProvider:
+    name = "pixabay"
+
+    def ready(self) -> bool:
+        return bool(settings.PIXABAY_API_KEY)
+
+    def fetch(self, params: dict[str, Any]) -> dict[str, Any]:
+        response = requests.get(
+            API_URL,
+            params={"key": settings.PIXABAY_API_KEY, **params},
+            headers={"User-Agent": USER_AGENT},
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+class FixturePixabayProvider:
+    """Serve searches from fixture hits, matched on tag words and paginated like the API."""
+
+    name = "fixture"
+
+    def __init__(self, directory: Path | None) -> None:
+        self.directory = directory
+        self._hits: list[dict[str, Any]] | None = None
+
+    def ready(self) -> bool:
+        return self.directory is not None and self.directory.is_dir()
+
+    def hits(self) -> list[dict[str, Any]]:
+        if self._hits is None:
+            hits: list[dict[str, Any]] = []
+            for path in sorted(self.directory.glob("*.json")) if self.ready() else []:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                hits.extend(hit for hit in payload.get("hits", []) if isinstance(hit, dict))
+            self._hits = hits
+        return self._hits
+
+    def fetch(self, params: dict[str, Any]) -> dict[str, Any]:
+        hits = self.hits()
+        if "id" in params:
+            matched = [hit for hit in hits if str(hit.get("id")) == str(params["id"])]
+            return {"total": len(matched), "totalHits": len(matched), "hits": matched}
+        words = set(str(params.get("q") or "").lower().split())
+        matched = [
+            hit for hit in hits if words & set(_TAG_SPLIT_RE.split(str(hit.get("tags", "")).lower()))
+        ] or hits
+        per_page = max(int(params.get("per_page") or 20), 1)
+        page = max(int(params.get("page") or 1), 1)
+        window = matched[(page - 1) * per_page : page * per_page]
+        return {"total": len(matched), "totalHits": len(matched), "hits": window}
+
+
+PROVIDERS: dict[str, Callable[[], PixabayProvider]] = {
+    LivePixabayProvider.name: LivePixabayProvider,
+    FixturePixabayProvider.name: lambda: FixturePixabayProvider(
+        Path(settings.PIXABAY_FIXTURE_DIR) if settings.PIXABAY_FIXTURE_DIR else None
+    ),
+}
+
+
+def _provider_name() -> str:
+    return settings.PIXABAY_PROVIDER.strip().lower() or LivePixabayProvider.name
+
+
+@lru_cache(maxsize=8)
+def _build_provider(name: str, _fixture_dir: str) -> PixabayProvider:
+    return PROVIDERS[name]()
+
+
+def get_provider() -> PixabayProvider | None:
+    """The configured provider, or ``None`` when ``PIXABAY_PROVIDER`` is unknown."""
+
+    name = _provider_name()
+    if name not in PROVIDERS:
+        return None
+    return _build_provider(name, str(settings.PIXABAY_FIXTURE_DIR or ""))
+
+
+def provider_ready() -> bool:
+    provider = get_provider()
+    return provider is not None and provider.ready()
+
+
+def _cache_key(provider: str, params: dict[str, Any]) -> str:
+    canonical = json.dumps(
+        {"provider": provider, "params": {key: str(value) for key, value in params.items() if key != "key"}},
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key: str) -> Path:
+    return Path(settings.PIXABAY_CACHE_DIR) / key[:2] / f"{key}.json"
+
+
+def _read_cached(path: Path, ttl: int) -> dict[str, Any] | None:
+    try:
+        if time.time() - path.stat().st_mtime >= ttl:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["payload"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cached(path: Path, params: dict[str, Any], payload: dict[str, Any]) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"params": params, "payload": payload}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        tmp.unlink(missing_ok=True)
+        log_error("pixabay_cache_write_failed", path=str(path), error=str(exc))
+
+
+def _coalesced(key: str, load: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+    try:
+        payload = load()
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(payload)
+        return payload
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _fetch(
+    params: dict[str, Any],
+    *,
+    ttl: int,
+    accept: Callable[[dict[str, Any]], bool] = lambda _payload: True,
+) -> dict[str, Any]:
+    provider = get_provider()
+    if provider is None:
+        raise ValueError(f"Unsupported PIXABAY_PROVIDER: {_provider_name()}")
+    key = _cache_key(provider.name, params)
+    path = _cache_path(key)
+
+    def cached() -> dict[str, Any] | None:
+        payload = _read_cached(path, ttl) if ttl > 0 else None
+        return payload if payload is not None and accept(payload) else None
+
+    def load() -> dict[str, Any]:
+        # The previous leader for this key may have stored a fresh payload.
+        payload = cached()
+        if payload is None:
+            payload = provider.fetch(params)
+            if ttl > 0:
+                _write_cached(path, params, payload)
+        return payload
+
+    payload = cached()
+    return payload if payload is not None else _coalesced(key, load)
+
+
+def search_images(params: dict[str, Any]) -> dict[str, Any]:
+    """Return the search payload for ``params`` (``q``, ``page``, ``per_page``, ...)."""
+
+    return _fetch(params, ttl=settings.PIXABAY_SEARCH_CACHE_TTL_SEC)
+
+
+def hit_url(hit: dict[str, Any]) -> str | None:
+    return hit.get("webformatURL") or hit.get("largeImageURL")
+
+
+def lookup_image(provider_id: str, *, stale_url: str | None = None) -> dict[str, Any] | None:
+    """Return the hit for ``provider_id``.
+
+    A cached hit whose URL is ``stale_url`` is refetched, so callers refreshing
+    an expired URL never get the same one back from the cache.
+    """
+
+    def usable(payload: dict[str, Any]) -> bool:
+        hit = next(iter(payload.get("hits", [])), None)
+        return stale_url is None or not isinstance(hit, dict) or hit_url(hit) != stale_url
+
+    payload = _fetch({"id": provider_id}, ttl=settings.PIXABAY_CACHE_TTL_SEC, accept=usable)
+    hit = next(iter(payload.get("hits", [])), None)
+    return hit if isinstance(hit, dict) else None
+
+
+def prune_cache() -> int:
+    """Delete cache files older than both TTLs, and orphaned temp files; returns the count."""
+
+    now = time.time()
+    cutoff = now - max(settings.PIXABAY_CACHE_TTL_SEC, settings.PIXABAY_SEARCH_CACHE_TTL_SEC, 0)
+    # Leave temp files alone long enough for an in-flight write to finish.
+    cutoffs = {".json": cutoff, ".tmp": min(cutoff, now - TMP_FILE_GRACE_SEC)}
+    removed = 0
+    root = Path(settings.PIXABAY_CACHE_DIR)
+    for path in [*root.glob("*/*.json"), *root.glob("*/*.tmp")] if root.is_dir() else []:
+        try:
+            if path.stat().st_mtime < cutoffs[path.suffix]:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+__all__ = [
+    "FixturePixabayProvider",
+    "LivePixabayProvider",
+    "PROVIDERS",
+    "PixabayProvider",
+    "get_provider",
+    "hit_url",
+    "lookup_image",
+    "provider_ready",
+    "prune_cache",
+    "search_images",
+]
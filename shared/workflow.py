@@ -64,11 +64,23 @@ class RenderVariant(StrEnum):
     WEEKLY = "weekly"
 
 
+class RenderQualityTier(StrEnum):
+    DRAFT = "draft"
+    FINAL = "final"
+
+
 class AssetKind(StrEnum):
     IMAGE = "image"
     VIDEO = "video"
 
 
+class AssetDownloadStatus(StrEnum):
+    PENDING = "pending"
+    DOWNLOADING = "downloading"
+    READY = "ready"
+    FAILED = "failed"
+
+
 STORY_STATUS_TRANSITIONS: dict[StoryStatus, set[StoryStatus]] = {
     StoryStatus.INGESTED: {StoryStatus.GENERATING_SCRIPT, StoryStatus.SCRIPTED, StoryStatus.REJECTED, StoryStatus.ERRORED},
     StoryStatus.GENERATING_SCRIPT: {StoryStatus.SCRIPTED, StoryStatus.REJECTED, StoryStatus.ERRORED},
@@ -130,12 +142,14 @@ def can_transition_publish_job(current: str, next_status: str) -> bool:
 
 
 __all__ = [
+    "AssetDownloadStatus",
     "AssetKind",
     "JobStatus",
     "PublishApprovalStatus",
     "PublishDeliveryMode",
     "PublishJobStatus",
     "ReleaseStatus",
+    "RenderQualityTier",
     "RenderVariant",
     "StoryStatus",
     "can_transition_job",
@@ -1,6 +1,7 @@
 import pytest
 from datetime import datetime, timezone
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine, select
 
@@ -8,7 +9,8 @@ from apps.api.db import get_session
 import apps.api.admin_settings as admin_settings_api
 import apps.api.main as main
 from apps.api.models import StudioSetting
-from apps.api.publishing import short_release_schedule_from
+from apps.api.publishing import active_publish_platforms, active_short_schedule_cron_utc, short_release_schedule_from
+from apps.api.refinement import active_prompt
 from shared.config import settings
 
 
@@ -100,3 +102,46 @@ def test_short_release_schedule_uses_cron_override(client):
         "2030-01-01T08:00:00+00:00",
         "2030-01-01T12:00:00+00:00",
     ]
+
+
+def test_reference_data_is_cached_until_admin_writes_invalidate_it(client):
+    client, engine = client
+    statements: list[str] = []
+
+    def _count(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    with Session(engine) as session:
+        active_prompt(session, "generator")
+    before = client.get("/admin/settings/reference-cache", headers=_auth_headers()).json()
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        with Session(engine) as session:
+            for _ in range(5):
+                assert active_publish_platforms(session) == ["youtube"]
+                assert active_prompt(session, "generator").kind == "generator"
+        assert len(statements) == 1
+
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(settings, "SHORTS_PUBLISH_CRON_UTC", "")
+    try:
+        with Session(engine) as session:
+            assert active_short_schedule_cron_utc(session) is None
+        updated = client.put(
+            "/admin/settings/publish-platforms",
+            json={"short_schedule_cron_utc": "0 */4 * * *"},
+            headers=_auth_headers(),
+        )
+        assert updated.status_code == 200
+        with Session(engine) as session:
+            assert active_short_schedule_cron_utc(session) == "0 */4 * * *"
+    finally:
+        monkeypatch.undo()
+
+    after = client.get("/admin/settings/reference-cache", headers=_auth_headers()).json()
+    assert after["active_prompt"]["hits"] - before["active_prompt"]["hits"] == 5
+    assert after["studio_setting"]["misses"] - before.get("studio_setting", {}).get("misses", 0) >= 2
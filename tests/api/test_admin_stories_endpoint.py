@@ -29,6 +29,7 @@ def client_fixture(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(main, "init_db", lambda: None)
     monkeypatch.setattr(main, "ensure_default_presets", lambda _session: None)
     monkeypatch.setattr(main, "ensure_default_prompt_versions", lambda _session: None)
+    monkeypatch.setattr(main, "requeue_pending_downloads", lambda _bind: None)
     monkeypatch.setattr(admin_stories, "ADMIN_TOKEN", "token")
 
     app.dependency_overrides[get_session] = get_test_session
@@ -117,3 +118,93 @@ def test_upsert_story_rejects_same_title_author_and_content(client: TestClient):
     res2 = client.post("/admin/stories", json=second_payload, headers=headers)
     assert res2.status_code == 409
     assert res2.json()["detail"] == "duplicate"
+
+
+def test_upsert_story_rejects_near_duplicate_repost(client: TestClient):
+    headers = {"Authorization": "Bearer token"}
+    body = " ".join(
+        f"On night {index} the hallway light flickered and something knocked twice on my door."
+        for index in range(1, 9)
+    )
+    original = {
+        "external_id": "orig1",
+        "source": "reddit",
+        "title": "The Knocking",
+        "author": "first_poster",
+        "created_utc": 0,
+        "text": body,
+    }
+    repost = {
+        "external_id": "repost1",
+        "source": "reddit",
+        "title": "Knocking [repost]",
+        "author": "someone_else",
+        "created_utc": 1,
+        "text": body.replace("flickered", "flickered\n\n", 3) + "\n\nEDIT: thanks for the gold!",
+    }
+    unrelated = {
+        "external_id": "other1",
+        "source": "reddit",
+        "title": "The Well",
+        "author": "first_poster",
+        "created_utc": 2,
+        "text": " ".join(f"Bucket {index} came up from the well full of black water and hair." for index in range(1, 9)),
+    }
+
+    res = client.post("/admin/stories", json=original, headers=headers)
+    assert res.status_code == 201
+    story_id = res.json()["id"]
+
+    res2 = client.post("/admin/stories", json=repost, headers=headers)
+    assert res2.status_code == 409
+    assert res2.json() == {"detail": "duplicate", "story_id": story_id}
+
+    res3 = client.post("/admin/stories", json=unrelated, headers=headers)
+    assert res3.status_code == 201
+
+
+def test_bulk_upsert_reports_result_per_item(client: TestClient):
+    headers = {"Authorization": "Bearer token"}
+    existing = {
+        "external_id": "old1",
+        "source": "reddit",
+        "title": "Old",
+        "author": "a",
+        "created_utc": 0,
+        "text": "old body",
+    }
+    assert client.post("/admin/stories", json=existing, headers=headers).status_code == 201
+    long_body = " ".join(f"Night {index} the radio played a voice that knew my name." for index in range(1, 9))
+
+    batch = [
+        {**existing, "title": "Old (edited)"},
+        {**existing, "external_id": "copy1", "title": " old ", "author": "A"},
+        {"external_id": "new1", "source": "reddit", "title": "Radio", "author": "b", "created_utc": 1, "text": long_body},
+        {"external_id": "new1", "source": "reddit", "title": "Radio", "author": "b", "created_utc": 1, "text": long_body},
+        {
+            "external_id": "new2",
+            "source": "reddit",
+            "title": "Radio repost",
+            "author": "c",
+            "created_utc": 2,
+            "text": long_body + "\n\nEDIT: wow this blew up",
+        },
+        {"external_id": "new3", "source": "reddit", "title": "Short", "author": "d", "created_utc": 3, "text": "tiny"},
+    ]
+    res = client.post("/admin/stories/bulk", json=batch, headers=headers)
+    assert res.status_code == 200
+    results = res.json()
+    assert [result["status"] for result in results] == [
+        "updated",
+        "created",
+        "created",
+        "duplicate",
+        "duplicate",
+        "created",
+    ]
+    assert results[3]["story_id"] == results[2]["story_id"]
+    assert results[4]["story_id"] == results[2]["story_id"]
+
+    again = client.post("/admin/stories/bulk", json=batch[2:3], headers=headers)
+    assert again.json()[0]["status"] == "duplicate"
+    assert again.json()[0]["story_id"] == results[2]["story_id"]
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import shutil
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from apps.api import asset_index
+from apps.api.db import get_session
+import apps.api.main as main
+from apps.api.models import Asset, Job, LocalAssetDuplicate
+from shared.config import settings
+
+
+@pytest.fixture(name="client")
+def client_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    probes: list[Path] = []
+
+    def fake_probe(path: Path) -> dict:
+        probes.append(path)
+        return {"streams": [{"width": 1080, "height": 1920}], "format": {"duration": "2.5"}}
+
+    monkeypatch.setattr(main, "init_db", lambda: None)
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(settings, "VISUALS_DIR", tmp_path)
+    monkeypatch.setattr(asset_index, "_ffprobe_json", fake_probe)
+    main.app.dependency_overrides[get_session] = get_test_session
+    with TestClient(main.app) as client:
+        yield client, engine, tmp_path, probes
+    main.app.dependency_overrides.clear()
+
+
+def _run_index(client: TestClient) -> dict:
+    res = client.post("/assets/library/index")
+    assert res.status_code == 202
+    job = client.get(f"/jobs/{res.json()['id']}").json()
+    assert job["kind"] == "index_local_assets"
+    assert job["status"] == "rendered", job
+    return job["result"]
+
+
+def test_index_skips_unchanged_files_and_tracks_changes(client, monkeypatch):
+    client, engine, visuals, probes = client
+    (visuals / "fog_forest.jpg").write_bytes(b"fog")
+    (visuals / "clips").mkdir()
+    (visuals / "clips" / "dark-hall.mp4").write_bytes(b"hall")
+    (visuals / "notes.txt").write_text("ignored")
+
+    first = _run_index(client)
+    assert first == {"scanned": 2, "unchanged": 0, "added": 2, "updated": 0, "duplicates": 0}
+    assert len(probes) == 2
+
+    probes.clear()
+    assert _run_index(client) == {"scanned": 2, "unchanged": 2, "added": 0, "updated": 0, "duplicates": 0}
+    assert probes == []
+
+    changed = visuals / "fog_forest.jpg"
+    changed.write_bytes(b"thicker fog")
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    shutil.copy(visuals / "clips" / "dark-hall.mp4", visuals / "copy.mp4")
+    third = _run_index(client)
+    assert third == {"scanned": 3, "unchanged": 1, "added": 0, "updated": 1, "duplicates": 1}
+    assert probes == [changed]
+
+    hashed: list[Path] = []
+    file_sha256 = asset_index.file_sha256
+    monkeypatch.setattr(asset_index, "file_sha256", lambda path: hashed.append(path) or file_sha256(path))
+    assert _run_index(client) == {"scanned": 3, "unchanged": 2, "added": 0, "updated": 0, "duplicates": 1}
+    assert hashed == []
+    with Session(engine) as session:
+        duplicate = session.exec(select(LocalAssetDuplicate)).one()
+    assert Path(duplicate.local_path).name == "copy.mp4"
+
+    with Session(engine) as session:
+        assets = session.exec(select(Asset).order_by(Asset.id)).all()
+    assert [Path(asset.local_path).name for asset in assets] == ["fog_forest.jpg", "dark-hall.mp4"]
+    fog = assets[0]
+    assert fog.tags == ["fog", "forest"]
+    assert fog.file_hash == hashlib.sha256(b"thicker fog").hexdigest()
+    assert fog.file_size == len(b"thicker fog")
+    assert (fog.orientation, fog.duration_ms) == ("portrait", 2500)
+    assert assets[1].type == "video"
+
+
+def test_index_returns_job_already_in_flight(client):
+    client, engine, _visuals, _probes = client
+    with Session(engine) as session:
+        job, created = asset_index.enqueue_local_asset_index(session)
+    assert created
+
+    res = client.post("/assets/library/index")
+
+    assert res.status_code == 202
+    assert res.json()["id"] == job.id
+    assert res.json()["status"] == "queued"
+
+
+def test_replaced_index_job_stops_without_overwriting_its_status(client, monkeypatch):
+    _client, engine, visuals, _probes = client
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        (visuals / name).write_bytes(name.encode())
+    with Session(engine) as session:
+        job, _created = asset_index.enqueue_local_asset_index(session)
+    heartbeats: list = []
+
+    def replace_job(path: Path) -> dict:
+        with Session(engine) as other:
+            current = other.get(Job, job.id)
+            heartbeats.append(current.updated_at)
+            if len(heartbeats) == 2:
+                current.status = "errored"
+                current.error_class = "StaleJob"
+                other.add(current)
+                other.commit()
+        return {}
+
+    monkeypatch.setattr(asset_index, "INDEX_BATCH_SIZE", 1)
+    monkeypatch.setattr(asset_index, "INDEX_PROGRESS_INTERVAL", timedelta(0))
+    monkeypatch.setattr(asset_index, "_ffprobe_json", replace_job)
+    asset_index.run_local_asset_index_job(engine, job.id)
+
+    with Session(engine) as session:
+        stopped = session.get(Job, job.id)
+    assert (stopped.status, stopped.error_class) == ("errored", "StaleJob")
+    assert len(heartbeats) == 2
+    assert heartbeats[1] > heartbeats[0]
+    with Session(engine) as session:
+        assert len(session.exec(select(Asset)).all()) == 1
+
+
+def test_file_sha256_streams_in_chunks(tmp_path: Path):
+    path = tmp_path / "big.webp"
+    payload = os.urandom(10_000)
+    path.write_bytes(payload)
+
+    assert asset_index.file_sha256(path, chunk_size=7) == hashlib.sha256(payload).hexdigest()
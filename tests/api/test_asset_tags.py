@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from apps.api.asset_tags import rank_library_assets
+from apps.api.db import get_session
+import apps.api.main as main
+from apps.api.models import Asset, AssetTag, Story
+from apps.api.pipeline import best_assets_for_story
+
+
+@pytest.fixture(name="engine")
+def engine_fixture():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine, monkeypatch: pytest.MonkeyPatch):
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setattr(main, "init_db", lambda: None)
+    monkeypatch.setattr(main, "engine", engine)
+    main.app.dependency_overrides[get_session] = get_test_session
+    with TestClient(main.app) as client:
+        yield client
+    main.app.dependency_overrides.clear()
+
+
+def _library(session: Session, *tag_lists: list[str]) -> list[Asset]:
+    assets = [Asset(type="image", local_path=f"/visuals/{index}.jpg", tags=tags) for index, tags in enumerate(tag_lists)]
+    session.add_all(assets)
+    session.commit()
+    return assets
+
+
+def _indexed(session: Session) -> dict[int, list[str]]:
+    index: dict[int, list[str]] = {}
+    for row in session.exec(select(AssetTag).order_by(AssetTag.asset_id, AssetTag.tag)).all():
+        index.setdefault(row.asset_id, []).append(row.tag)
+    return index
+
+
+def test_tag_index_follows_asset_writes(engine):
+    with Session(engine) as session:
+        fog, plain = _library(session, ["Fog", " forest ", "fog"], ["hall"])
+        assert _indexed(session) == {fog.id: ["fog", "forest"], plain.id: ["hall"]}
+
+        fog.tags = ["lighthouse"]
+        plain.rating = 5
+        session.add_all([fog, plain])
+        session.commit()
+        assert _indexed(session) == {fog.id: ["lighthouse"], plain.id: ["hall"]}
+
+        session.delete(plain)
+        session.commit()
+        assert _indexed(session) == {fog.id: ["lighthouse"]}
+
+
+def test_rare_tags_outrank_common_ones(engine):
+    with Session(engine) as session:
+        common = _library(session, ["dark", "night"], *[["dark", "night", f"filler{n}"] for n in range(9)])[0]
+        rare = _library(session, ["lighthouse"])[0]
+        untagged = _library(session, None)[0]
+        terms = {"dark", "night", "lighthouse"}
+
+        assert rank_library_assets(session, terms, limit=1)[0].id == rare.id
+        assert rank_library_assets(session, terms, limit=1, weighted=False)[0].id == common.id
+        assert len(rank_library_assets(session, terms, limit=5)) == 5
+
+        story = Story(title="The lighthouse", body_md="A dark night")
+        ranked = best_assets_for_story(session, story, limit=20)
+        assert [ranked[0].id, ranked[-1].id] == [rare.id, untagged.id]
+        assert len(ranked) == 12
+
+
+def test_library_search_filters_in_sql_with_cursor(client, engine):
+    with Session(engine) as session:
+        assets = _library(session, ["fog"], ["hall"], ["Fog", "forest"], ["fog"])
+        session.add(Asset(type="image", local_path="/visuals/foggy_pier.jpg", tags=["pier"]))
+        session.commit()
+        fog_ids = [asset.id for asset in assets if "fog" in {tag.lower() for tag in asset.tags}]
+
+    first = client.get("/assets/library", params={"q": "FOG", "limit": 2})
+    rest = client.get("/assets/library", params={"q": "FOG", "limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert first.status_code == rest.status_code == 200
+    ids = [asset["id"] for asset in first.json() + rest.json()]
+    assert ids == sorted([*fog_ids, 5], reverse=True)
+    assert client.get("/assets/library/count", params={"q": "FOG"}).json() == {"total": len(ids)}
+    assert client.get("/assets/library/count").json() == {"total": 5}
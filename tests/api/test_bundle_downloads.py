@@ -0,0 +1,266 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from apps.api import bundle_downloads
+from apps.api.db import get_session
+import apps.api.main as main
+from apps.api.models import Asset, AssetBundle, Story
+from apps.api.script_refinement import run_compat_script_generation
+from shared.config import settings
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, *, status_code: int = 200, headers: dict[str, str] | None = None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {"content-type": "image/jpeg"}
+        self.closed = False
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+    def iter_content(self, chunk_size: int = 0):
+        for start in range(0, len(self.content), 4):
+            yield self.content[start : start + 4]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class RecordingPool(ThreadPoolExecutor):
+    """The download pool, remembering submissions so tests can wait for them."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=2)
+        self.futures = []
+
+    def submit(self, *args, **kwargs):
+        future = super().submit(*args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def drain(self) -> None:
+        wait(self.futures, timeout=10)
+
+
+@pytest.fixture(name="pool")
+def pool_fixture(monkeypatch: pytest.MonkeyPatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(bundle_downloads, "_pool", lambda: pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.fixture(name="client")
+def client_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, pool):
+    # A file database so each download thread gets its own connection, as in production.
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'api.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLModel.metadata.create_all(engine)
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setattr(main, "init_db", lambda: None)
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(settings, "REMOTE_ASSET_CACHE_DIR", tmp_path / "store")
+    main.app.dependency_overrides[get_session] = get_test_session
+    with TestClient(main.app) as client:
+        yield client, engine, tmp_path / "store", pool
+    main.app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def _story_with_script(engine) -> int:
+    with Session(engine) as session:
+        story = Story(title="Downloads", body_md="One. Two. Three. Four. Five.")
+        session.add(story)
+        session.commit()
+        run_compat_script_generation(session, story)
+        session.commit()
+        return story.id
+
+
+def _ref(provider_id: str) -> dict:
+    return {
+        "key": f"pixabay:{provider_id}",
+        "type": "image",
+        "remote_url": f"https://example.com/{provider_id}.jpg",
+        "provider": "pixabay",
+        "provider_id": provider_id,
+    }
+
+
+def test_bundle_returns_pending_assets_and_downloads_in_background(client, monkeypatch):
+    client, engine, store, pool = client
+    story_id = _story_with_script(engine)
+    bodies = {
+        "https://example.com/a.jpg": FakeResponse(b"same-bytes"),
+        "https://example.com/b.jpg": FakeResponse(b"same-bytes"),
+        "https://example.com/c.jpg": FakeResponse(b"", status_code=500),
+    }
+    monkeypatch.setattr(bundle_downloads.requests, "get", lambda url, **_kwargs: bodies[url])
+
+    created = client.post(
+        f"/stories/{story_id}/asset-bundles",
+        json={"name": "Primary", "asset_refs": [_ref("a"), _ref("b"), _ref("c")]},
+    )
+
+    assert created.status_code == 200
+    assert {(ref["download_status"], ref["local_path"]) for ref in created.json()["asset_refs"]} == {("pending", None)}
+    pool.drain()
+    bundle = client.get(f"/stories/{story_id}/asset-bundles").json()[0]
+    refs = {ref["provider_id"]: ref for ref in bundle["asset_refs"]}
+    assert [refs[key]["download_status"] for key in "abc"] == ["ready", "ready", "failed"]
+    assert refs["a"]["local_path"] == refs["b"]["local_path"]
+    assert refs["c"]["local_path"] is None
+    assert all(row["asset"]["download_status"] for row in bundle["part_asset_map"])
+    stored = [path for path in store.rglob("*") if path.is_file()]
+    assert [path.read_bytes() for path in stored] == [b"same-bytes"]
+    assert stored[0].suffix == ".jpg"
+    with Session(engine) as session:
+        asset = session.exec(select(Asset).where(Asset.provider_id == "a")).one()
+        assert (asset.download_status, asset.local_path) == ("ready", str(stored[0]))
+
+
+def test_rebuilding_a_bundle_skips_downloaded_assets(client, monkeypatch):
+    client, engine, _store, pool = client
+    story_id = _story_with_script(engine)
+    calls: list[str] = []
+
+    def fake_get(url: str, **_kwargs):
+        calls.append(url)
+        return FakeResponse(b"pixels")
+
+    monkeypatch.setattr(bundle_downloads.requests, "get", fake_get)
+    for name in ("First", "Second"):
+        res = client.post(f"/stories/{story_id}/asset-bundles", json={"name": name, "asset_refs": [_ref("a")]})
+        assert res.status_code == 200
+        pool.drain()
+
+    assert calls == ["https://example.com/a.jpg"]
+    assert res.json()["asset_refs"][0]["download_status"] == "ready"
+
+
+def test_startup_requeues_downloads_left_pending(client, monkeypatch):
+    client, engine, _store, pool = client
+    story_id = _story_with_script(engine)
+    with monkeypatch.context() as stopped:
+        # The process stops before any download is picked up.
+        stopped.setattr(bundle_downloads, "_submit", lambda *_args: None)
+        created = client.post(f"/stories/{story_id}/asset-bundles", json={"name": "Cut short", "asset_refs": [_ref("a")]})
+    assert created.json()["asset_refs"][0]["download_status"] == "pending"
+    monkeypatch.setattr(bundle_downloads.requests, "get", lambda url, **_kwargs: FakeResponse(b"resumed"))
+
+    with TestClient(main.app):
+        pool.drain()
+
+    with Session(engine) as session:
+        asset = session.exec(select(Asset).where(Asset.provider_id == "a")).one()
+        bundle = session.get(AssetBundle, created.json()["id"])
+    assert asset.download_status == "ready"
+    assert Path(asset.local_path).read_bytes() == b"resumed"
+    assert bundle.asset_refs[0]["local_path"] == asset.local_path
+
+
+def _remote_asset(engine, *, status: str = "pending", attempts: int = 0) -> int:
+    story_id = _story_with_script(engine)
+    with Session(engine) as session:
+        asset = Asset(
+            story_id=story_id,
+            type="image",
+            provider="pixabay",
+            provider_id="a",
+            remote_url="https://example.com/a.jpg",
+            source="remote",
+            download_status=status,
+            download_attempts=attempts,
+        )
+        session.add(asset)
+        session.commit()
+        return asset.id
+
+
+def test_only_one_process_downloads_a_claimed_asset(client, monkeypatch):
+    _client, engine, _store, _pool = client
+    asset_id = _remote_asset(engine)
+    calls: list[str] = []
+    monkeypatch.setattr(bundle_downloads.requests, "get", lambda url, **_kwargs: calls.append(url) or FakeResponse(b"x"))
+
+    # Another process claimed it first; this one's queued download stands down.
+    assert bundle_downloads._claim(engine, asset_id)
+    assert bundle_downloads._download_one(engine, asset_id, {"remote_url": "https://example.com/a.jpg"}) is None
+    assert bundle_downloads.requeue_pending_downloads(engine) == 0
+
+    assert calls == []
+    with Session(engine) as session:
+        asset = session.get(Asset, asset_id)
+    assert (asset.download_status, asset.download_attempts) == ("downloading", 1)
+
+
+def test_failed_downloads_are_retried_up_to_the_limit(client, monkeypatch):
+    _client, engine, _store, pool = client
+    asset_id = _remote_asset(engine, status="failed")
+    monkeypatch.setattr(settings, "BUNDLE_DOWNLOAD_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(bundle_downloads.requests, "get", lambda url, **_kwargs: FakeResponse(b"", status_code=500))
+
+    queued = []
+    for _ in range(3):
+        queued.append(bundle_downloads.requeue_pending_downloads(engine))
+        pool.drain()
+
+    assert queued == [1, 1, 0]
+    with Session(engine) as session:
+        asset = session.get(Asset, asset_id)
+    assert (asset.download_status, asset.download_attempts) == ("failed", 2)
+
+
+def test_abandoned_claims_are_downloaded_again(client, monkeypatch):
+    _client, engine, _store, pool = client
+    asset_id = _remote_asset(engine, status="downloading", attempts=1)
+    monkeypatch.setattr(bundle_downloads.requests, "get", lambda url, **_kwargs: FakeResponse(b"late"))
+
+    assert bundle_downloads.requeue_pending_downloads(engine) == 0
+    with Session(engine) as session:
+        asset = session.get(Asset, asset_id)
+        asset.updated_at = datetime.now(timezone.utc) - bundle_downloads.DOWNLOAD_CLAIM_STALE_AFTER * 2
+        session.add(asset)
+        session.commit()
+    assert bundle_downloads.requeue_pending_downloads(engine) == 1
+    pool.drain()
+
+    with Session(engine) as session:
+        asset = session.get(Asset, asset_id)
+    assert (asset.download_status, asset.download_attempts) == ("ready", 2)
+
+
+def test_assets_stored_before_status_tracking_count_as_downloaded(tmp_path: Path):
+    local = tmp_path / "old.jpg"
+    local.write_bytes(b"pixels")
+
+    assert bundle_downloads.is_downloaded(Asset(type="image", local_path=str(local)))
+    assert not bundle_downloads.is_downloaded(Asset(type="image", local_path=str(tmp_path / "gone.jpg")))
+    assert not bundle_downloads.is_downloaded(Asset(type="image", local_path=str(local), download_status="failed"))
+
+
+def test_store_rejects_oversized_downloads(client):
+    _client, _engine, store, _pool = client
+
+    with pytest.raises(bundle_downloads.DownloadTooLarge):
+        bundle_downloads.store_response(FakeResponse(b"x" * 10), ".jpg", max_bytes=8)
+    declared = FakeResponse(b"", headers={"content-length": "9"})
+    with pytest.raises(bundle_downloads.DownloadTooLarge):
+        bundle_downloads.store_response(declared, ".jpg", max_bytes=8)
+
+    assert declared.closed
+    assert [path for path in store.rglob("*") if path.is_file()] == []
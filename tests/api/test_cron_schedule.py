@@ -0,0 +1,98 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from apps.api.cron_schedule import parse_cron
+from apps.api.publishing import _cron_schedule_from
+
+
+def _brute_force_fire_times(expression: str, after: datetime, *, count: int, limit_minutes: int) -> list[datetime]:
+    cron = parse_cron(expression)
+    candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    scheduled: list[datetime] = []
+    for _ in range(limit_minutes):
+        if cron.matches(candidate):
+            scheduled.append(candidate)
+            if len(scheduled) == count:
+                break
+        candidate += timedelta(minutes=1)
+    return scheduled
+
+
+def _random_field(rng: random.Random, minimum: int, maximum: int) -> str:
+    shape = rng.choice(["any", "value", "list", "range", "step", "range_step"])
+    if shape == "any":
+        return "*"
+    if shape == "value":
+        return str(rng.randint(minimum, maximum))
+    if shape == "list":
+        return ",".join(str(value) for value in rng.sample(range(minimum, maximum + 1), rng.randint(2, 3)))
+    start = rng.randint(minimum, maximum)
+    end = rng.randint(start, maximum)
+    if shape == "range":
+        return f"{start}-{end}"
+    if shape == "step":
+        return f"*/{rng.randint(2, 7)}"
+    return f"{start}-{end}/{rng.randint(1, 4)}"
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_next_after_matches_brute_force_scan(seed: int):
+    rng = random.Random(seed)
+    expression = " ".join(
+        [
+            _random_field(rng, 0, 59),
+            _random_field(rng, 0, 23),
+            _random_field(rng, 1, 31),
+            rng.choice(["*", _random_field(rng, 1, 12)]),
+            _random_field(rng, 0, 6),
+        ]
+    )
+    after = datetime(2030, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+    expected = _brute_force_fire_times(expression, after, count=5, limit_minutes=120 * 24 * 60)
+
+    actual = parse_cron(expression).fire_times(after, count=len(expected)) if expected else []
+
+    assert actual == expected, expression
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "0 9 * * 0",
+        "30 18 1,15 * 4",
+        "*/15 */4 * * *",
+        "0 12 31 * *",
+    ],
+)
+def test_next_after_handles_sparse_and_calendar_edge_crons(expression: str):
+    after = datetime(2031, 12, 31, 23, 59, 30, tzinfo=timezone.utc)
+    expected = _brute_force_fire_times(expression, after, count=3, limit_minutes=366 * 24 * 60)
+
+    assert parse_cron(expression).fire_times(after, count=3) == expected
+
+
+def test_weekly_cron_schedules_beyond_one_slot_per_day():
+    anchor = datetime(2030, 1, 1, 1, 15, tzinfo=timezone.utc)
+
+    slots = _cron_schedule_from(anchor, count=30, cron_utc="0 9 * * 0")
+
+    assert slots[0] == datetime(2030, 1, 7, 9, 0, tzinfo=timezone.utc)
+    assert all(later - earlier == timedelta(days=7) for earlier, later in zip(slots, slots[1:]))
+
+
+def test_leap_day_cron_skips_to_the_next_leap_year():
+    slots = parse_cron("0 0 29 2 *").fire_times(datetime(2032, 3, 1, tzinfo=timezone.utc), count=2)
+
+    assert slots == [
+        datetime(2036, 2, 29, tzinfo=timezone.utc),
+        datetime(2040, 2, 29, tzinfo=timezone.utc),
+    ]
+
+
+def test_cron_that_never_fires_raises_and_parsing_is_memoized():
+    assert parse_cron("0 0 31 2 *") is parse_cron("0 0 31 2 *")
+    assert parse_cron("0 0 31 2 *").next_after(datetime(2030, 1, 1, tzinfo=timezone.utc)) is None
+    with pytest.raises(ValueError):
+        _cron_schedule_from(datetime(2030, 1, 1, tzinfo=timezone.utc), count=1, cron_utc="0 0 31 2 *")
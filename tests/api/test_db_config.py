@@ -0,0 +1,36 @@
+import asyncio
+import threading
+
+import pytest
+from sqlmodel import Session, create_engine
+
+from apps.api import db
+from shared.config import settings
+
+
+def test_pool_options_apply_to_server_databases_only(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 4)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 2)
+    assert db.pool_options("sqlite://") == {}
+    options = db.pool_options("postgresql+psycopg://u:p@localhost/darklife")
+    assert options["pool_size"] == 4
+    assert options["max_overflow"] == 2
+    assert options["pool_pre_ping"] is settings.DATABASE_POOL_PRE_PING
+
+
+def test_async_session_falls_back_to_sync_adapter(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+psycopg2://u:p@localhost/darklife")
+    assert not db.async_engine_enabled()
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+psycopg://u:p@localhost/darklife")
+    assert db.async_engine_enabled()
+    monkeypatch.setattr(settings, "DATABASE_ASYNC_ENABLED", False)
+    assert not db.async_engine_enabled()
+
+    loop_thread = threading.get_ident()
+    with Session(create_engine("sqlite://")) as session:
+        adapter = db.sync_async_session(session)
+        result = asyncio.run(
+            adapter.run_sync(lambda sync_session, value: (sync_session is session, value, threading.get_ident()), 7)
+        )
+    assert result[:2] == (True, 7)
+    assert result[2] != loop_thread
@@ -1,17 +1,26 @@
 import shutil
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.pool import StaticPool
+from sqlalchemy import event
 from sqlmodel import SQLModel, Session, create_engine, select
 
-from apps.api.db import get_session
+from apps.api.db import get_async_session, get_session, sync_async_session
 import apps.api.main as main
 import apps.api.publish_jobs as publish_jobs_api
 import apps.api.public_artifacts as public_artifacts
-from apps.api.models import PublishJob, Release, RenderArtifact, Story
-from apps.api.publishing import build_signature
+from apps.api.models import MetricsSnapshot, PublishJob, Release, RenderArtifact, Story, StoryPart
+from apps.api.publishing import (
+    build_signature,
+    release_read,
+    release_reads,
+    resolve_release_artifact,
+    resolve_release_artifacts,
+    schedule_metrics_sync,
+)
 from shared.config import settings
 from shared.workflow import PublishApprovalStatus, PublishDeliveryMode, ReleaseStatus, RenderVariant
 
@@ -43,6 +52,7 @@ def client_fixture(tmp_path, monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(settings, "ARTIFACT_SIGNING_SECRET", "signing-secret")
     monkeypatch.setattr(settings, "OUTPUT_DIR", output_dir)
     main.app.dependency_overrides[get_session] = get_test_session
+    main.app.dependency_overrides[get_async_session] = sync_async_session
     with TestClient(main.app) as client:
         yield client, engine, output_dir
     main.app.dependency_overrides.clear()
@@ -82,6 +92,136 @@ def _create_ready_release(session: Session, output_dir: Path, *, platform: str =
     return release
 
 
+def test_release_reads_match_single_release_serializer_with_constant_queries(client):
+    _, engine, output_dir = client
+    with Session(engine) as session:
+        releases = [_create_ready_release(session, output_dir) for _ in range(3)]
+        session.add(PublishJob(release_id=releases[0].id, platform="youtube"))
+        for index, window in enumerate((1, 24)):
+            session.add(
+                MetricsSnapshot(
+                    release_id=releases[1].id,
+                    story_id=releases[1].story_id,
+                    script_version_id=1,
+                    window_hours=window,
+                    source="youtube_insights",
+                    metrics={"views": float(100 * (index + 1))},
+                )
+            )
+        session.commit()
+        for release in releases:
+            session.refresh(release)
+
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            bulk = release_reads(session, releases)
+            bulk_queries = len(statements)
+            release_reads(session, releases[:1])
+            single_queries = len(statements) - bulk_queries
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        assert bulk_queries == single_queries
+        assert bulk == [release_read(session, release) for release in releases]
+        assert bulk[0].publish_job_id is not None
+        assert bulk[1].latest_metrics["views"] == 200.0
+
+
+def test_bulk_artifact_resolution_matches_single_and_skips_other_parts(client):
+    _, engine, output_dir = client
+    with Session(engine) as session:
+        pinned_draft = _create_ready_release(session, output_dir)
+        draft = session.get(RenderArtifact, pinned_draft.render_artifact_id)
+        draft.quality_tier = "draft"
+        session.add(draft)
+        story = Story(title="Parts", status="publish_ready")
+        session.add(story)
+        session.flush()
+        parts = [StoryPart(story_id=story.id, index=index, body_md="Part.", est_seconds=5) for index in (1, 2)]
+        session.add_all(parts)
+        session.flush()
+        for part in parts:
+            session.add_all(
+                RenderArtifact(story_id=story.id, story_part_id=part.id, video_path=f"/output/{part.id}-{take}.mp4")
+                for take in range(3)
+            )
+        unpinned = Release(
+            story_id=story.id,
+            story_part_id=parts[0].id,
+            platform="youtube",
+            variant=RenderVariant.SHORT.value,
+            title="Part 1",
+            description="desc",
+        )
+        session.add(unpinned)
+        session.commit()
+        releases = [pinned_draft, unpinned]
+        for release in releases:
+            session.refresh(release)
+        first_part_id = parts[0].id
+        # Start from an empty identity map so every fetched artifact fires "load".
+        session.expunge_all()
+
+        loaded: list[RenderArtifact] = []
+
+        def _loaded(target, _context):
+            loaded.append(target)
+
+        event.listen(RenderArtifact, "load", _loaded)
+        try:
+            bulk = resolve_release_artifacts(session, releases)
+        finally:
+            event.remove(RenderArtifact, "load", _loaded)
+
+        assert bulk[0] is None
+        assert bulk[1] is not None and bulk[1].story_part_id == first_part_id
+        assert [artifact.id if artifact else None for artifact in bulk] == [
+            artifact.id if artifact else None for artifact in (resolve_release_artifact(session, r) for r in releases)
+        ]
+        assert {artifact.story_part_id for artifact in loaded} == {None, first_part_id}
+
+
+def test_insight_sync_targets_follow_next_metrics_sync_at(client):
+    client, engine, output_dir = client
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        fresh, settled = _create_ready_release(session, output_dir), _create_ready_release(session, output_dir)
+        for release, published_at in ((fresh, now - timedelta(hours=1)), (settled, now - timedelta(days=10))):
+            release.status = ReleaseStatus.PUBLISHED.value
+            release.platform_video_id = f"yt-{release.id}"
+            release.published_at = published_at
+            release.script_version_id = 1
+            schedule_metrics_sync(release)
+            session.add(release)
+        session.commit()
+        fresh_id, settled_id = fresh.id, settled.id
+
+    response = client.get("/insights/sync-targets", headers=_auth_headers())
+    assert response.status_code == 200
+    assert [target["release_id"] for target in response.json()] == [settled_id, fresh_id]
+
+    for release_id in (fresh_id, settled_id):
+        response = client.post(
+            "/insights/snapshots",
+            headers=_auth_headers(),
+            json={"release_id": release_id, "captured_at": now.isoformat(), "metrics": {"views": 10}},
+        )
+        assert response.status_code == 200
+    assert client.get("/insights/sync-targets", headers=_auth_headers()).json() == []
+
+    with Session(engine) as session:
+        fresh_next = session.get(Release, fresh_id).next_metrics_sync_at
+        settled_next = session.get(Release, settled_id).next_metrics_sync_at
+    interval = timedelta(seconds=settings.INSIGHTS_SYNC_INTERVAL_SEC)
+    assert fresh_next.replace(tzinfo=timezone.utc) == now + interval
+    assert settled_next.replace(tzinfo=timezone.utc) == now + interval * 24
+
+
 def test_approve_release_creates_immediate_and_scheduled_publish_jobs(client, monkeypatch: pytest.MonkeyPatch):
     client, engine, output_dir = client
     with Session(engine) as session:
@@ -143,6 +283,32 @@ def test_public_release_asset_signature_validation(client):
     assert bad.status_code == 403
 
 
+def test_public_release_preview_serves_registered_proxy(client):
+    client, engine, output_dir = client
+    with Session(engine) as session:
+        release = _create_ready_release(session, output_dir)
+        release_id = release.id
+        artifact = session.get(RenderArtifact, release.render_artifact_id)
+        proxy_path = output_dir / "proxy.mp4"
+        proxy_path.write_bytes(b"proxy")
+        artifact.details = {"proxy_path": str(proxy_path)}
+        session.add(artifact)
+        session.commit()
+
+    exp = 4_102_444_800
+    sig = build_signature("release-proxy", release_id, exp)
+    res = client.get(f"/public/releases/{release_id}/preview/proxy?exp={exp}&sig={sig}")
+    assert res.status_code == 200
+    assert res.content == b"proxy"
+
+    asset_sig = build_signature("release", release_id, exp)
+    assert client.get(f"/public/releases/{release_id}/preview/proxy?exp={exp}&sig={asset_sig}").status_code == 403
+
+    sheet_sig = build_signature("release-contact-sheet", release_id, exp)
+    missing = client.get(f"/public/releases/{release_id}/preview/contact-sheet?exp={exp}&sig={sheet_sig}")
+    assert missing.status_code == 404
+
+
 def test_complete_manual_publish_only_allows_manual_releases(client):
     client, engine, output_dir = client
     release_id = None
@@ -28,6 +28,7 @@ def client_and_engine_fixture(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(main, "init_db", lambda: None)
     monkeypatch.setattr(main, "ensure_default_presets", lambda _session: None)
     monkeypatch.setattr(main, "ensure_default_prompt_versions", lambda _session: None)
+    monkeypatch.setattr(main, "requeue_pending_downloads", lambda _bind: None)
     monkeypatch.setattr(reddit_admin, "ADMIN_TOKEN", "token")
 
     app.dependency_overrides[get_session] = get_test_session
@@ -4,11 +4,13 @@ from fastapi.testclient import TestClient
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine, select
 
-from apps.api.db import get_session
+from apps.api import db
+from apps.api.db import get_async_session, get_session, sync_async_session
 import apps.api.main as main
 import apps.api.render_jobs as render_jobs
-from apps.api.models import AssetBundle, Job, PublishJob, Release, RenderPreset, Story, StoryPart
+from apps.api.models import AssetBundle, Job, PublishJob, Release, RenderArtifact, RenderPreset, Story, StoryPart
 from apps.api.pipeline import ensure_default_presets
+from apps.api.publishing import resolve_release_artifact
 from shared.workflow import JobStatus, PublishApprovalStatus, PublishDeliveryMode, ReleaseStatus, StoryStatus
 
 
@@ -33,6 +35,7 @@ def client_fixture(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(main, "engine", engine)
     monkeypatch.setattr(render_jobs.settings, "API_AUTH_TOKEN", "local-admin")
     main.app.dependency_overrides[get_session] = get_test_session
+    main.app.dependency_overrides[get_async_session] = sync_async_session
     with Session(engine) as session:
         ensure_default_presets(session)
     with TestClient(main.app) as client:
@@ -40,7 +43,7 @@ def client_fixture(monkeypatch: pytest.MonkeyPatch):
     main.app.dependency_overrides.clear()
 
 
-def _create_job(session: Session, *, auto_schedule_release: bool = False) -> int:
+def _create_job(session: Session, *, auto_schedule_release: bool = False, quality_tier: str = "final") -> int:
     story = Story(title="Story", status="queued")
     session.add(story)
     session.flush()
@@ -92,6 +95,7 @@ def _create_job(session: Session, *, auto_schedule_release: bool = False) -> int
         asset_bundle_id=bundle.id,
         render_preset_id=preset.id,
         kind="render_part",
+        quality_tier=quality_tier,
         status="queued",
         payload={"story_id": story.id, "story_part_id": part.id, "asset_bundle_id": bundle.id, "render_preset_id": preset.id},
     )
@@ -129,6 +133,23 @@ def test_claim_concurrency(client):
     assert res2.status_code == 409
 
 
+def test_async_routes_work_through_the_real_async_session(client, monkeypatch):
+    client, engine = client
+    # Without the sync_async_session override, sqlite goes through
+    # get_async_session's own SyncSessionAdapter fallback.
+    monkeypatch.setattr(db.settings, "DATABASE_URL", "sqlite://")
+    monkeypatch.setattr(db, "engine", engine)
+    main.app.dependency_overrides.pop(get_async_session)
+    with Session(engine) as session:
+        job_id = _create_job(session)
+
+    claimed = client.post(f"/render-jobs/{job_id}/claim", json={"lease_seconds": 30}, headers=_auth_headers())
+    listed = client.get("/render-jobs/", params={"status": "claimed"}, headers=_auth_headers())
+
+    assert claimed.status_code == 200
+    assert [job["id"] for job in listed.json()] == [job_id]
+
+
 def test_state_machine_and_publish_ready(client):
     client, engine = client
     with Session(engine) as session:
@@ -186,6 +207,92 @@ def test_rendered_auto_scheduled_release_creates_publish_job(client):
         assert publish_job.not_before == datetime(2030, 1, 1, 12, 0)
 
 
+def test_platform_outputs_register_per_platform_artifacts(client):
+    client, engine = client
+    with Session(engine) as session:
+        job_id = _create_job(session, auto_schedule_release=True)
+
+    assert client.post(f"/render-jobs/{job_id}/claim", json={"lease_seconds": 30}, headers=_auth_headers()).status_code == 200
+    assert client.post(f"/render-jobs/{job_id}/status", json={"status": "rendering"}, headers=_auth_headers()).status_code == 200
+    res = client.post(
+        f"/render-jobs/{job_id}/status",
+        json={
+            "status": "rendered",
+            "artifact_path": "/output/video.mp4",
+            "bytes": 1234,
+            "duration_ms": 22000,
+            "platform_outputs": [
+                {"platform": "youtube", "artifact_path": "/output/video.youtube.mp4", "bytes": 2000},
+                {"platform": "tiktok", "artifact_path": "/output/video.tiktok.mp4", "bytes": 900},
+            ],
+        },
+        headers=_auth_headers(),
+    )
+    assert res.status_code == 200
+
+    with Session(engine) as session:
+        artifacts = session.exec(select(RenderArtifact).where(RenderArtifact.job_id == job_id)).all()
+        by_platform = {artifact.platform: artifact for artifact in artifacts}
+        assert set(by_platform) == {None, "youtube", "tiktok"}
+        assert by_platform["youtube"].details["primary_artifact_id"] == by_platform[None].id
+        release = session.exec(select(Release)).one()
+        assert release.render_artifact_id == by_platform["youtube"].id
+
+
+def test_draft_render_never_feeds_releases(client):
+    client, engine = client
+    with Session(engine) as session:
+        job_id = _create_job(session, auto_schedule_release=True, quality_tier="draft")
+
+    assert client.post(f"/render-jobs/{job_id}/claim", json={"lease_seconds": 30}, headers=_auth_headers()).status_code == 200
+    assert client.post(f"/render-jobs/{job_id}/status", json={"status": "rendering"}, headers=_auth_headers()).status_code == 200
+    res = client.post(
+        f"/render-jobs/{job_id}/status",
+        json={"status": "rendered", "artifact_path": "/output/draft.mp4", "metadata": {"quality_tier": "draft"}},
+        headers=_auth_headers(),
+    )
+    assert res.status_code == 200
+    assert res.json()["status"] == JobStatus.RENDERED.value
+    assert res.json()["quality_tier"] == "draft"
+
+    with Session(engine) as session:
+        artifact = session.exec(select(RenderArtifact).where(RenderArtifact.job_id == job_id)).one()
+        assert artifact.quality_tier == "draft"
+        release = session.exec(select(Release)).one()
+        assert release.render_artifact_id is None
+        assert release.status == ReleaseStatus.DRAFT.value
+        assert session.exec(select(PublishJob)).first() is None
+
+        release.render_artifact_id = artifact.id
+        assert resolve_release_artifact(session, release) is None
+
+
+def test_errored_draft_render_leaves_releases_alone(client):
+    client, engine = client
+    with Session(engine) as session:
+        job_id = _create_job(session, auto_schedule_release=True, quality_tier="draft")
+        release = session.exec(select(Release)).one()
+        release.status = ReleaseStatus.SCHEDULED.value
+        release.publish_status = ReleaseStatus.SCHEDULED.value
+        release.last_error = "earlier note"
+        session.add(release)
+        session.commit()
+
+    assert client.post(f"/render-jobs/{job_id}/claim", json={"lease_seconds": 30}, headers=_auth_headers()).status_code == 200
+    res = client.post(
+        f"/render-jobs/{job_id}/status",
+        json={"status": "errored", "error_message": "ffmpeg crashed"},
+        headers=_auth_headers(),
+    )
+    assert res.status_code == 200
+    assert res.json()["status"] == JobStatus.ERRORED.value
+
+    with Session(engine) as session:
+        release = session.exec(select(Release)).one()
+        assert (release.status, release.publish_status) == (ReleaseStatus.SCHEDULED.value, ReleaseStatus.SCHEDULED.value)
+        assert release.last_error == "earlier note"
+
+
 def test_render_job_routes_require_auth(client):
     client, engine = client
     with Session(engine) as session:
@@ -197,6 +304,67 @@ def test_render_job_routes_require_auth(client):
     assert res.status_code == 401
 
 
+def test_render_context_short_profile_and_etag(client, monkeypatch):
+    client, engine = client
+    with Session(engine) as session:
+        job_id = _create_job(session)
+        job = session.get(Job, job_id)
+        session.add(
+            RenderArtifact(
+                job_id=job_id,
+                story_id=job.story_id,
+                story_part_id=job.story_part_id,
+                variant="short",
+                video_path="/output/old.mp4",
+            )
+        )
+        session.commit()
+
+    full = client.get(f"/render-jobs/{job_id}/context", headers=_auth_headers())
+    assert full.status_code == 200
+    assert len(full.json()["artifacts"]) == 1
+
+    res = client.get(f"/render-jobs/{job_id}/context", params={"profile": "short"}, headers=_auth_headers())
+    assert res.status_code == 200
+    context = res.json()
+    assert context["profile"] == "short"
+    assert context["selected_asset"]["key"] == "pixabay:123"
+    assert context["artifacts"] == []
+    assert context["releases"] == []
+    assert context["parts"] == []
+    etag = res.headers["ETag"]
+
+    assert client.post(f"/render-jobs/{job_id}/claim", json={"lease_seconds": 30}, headers=_auth_headers()).status_code == 200
+    with monkeypatch.context() as patched:
+        # A current copy is answered without assembling the context.
+        patched.setattr(render_jobs, "_assemble_render_context", lambda *_args, **_kwargs: pytest.fail("assembled"))
+        cached = client.get(
+            f"/render-jobs/{job_id}/context",
+            params={"profile": "short"},
+            headers={**_auth_headers(), "If-None-Match": etag},
+        )
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    with Session(engine) as session:
+        part = session.get(StoryPart, session.get(Job, job_id).story_part_id)
+        part.script_text = "I ran faster."
+        session.add(part)
+        session.commit()
+    edited = client.get(
+        f"/render-jobs/{job_id}/context",
+        params={"profile": "short"},
+        headers={**_auth_headers(), "If-None-Match": etag},
+    )
+    assert edited.status_code == 200
+    assert edited.json()["story_part"]["script_text"] == "I ran faster."
+    assert edited.headers["ETag"] != etag
+
+    assert client.get(
+        f"/render-jobs/{job_id}/context", params={"profile": "bogus"}, headers=_auth_headers()
+    ).status_code == 422
+
+
 def test_compilation_job_hidden_until_part_jobs_ready(client):
     client, engine = client
     with Session(engine) as session:
@@ -288,6 +456,56 @@ def test_list_render_jobs_applies_limit_after_readiness_filter(client):
     assert jobs[0]["id"] == short_job.id
 
 
+def test_compilation_job_ready_when_latest_part_jobs_are_terminal(client):
+    client, engine = client
+    with Session(engine) as session:
+        story = Story(title="Story", status="queued")
+        session.add(story)
+        session.flush()
+        parts = [
+            StoryPart(
+                story_id=story.id,
+                index=index,
+                body_md="One.",
+                source_text="One.",
+                script_text="One.",
+                est_seconds=2,
+                approved=True,
+            )
+            for index in (1, 2)
+        ]
+        session.add_all(parts)
+        session.flush()
+        session.add(
+            Job(story_id=story.id, story_part_id=parts[0].id, kind="render_part", status="errored", variant="short")
+        )
+        for part in parts:
+            session.add(
+                Job(story_id=story.id, story_part_id=part.id, kind="render_part", status="publish_ready", variant="short")
+            )
+        compilation_job = Job(
+            story_id=story.id,
+            compilation_id=1,
+            kind="render_compilation",
+            status="queued",
+            variant="weekly",
+        )
+        session.add(compilation_job)
+        session.commit()
+        compilation_id = compilation_job.id
+
+    res = client.get("/render-jobs", params={"status": "queued"}, headers=_auth_headers())
+    assert res.status_code == 200
+    assert [job["id"] for job in res.json()] == [compilation_id]
+
+    res = client.post(
+        f"/render-jobs/{compilation_id}/claim",
+        json={"lease_seconds": 60},
+        headers=_auth_headers(),
+    )
+    assert res.status_code == 200
+
+
 def test_admin_requeue_resets_stuck_render_job_and_release(client):
     client, engine = client
     with Session(engine) as session:
@@ -0,0 +1,103 @@
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+
+from apps.api.db import get_session
+import apps.api.main as main
+from apps.api.models import Release, Story
+from apps.api.observability import redact_statement
+from shared.config import settings
+
+
+@pytest.fixture(name="client")
+def client_fixture(monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setattr(main, "init_db", lambda: None)
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(settings, "API_DB_QUERY_HEADER", True)
+    main.app.dependency_overrides[get_session] = get_test_session
+    with TestClient(main.app) as client:
+        yield client, engine
+    main.app.dependency_overrides.clear()
+
+
+def _add_scheduled_releases(engine, count: int) -> None:
+    with Session(engine) as session:
+        story = Story(title="Queue story", status="approved")
+        session.add(story)
+        session.flush()
+        for index in range(count):
+            session.add(
+                Release(
+                    story_id=story.id,
+                    story_part_id=None,
+                    compilation_id=index,
+                    platform="youtube",
+                    title=f"Part {index}",
+                    status="scheduled",
+                    publish_at=datetime.now(timezone.utc) + timedelta(hours=index + 1),
+                )
+            )
+        session.commit()
+
+
+def test_release_queue_query_count_is_independent_of_page_size(client):
+    client, engine = client
+    _add_scheduled_releases(engine, 2)
+    small = client.get("/releases/queue")
+    _add_scheduled_releases(engine, 6)
+    large = client.get("/releases/queue")
+
+    assert small.status_code == large.status_code == 200
+    assert len(large.json()) == 8
+    assert int(small.headers["X-DB-Queries"]) > 0
+    assert large.headers["X-DB-Queries"] == small.headers["X-DB-Queries"]
+    assert float(large.headers["X-DB-Time-Ms"]) >= 0
+
+
+def test_metrics_are_labelled_by_route_template(client):
+    client, engine = client
+    with Session(engine) as session:
+        story = Story(title="Labelled", status="approved")
+        session.add(story)
+        session.commit()
+        story_id = story.id
+
+    assert client.get(f"/stories/{story_id}").status_code == 200
+    assert client.get("/definitely/not/a/route").status_code == 404
+    body = client.get("/metrics").text
+
+    assert 'api_request_duration_seconds_count{method="GET",route="/stories/{story_id}",status="200"}' in body
+    assert 'api_request_db_queries_count{method="GET",route="/stories/{story_id}"}' in body
+    assert 'route="unmatched"' in body
+    assert f'"/stories/{story_id}"' not in body
+
+
+def test_slow_query_log_redacts_literals_and_parameters(client, monkeypatch, caplog):
+    client, _engine = client
+    monkeypatch.setattr(settings, "API_SLOW_QUERY_MS", 0)
+    caplog.set_level(logging.WARNING, logger="api.sql")
+
+    res = client.get("/stories", params={"q": "hunter2-secret"})
+
+    assert res.status_code == 200
+    entries = [json.loads(record.getMessage()) for record in caplog.records if record.name == "api.sql"]
+    assert entries and all(entry["event"] == "slow_query" for entry in entries)
+    assert any(entry["path"] == "/stories" and entry["parameters"] for entry in entries)
+    assert "hunter2-secret" not in caplog.text
+    assert redact_statement("SELECT * FROM story WHERE title = 'it''s  here'") == "SELECT * FROM story WHERE title = '?'"
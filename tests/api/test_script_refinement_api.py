@@ -3,7 +3,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine
 
-from apps.api.db import get_session
+from apps.api.db import get_async_session, get_session, sync_async_session
 import apps.api.main as main
 from apps.api.pipeline import ensure_default_presets
 from apps.api.models import Story
@@ -28,6 +28,7 @@ def client_fixture(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(main, "init_db", lambda: None)
     monkeypatch.setattr(main, "engine", engine)
     main.app.dependency_overrides[get_session] = get_test_session
+    main.app.dependency_overrides[get_async_session] = sync_async_session
     monkeypatch.setenv("API_AUTH_TOKEN", "local-admin")
     monkeypatch.setattr(settings, "API_AUTH_TOKEN", "local-admin")
     with TestClient(main.app) as client:
@@ -1,14 +1,19 @@
+import json
+
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine, select
 
 from apps.api.db import get_session
 import apps.api.main as main
 import apps.api.stories as stories_api
-from apps.api.models import PublishJob, Release, Story
+from apps.api.models import PublishJob, Release, RenderArtifact, Story, StoryOverview
 from apps.api.pipeline import ensure_default_presets, upsert_script
+from apps.api import bundle_downloads, story_similarity, streaming
+from apps.api.story_duplicates import find_duplicate_story, story_duplicate_key_hash
 from shared.workflow import PublishApprovalStatus, PublishDeliveryMode, ReleaseStatus, RenderVariant
 
 
@@ -30,9 +35,9 @@ def client_fixture(tmp_path, monkeypatch: pytest.MonkeyPatch):
     main.app.dependency_overrides[get_session] = get_test_session
     monkeypatch.setenv("API_AUTH_TOKEN", "local-admin")
     monkeypatch.setattr(
-        stories_api,
-        "_download_bundle_asset",
-        lambda story_id, asset: (
+        bundle_downloads,
+        "download_bundle_asset",
+        lambda asset: (
             asset.get("local_path") or str(tmp_path / f"{asset.get('provider_id') or 'asset'}.jpg"),
             asset.get("remote_url"),
         ),
@@ -71,6 +76,35 @@ def test_generate_script_and_parts(client):
     assert len(parts.json()) >= 1
 
 
+def test_duplicate_key_hash_tracks_story_edits(client):
+    _client, engine = client
+    with Session(engine) as session:
+        story = Story(title="Fog", author="Ann", body_md="It came back.")
+        session.add(story)
+        session.commit()
+        original_hash = story.duplicate_key_hash
+        assert original_hash == story_duplicate_key_hash(title=" fog ", author="ANN", body_md="It  came back.")
+
+        story.body_md = "It came back again."
+        session.add(story)
+        session.commit()
+        assert story.duplicate_key_hash != original_hash
+
+        assert find_duplicate_story(session, title="Fog", author="Ann", body_md="It came back.") is None
+        found = find_duplicate_story(session, title="fog", author="ann", body_md="It came back again.")
+        assert found is not None and found.id == story.id
+        assert (
+            find_duplicate_story(
+                session,
+                title="fog",
+                author="ann",
+                body_md="It came back again.",
+                exclude_story_id=story.id,
+            )
+            is None
+        )
+
+
 def test_create_story_rejects_same_title_author_and_content(client):
     client, _engine = client
 
@@ -165,7 +199,7 @@ def test_story_asset_index_uses_mood_first_pixabay_query(client, monkeypatch: py
     assert "silent" not in keywords
 
 
-def test_fetch_pixabay_assets_uses_broad_search_and_ranks_best_images(monkeypatch: pytest.MonkeyPatch):
+def test_fetch_pixabay_assets_uses_broad_search_and_ranks_best_images(monkeypatch: pytest.MonkeyPatch, tmp_path):
     captured: dict[str, object] = {}
 
     class FakeResponse:
@@ -210,6 +244,7 @@ def test_fetch_pixabay_assets_uses_broad_search_and_ranks_best_images(monkeypatc
         return FakeResponse()
 
     monkeypatch.setattr(stories_api.settings, "PIXABAY_API_KEY", "pixa-key")
+    monkeypatch.setattr(stories_api.settings, "PIXABAY_CACHE_DIR", tmp_path)
     monkeypatch.setattr(stories_api.requests, "get", fake_get)
 
     assets = stories_api._fetch_pixabay_assets("fog hallway", page=3)
@@ -727,3 +762,178 @@ def test_bundle_rejects_incomplete_part_asset_map(client, monkeypatch: pytest.Mo
         },
     )
     assert res.status_code == 400
+
+
+def test_near_duplicate_threshold_is_configurable(client, monkeypatch: pytest.MonkeyPatch):
+    _client, engine = client
+    sentences = [f"Sentence {index} describes the shape standing at the end of the bed." for index in range(1, 11)]
+    with Session(engine) as session:
+        story = Story(title="Shape", body_md=" ".join(sentences))
+        session.add(story)
+        session.flush()
+        assert story_similarity.index_story(session, story) == story_similarity.LSH_BANDS
+        session.commit()
+
+        edited = " ".join(sentences[:8] + ["The ending was rewritten entirely for the second posting."])
+        assert story_similarity.find_near_duplicate_story(session, body_md=edited) is None
+
+        monkeypatch.setattr(story_similarity.settings, "STORY_NEAR_DUPLICATE_THRESHOLD", 0.6)
+        match = story_similarity.find_near_duplicate_story(session, body_md=edited)
+        assert match is not None and match.story.id == story.id
+        assert 0.6 < match.similarity < 0.85
+        found = find_duplicate_story(session, title="Other", author=None, body_md=edited)
+        assert found is not None and found.id == story.id
+
+        monkeypatch.setattr(story_similarity.settings, "STORY_NEAR_DUPLICATE_ENABLED", False)
+        assert find_duplicate_story(session, title="Other", author=None, body_md=edited) is None
+
+
+def test_story_and_job_listings_page_by_cursor(client):
+    client, engine = client
+    with Session(engine) as session:
+        for index in range(5):
+            session.add(Story(title=f"Story {index}", status="ingested"))
+        session.commit()
+
+    first = client.get("/stories", params={"limit": 2})
+    assert first.status_code == 200
+    first_ids = [story["id"] for story in first.json()]
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/stories", params={"limit": 2, "cursor": cursor})
+    second_ids = [story["id"] for story in second.json()]
+    assert first_ids == sorted(first_ids, reverse=True)
+    assert second_ids and max(second_ids) < min(first_ids)
+    after = client.get("/stories", params={"limit": 2, "after_id": first_ids[-1]})
+    assert [story["id"] for story in after.json()] == second_ids
+
+    count = client.get("/stories/count", params={"status": "ingested"})
+    assert count.json() == {"total": 5}
+    assert "max-age" in count.headers["Cache-Control"]
+
+    assert client.get("/stories", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/jobs", params={"limit": 10_000}).status_code == 422
+    assert client.get("/jobs/count").json() == {"total": 0}
+
+
+def test_listing_stream_variants_emit_ndjson_across_batches(client, monkeypatch: pytest.MonkeyPatch):
+    client, engine = client
+    monkeypatch.setattr(streaming, "STREAM_BATCH_SIZE", 2)
+    monkeypatch.setattr(stories_api, "STREAM_BATCH_SIZE", 2)
+    with Session(engine) as session:
+        stories = [Story(title=f"Stream {index}", status="ingested") for index in range(5)]
+        session.add_all(stories)
+        session.flush()
+        for index, story in enumerate(stories):
+            session.add(
+                Release(
+                    story_id=story.id,
+                    platform="youtube",
+                    variant=RenderVariant.SHORT.value,
+                    title=story.title,
+                    description="",
+                    status=ReleaseStatus.READY.value,
+                    publish_status=ReleaseStatus.READY.value,
+                    publish_at=datetime(2030, 1, 1, tzinfo=timezone.utc) + timedelta(hours=index),
+                )
+            )
+        session.commit()
+
+    response = client.get("/stories/stream", params={"status": "ingested"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [f"Stream {index}" for index in reversed(range(5))]
+
+    queue = client.get("/releases/queue")
+    streamed = [json.loads(line) for line in client.get("/releases/queue/stream").text.splitlines()]
+    assert [row["id"] for row in streamed] == [row["id"] for row in queue.json()]
+
+    jobs = client.get("/jobs/stream")
+    assert jobs.status_code == 200
+    assert jobs.text == ""
+
+
+def test_story_search_falls_back_to_title_match_off_postgres(client):
+    client, engine = client
+    with Session(engine) as session:
+        session.add(Story(title="The Lighthouse Keeper", body_md="A ghost ship ran aground.", status="ingested"))
+        session.add(Story(title="Ghost Ship", body_md="Nothing about lighthouses.", status="ingested"))
+        session.commit()
+
+    response = client.get("/stories", params={"q": "ghost ship"})
+    assert response.status_code == 200
+    assert [(story["title"], story["search_rank"], story["search_headline"]) for story in response.json()] == [
+        ("Ghost Ship", None, None)
+    ]
+    assert client.get("/stories/count", params={"q": "lighthouse"}).json() == {"total": 1}
+
+
+def test_story_overview_is_stored_and_kept_current_by_writes(client):
+    client, engine = client
+    with Session(engine) as session:
+        story = Story(title="Overview", status="ingested")
+        session.add(story)
+        session.commit()
+        story_id = story.id
+
+    first = client.get(f"/stories/{story_id}/overview")
+    assert first.status_code == 200
+    assert first.json()["artifacts"] == []
+
+    with Session(engine) as session:
+        session.add(RenderArtifact(story_id=story_id, variant=RenderVariant.SHORT.value, video_path="/tmp/short.mp4"))
+        session.commit()
+        stored = session.get(StoryOverview, story_id)
+        assert [artifact["video_path"] for artifact in stored.document["artifacts"]] == ["/tmp/short.mp4"]
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        second = client.get(f"/stories/{story_id}/overview")
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    assert second.json()["artifacts"][0]["video_path"] == "/tmp/short.mp4"
+    assert len(statements) == 2
+
+    assert client.delete(f"/stories/{story_id}").status_code == 204
+    with Session(engine) as session:
+        assert session.get(StoryOverview, story_id) is None
+
+
+def test_release_queue_pages_in_queue_order(client):
+    client, engine = client
+    with Session(engine) as session:
+        story = Story(title="Queue", status="ingested")
+        session.add(story)
+        session.flush()
+        base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        for offset in (2, None, 0, 1, None):
+            session.add(
+                Release(
+                    story_id=story.id,
+                    platform="youtube",
+                    variant="short",
+                    title=f"Release {offset}",
+                    status=ReleaseStatus.SCHEDULED.value,
+                    publish_at=base + timedelta(days=offset) if offset is not None else None,
+                )
+            )
+        session.commit()
+
+    full = [release["title"] for release in client.get("/releases/queue").json()]
+    assert full[:3] == ["Release 0", "Release 1", "Release 2"]
+
+    paged: list[str] = []
+    cursor = None
+    while True:
+        res = client.get("/releases/queue", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        assert res.status_code == 200
+        paged.extend(release["title"] for release in res.json())
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert paged == full
+    assert client.get("/releases/queue/count").json() == {"total": 5}
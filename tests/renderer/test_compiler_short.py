@@ -1,9 +1,18 @@
+from dataclasses import replace
 from pathlib import Path
 
-from services.renderer.compiler import RenderInput, compile_short_render
+from services.renderer.compiler import PLATFORM_PROFILES, RenderInput, compile_short_render, resolve_profiles
+from shared.config import settings
 
 
-def _render_input(tmp_path, *, visual_suffix: str = ".jpg", music: bool = True, burn: bool = False):
+def _render_input(
+    tmp_path,
+    *,
+    visual_suffix: str = ".jpg",
+    music: bool = True,
+    burn: bool = False,
+    previews: bool = False,
+):
     voice = tmp_path / "vo.wav"
     voice.write_bytes(b"voice")
     subtitle = tmp_path / "part.srt"
@@ -36,6 +45,7 @@ def _render_input(tmp_path, *, visual_suffix: str = ".jpg", music: bool = True,
         },
         burn_subtitles=burn,
         music_policy="first",
+        previews=previews,
     )
 
 
@@ -66,3 +76,98 @@ def test_compile_short_render_video_without_music(tmp_path):
     assert "-stream_loop" in render_background.args
     assert mux_av.args[mux_av.args.index("-ac") + 1] == "2"
     assert plan.metadata["selected_asset_id"] == 42
+
+
+def test_compile_short_render_previews_share_final_pass(tmp_path):
+    plan = compile_short_render(_render_input(tmp_path, music=False, burn=False, previews=True))
+    labels = [command.label for command in plan.commands]
+    assert labels == ["render_background", "mux_av"]
+    mux_av = plan.commands[1]
+    assert mux_av.args.count("-i") == 2
+    assert str(plan.artifacts.proxy_path) in mux_av.args
+    assert str(plan.artifacts.contact_sheet_path) in mux_av.args
+    last_input = len(mux_av.args) - 1 - mux_av.args[::-1].index("-i")
+    assert mux_av.args.index("-filter_complex") == last_input + 2
+    assert mux_av.args[last_input + 1] == str(tmp_path / "vo.wav")
+    filter_complex = mux_av.args[mux_av.args.index("-filter_complex") + 1]
+    assert "[0:v]split=2[proxy][sheet]" in filter_complex
+    assert "[proxy]scale=-2:360[proxyv]" in filter_complex
+    assert "tile=6x2[sheetv]" in filter_complex
+    assert "+faststart" in mux_av.args
+    assert mux_av.args[mux_av.args.index("-c:v") + 1] == "copy"
+    assert mux_av.expected_outputs == [
+        str(tmp_path / "output" / "video.mp4"),
+        str(tmp_path / "output" / "proxy.mp4"),
+        str(tmp_path / "output" / "contact_sheet.jpg"),
+    ]
+
+
+def test_compile_short_render_previews_split_burned_subtitles(tmp_path):
+    plan = compile_short_render(_render_input(tmp_path, music=True, burn=True, previews=True))
+    mux_av = plan.commands[2]
+    burn = plan.commands[3]
+    assert str(plan.artifacts.proxy_path) not in mux_av.args
+    filter_complex = burn.args[burn.args.index("-filter_complex") + 1]
+    assert "split=3[main][proxy][sheet]" in filter_complex
+    assert burn.expected_outputs[1:] == [str(plan.artifacts.proxy_path), str(plan.artifacts.contact_sheet_path)]
+    assert plan.metadata["previews"] is True
+
+
+def test_compile_short_render_without_previews_has_no_preview_artifacts(tmp_path):
+    plan = compile_short_render(_render_input(tmp_path, music=False, burn=False))
+    assert plan.artifacts.proxy_path is None
+    assert plan.artifacts.contact_sheet_path is None
+    assert plan.commands[-1].expected_outputs == [str(tmp_path / "output" / "video.mp4")]
+
+
+def test_compile_short_render_trims_normalized_music_bed(tmp_path):
+    render_input = replace(_render_input(tmp_path, music=True, burn=False), music_normalized=True)
+    plan = compile_short_render(render_input)
+    mix_audio = plan.commands[0]
+    music_input = mix_audio.args.index(str(render_input.music_path))
+    assert mix_audio.args[music_input - 3 : music_input - 1] == ["-t", "42.000"]
+    filter_complex = mix_audio.args[mix_audio.args.index("-filter_complex") + 1]
+    assert "[1:a]volume=" in filter_complex
+    assert plan.metadata["music_normalized"] is True
+
+
+def test_compile_short_render_draft_tier_scales_down(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RENDER_DRAFT_SCALE", 0.5)
+    monkeypatch.setattr(settings, "RENDER_DRAFT_FPS", 15)
+    render_input = replace(_render_input(tmp_path, music=False, burn=True), quality_tier="draft")
+    plan = compile_short_render(render_input)
+    render_background = plan.commands[0]
+    burn = plan.commands[-1]
+    vf = render_background.args[render_background.args.index("-vf") + 1]
+    assert "crop=540:960" in vf
+    assert render_background.args[render_background.args.index("-r") + 1] == "15"
+    assert render_background.args[render_background.args.index("-preset") + 1] == "ultrafast"
+    assert burn.args[burn.args.index("-preset") + 1] == "ultrafast"
+    assert plan.metadata["quality_tier"] == "draft"
+    assert (plan.metadata["output_width"], plan.metadata["output_height"]) == (540, 960)
+
+
+def test_compile_short_render_platform_ladder_single_pass(tmp_path):
+    profiles = (PLATFORM_PROFILES["youtube"], PLATFORM_PROFILES["tiktok"])
+    render_input = replace(_render_input(tmp_path, music=False, burn=True), platform_profiles=profiles)
+    plan = compile_short_render(render_input)
+    burn = plan.commands[-1]
+    assert burn.args.count("-i") == 1
+    filter_complex = burn.args[burn.args.index("-filter_complex") + 1]
+    assert "split=3[main][v_youtube][v_tiktok]" in filter_complex
+    assert "[0:a]asplit=2[a_youtube_src][a_tiktok_src]" in filter_complex
+    assert "loudnorm=I=-14.0" in filter_complex
+    youtube_path = tmp_path / "output" / "video.youtube.mp4"
+    tiktok_path = tmp_path / "output" / "video.tiktok.mp4"
+    assert plan.artifacts.platform_paths == {"youtube": youtube_path, "tiktok": tiktok_path}
+    assert burn.expected_outputs == [str(plan.artifacts.video_path), str(youtube_path), str(tiktok_path)]
+    youtube_out = burn.args.index(str(youtube_path))
+    assert burn.args[burn.args.index("-maxrate", burn.args.index("[v_youtube]")) + 1] == "12M"
+    assert burn.args[youtube_out - 2 : youtube_out] == ["-movflags", "+faststart"]
+    assert plan.metadata["platform_profiles"] == ["tiktok", "youtube"]
+
+
+def test_resolve_profiles_filters_to_enabled_platforms():
+    profiles = resolve_profiles(["youtube", "tiktok", "vimeo", "youtube"], ["youtube", "instagram"])
+    assert [profile.name for profile in profiles] == ["youtube"]
+    assert resolve_profiles(None, ["youtube"]) == ()
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from services.renderer import music
+from services.renderer import music, music_index
 from shared.config import settings
 
 
@@ -106,3 +106,87 @@ def test_mix_ducking(tmp_path, monkeypatch):
     orig = max_vol(music_src, bandpass=True)
     ducked = max_vol(out, 0.2, 0.5, bandpass=True)
     assert orig - ducked > 5.0
+
+
+def _fake_index(tmp_path, monkeypatch, durations: dict[str, int]):
+    music_dir = tmp_path / "music"
+    music_dir.mkdir(exist_ok=True)
+    for name in durations:
+        (music_dir / name).write_bytes(name.encode("utf-8"))
+    monkeypatch.setattr(settings, "MUSIC_DIR", music_dir)
+    monkeypatch.setattr(settings, "MUSIC_INDEX_DIR", tmp_path / "index")
+    monkeypatch.setattr(settings, "MUSIC_INDEX_ENABLED", True)
+    analysed: list[str] = []
+
+    def fake_analyse(track, stat):
+        analysed.append(track.name)
+        bed_path = music_index._bed_path_for(track, stat)
+        bed_path.parent.mkdir(parents=True, exist_ok=True)
+        bed_path.write_bytes(b"flac")
+        return music_index.MusicTrack(
+            name=track.name,
+            path=track,
+            bed_path=bed_path,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            duration_ms=durations[track.name],
+            integrated_lufs=-14.0,
+            true_peak_db=-1.0,
+            target_lufs=float(settings.MUSIC_BED_TARGET_LUFS),
+        )
+
+    monkeypatch.setattr(music_index, "_analyse_track", fake_analyse)
+    return music_dir, analysed
+
+
+def test_music_index_refreshes_only_changed_tracks(tmp_path, monkeypatch):
+    music_dir, analysed = _fake_index(tmp_path, monkeypatch, {"a.mp3": 30000, "b.mp3": 90000})
+
+    entries = music_index.refresh_index()
+    assert [entry.name for entry in entries] == ["a.mp3", "b.mp3"]
+    assert analysed == ["a.mp3", "b.mp3"]
+
+    music_index.refresh_index()
+    assert analysed == ["a.mp3", "b.mp3"]
+
+    old_bed = entries[0].bed_path
+    (music_dir / "a.mp3").write_bytes(b"a-updated")
+    refreshed = music_index.refresh_index()
+    assert analysed[-1] == "a.mp3"
+    assert not old_bed.exists()
+    assert refreshed[0].bed_path.exists()
+
+    (music_dir / "b.mp3").unlink()
+    assert [entry.name for entry in music_index.refresh_index()] == ["a.mp3"]
+    assert not entries[1].bed_path.exists()
+
+
+def test_music_index_skips_failed_tracks_until_they_change(tmp_path, monkeypatch):
+    music_dir, analysed = _fake_index(tmp_path, monkeypatch, {"a.mp3": 30000, "bad.mp3": 0})
+    fake_analyse = music_index._analyse_track
+
+    def flaky_analyse(track, stat):
+        if track.name == "bad.mp3" and track.read_bytes() == b"bad.mp3":
+            analysed.append(track.name)
+            raise RuntimeError("loudnorm analysis produced no measurements")
+        return fake_analyse(track, stat)
+
+    monkeypatch.setattr(music_index, "_analyse_track", flaky_analyse)
+
+    assert [entry.name for entry in music_index.refresh_index()] == ["a.mp3"]
+    assert [entry.name for entry in music_index.refresh_index()] == ["a.mp3"]
+    assert music_index.ensure_bed(music_dir / "bad.mp3") is None
+    assert analysed == ["a.mp3", "bad.mp3"]
+
+    (music_dir / "bad.mp3").write_bytes(b"fixed")
+    assert [entry.name for entry in music_index.refresh_index()] == ["a.mp3", "bad.mp3"]
+    assert analysed == ["a.mp3", "bad.mp3", "bad.mp3"]
+
+
+def test_select_track_fit_uses_index_durations(tmp_path, monkeypatch):
+    _fake_index(tmp_path, monkeypatch, {"a.mp3": 20000, "b.mp3": 95000, "c.mp3": 60000})
+
+    assert music.select_track("fit", min_duration_ms=45000).name == "c.mp3"
+    assert music.select_track("fit", min_duration_ms=70000).name == "b.mp3"
+    assert music.select_track("fit", min_duration_ms=120000).name == "b.mp3"
+    assert music_index.ensure_bed(tmp_path / "music" / "c.mp3").duration_ms == 60000
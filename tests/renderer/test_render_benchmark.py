@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+from scripts import render_benchmark
+from scripts.render_benchmark import _child_peak_rss, compare_to_baseline
+
+
+def _report(**stages: int) -> dict:
+    return {"stages": [{"name": name, "wall_ms": wall_ms} for name, wall_ms in stages.items()]}
+
+
+def test_compare_to_baseline_flags_stages_over_threshold():
+    baseline = _report(short_image=1000, compilation=2000, subtitles=0)
+    current = _report(short_image=1100, compilation=2600, subtitles=50, tts_concat=30)
+
+    regressions = compare_to_baseline(current, baseline, threshold=0.15)
+
+    assert regressions == ["compilation: 2000ms -> 2600ms (1.30x)"]
+    assert compare_to_baseline(current, baseline, threshold=0.5) == []
+
+
+def test_child_peak_rss_is_measured_per_block():
+    # A child's ru_maxrss starts from this process's RSS, so allocate well past it.
+    render_benchmark._reset_own_peak_rss()
+    size_kb = render_benchmark._own_peak_rss_kb() + 64 * 1024
+    allocate = [sys.executable, "-c", f"block = bytearray({size_kb} * 1024); block[::4096] = b'x' * len(block[::4096])"]
+    with _child_peak_rss() as large:
+        subprocess.run(allocate, check=True)
+    with _child_peak_rss() as small:
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+    assert len(large) == len(small) == 1
+    assert large[0] >= size_kb
+    assert small[0] < large[0]
+    assert render_benchmark.__doc__.startswith("Offline renderer benchmark")
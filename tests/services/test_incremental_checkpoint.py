@@ -49,13 +49,13 @@ def test_fetch_incremental_checkpoint(monkeypatch):
 
     inserted = []
 
-    def fake_insert(payload):
-        inserted.append(payload["reddit_id"])
-        return True
+    def fake_insert(payloads):
+        inserted.extend(payload["reddit_id"] for payload in payloads)
+        return [True] * len(payloads)
 
     monkeypatch.setattr(incremental, "_load_fetch_state", fake_load)
     monkeypatch.setattr(incremental, "_update_fetch_state", fake_update)
-    monkeypatch.setattr(incremental, "insert_post", fake_insert)
+    monkeypatch.setattr(incremental, "insert_posts", fake_insert)
     monkeypatch.setattr(incremental, "normalize_post", lambda p: (Normalized(p["title"], p["selftext"]), None))
     monkeypatch.setattr(incremental, "extract_image_urls", lambda p: [])
     monkeypatch.setattr(incremental, "push_new_story", lambda p: None)
@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 
 import pytest
 
-from services.reddit_ingestor.storage import insert_post
+from services.reddit_ingestor.storage import insert_post, insert_posts
 from shared.config import settings
 
 
@@ -38,3 +38,38 @@ def test_insert_post_sends_payload(monkeypatch: pytest.MonkeyPatch):
     assert captured["json"]["external_id"] == "t3_123"
     assert captured["json"]["created_utc"] == 0
     assert captured["headers"]["Authorization"] == "Bearer token"
+
+
+def test_insert_posts_sends_one_bulk_request(monkeypatch: pytest.MonkeyPatch):
+    settings.API_BASE_URL = "http://api"
+    settings.API_AUTH_TOKEN = "token"
+
+    calls = []
+
+    class Resp:
+        status_code = 200
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return [
+                {"index": 1, "source": "reddit", "external_id": "t3_2", "status": "duplicate", "story_id": 7},
+                {"index": 0, "source": "reddit", "external_id": "t3_1", "status": "created", "story_id": 8},
+            ]
+
+    def fake_post(url, json, headers, timeout):
+        calls.append((url, json))
+        return Resp()
+
+    monkeypatch.setattr("services.reddit_ingestor.storage.requests.post", fake_post)
+
+    payloads = [
+        {"reddit_id": f"t3_{index}", "title": "Hello", "created_utc": index, "selftext": "body"}
+        for index in (1, 2)
+    ]
+
+    assert insert_posts(payloads) == [True, False]
+    assert len(calls) == 1
+    assert calls[0][0] == "http://api/admin/stories/bulk"
+    assert [story["external_id"] for story in calls[0][1]] == ["t3_1", "t3_2"]
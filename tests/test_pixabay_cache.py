@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from shared import pixabay
+from shared.config import settings
+
+
+def _age_cache(seconds: int) -> None:
+    stale = time.time() - seconds
+    for entry in Path(settings.PIXABAY_CACHE_DIR).rglob("*.*"):
+        os.utime(entry, (stale, stale))
+
+
+@pytest.fixture(name="fixture_provider")
+def fixture_provider_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    hits = [
+        {"id": index, "tags": tags, "webformatURL": f"https://example.com/{index}.jpg"}
+        for index, tags in enumerate(["fog, forest", "dark hallway", "fog, lake", "candle"], start=1)
+    ]
+    (fixtures / "library.json").write_text(json.dumps({"hits": hits}))
+    monkeypatch.setattr(settings, "PIXABAY_PROVIDER", "fixture")
+    monkeypatch.setattr(settings, "PIXABAY_FIXTURE_DIR", fixtures)
+    monkeypatch.setattr(settings, "PIXABAY_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(settings, "PIXABAY_CACHE_TTL_SEC", 86400)
+    monkeypatch.setattr(settings, "PIXABAY_SEARCH_CACHE_TTL_SEC", 3600)
+    pixabay._build_provider.cache_clear()
+    provider = pixabay.get_provider()
+    calls: list[dict] = []
+    fetch = provider.fetch
+
+    def counting_fetch(params: dict) -> dict:
+        calls.append(params)
+        return fetch(params)
+
+    monkeypatch.setattr(provider, "fetch", counting_fetch)
+    yield provider, calls
+    pixabay._build_provider.cache_clear()
+
+
+def test_fixture_provider_matches_tags_and_paginates(fixture_provider):
+    assert pixabay.provider_ready()
+
+    page_one = pixabay.search_images({"q": "FOG night", "per_page": 1, "page": 1})
+    page_two = pixabay.search_images({"q": "FOG night", "per_page": 1, "page": 2})
+    unmatched = pixabay.search_images({"q": "zebra", "per_page": 10})
+
+    assert page_one["total"] == 2
+    assert [hit["id"] for hit in page_one["hits"] + page_two["hits"]] == [1, 3]
+    assert [hit["id"] for hit in unmatched["hits"]] == [1, 2, 3, 4]
+    assert pixabay.lookup_image("4")["tags"] == "candle"
+    assert pixabay.lookup_image("99") is None
+
+
+def test_results_are_cached_until_the_ttl_expires(fixture_provider, monkeypatch):
+    _provider, calls = fixture_provider
+    params = {"q": "fog", "page": 1, "per_page": 5}
+
+    first = pixabay.search_images(params)
+    second = pixabay.search_images(dict(reversed(params.items())))
+    assert first == second
+    assert len(calls) == 1
+
+    _age_cache(settings.PIXABAY_SEARCH_CACHE_TTL_SEC + 1)
+    pixabay.search_images(params)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(settings, "PIXABAY_SEARCH_CACHE_TTL_SEC", 0)
+    pixabay.search_images(params)
+    pixabay.search_images(params)
+    assert len(calls) == 4
+
+
+def test_searches_expire_before_id_lookups(fixture_provider):
+    _provider, calls = fixture_provider
+    pixabay.search_images({"q": "fog"})
+    pixabay.lookup_image("1")
+    _age_cache(settings.PIXABAY_SEARCH_CACHE_TTL_SEC + 1)
+
+    pixabay.lookup_image("1")
+    assert len(calls) == 2
+    pixabay.search_images({"q": "fog"})
+    assert len(calls) == 3
+
+
+def test_prune_removes_entries_no_ttl_can_reuse(fixture_provider):
+    pixabay.search_images({"q": "fog"})
+    pixabay.lookup_image("1")
+    cache = Path(settings.PIXABAY_CACHE_DIR)
+    orphan = next(cache.rglob("*.json")).with_suffix(".123.456.tmp")
+    orphan.write_text("{}")
+
+    assert pixabay.prune_cache() == 0
+    _age_cache(settings.PIXABAY_CACHE_TTL_SEC + 1)
+    assert pixabay.prune_cache() == 3
+    assert list(cache.rglob("*.*")) == []
+
+
+def test_lookup_refetches_a_cached_stale_url(fixture_provider):
+    _provider, calls = fixture_provider
+
+    assert pixabay.hit_url(pixabay.lookup_image("2")) == "https://example.com/2.jpg"
+    pixabay.lookup_image("2")
+    assert len(calls) == 1
+
+    pixabay.lookup_image("2", stale_url="https://example.com/2.jpg")
+    assert len(calls) == 2
+
+
+def test_concurrent_identical_searches_share_one_fetch(fixture_provider, monkeypatch):
+    provider, calls = fixture_provider
+    release = threading.Event()
+    counting_fetch = provider.fetch
+
+    def slow_fetch(params: dict) -> dict:
+        release.wait(timeout=5)
+        return counting_fetch(params)
+
+    monkeypatch.setattr(provider, "fetch", slow_fetch)
+    results: list[dict] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pixabay.search_images({"q": "candle"})))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while not pixabay._inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len(results) == 6
+    assert all(result == results[0] for result in results)
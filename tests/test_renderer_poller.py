@@ -144,3 +144,31 @@ def test_process_job_records_stderr_snippet(monkeypatch):
     poller.process_job(job)
 
     assert any((json or {}).get("stderr_snippet") == "boom stderr" for _url, json in calls if _url.endswith("/status"))
+
+
+def test_render_context_reuses_cached_copy_on_not_modified(monkeypatch):
+    from services.renderer import api_client
+
+    monkeypatch.setattr(settings, "API_BASE_URL", "http://api")
+    monkeypatch.setattr(api_client, "_context_cache", api_client.OrderedDict())
+    seen_headers = []
+
+    class EtagResp(Resp):
+        def __init__(self, data=None, status_code=200):
+            super().__init__(data, status_code)
+            self.headers = {"ETag": '"v1"'}
+
+    class FakeSession:
+        def get(self, url, params=None, timeout=0, headers=None):
+            seen_headers.append(dict(headers or {}))
+            if headers and headers.get("If-None-Match") == '"v1"':
+                return EtagResp(status_code=304)
+            return EtagResp(data={"job": {"id": 5}, "story": {"id": 1}, "profile": params["profile"]})
+
+    client = api_client.RenderApiClient(FakeSession())
+    first = client.get_context(5, profile="short")
+    second = client.get_context(5, profile="short")
+
+    assert second == first
+    assert "If-None-Match" not in seen_headers[0]
+    assert seen_headers[1]["If-None-Match"] == '"v1"'